@@ -12,6 +12,15 @@
 # - Only installs files with newer or equal versions
 # - Prevents accidental downgrades
 # - No backup files created (clean installation)
+#
+# Sync Engine:
+# - The full install plan is computed up front from one stat pass over all
+#   source and destination files plus ~/.sdd/install.lock
+# - Only files whose signature changed since the last install are hashed
+#   and version-checked; copies are batched per destination directory
+# - A re-run with nothing changed touches no files
+#
+# Usage: ./install.sh [--dry-run] [--diff]
 
 set -euo pipefail  # Exit on error, undefined vars, pipe failures
 
@@ -31,6 +40,10 @@ readonly COMMANDS_SOURCE="$SCRIPT_DIR/.claude/commands"
 readonly AGENTS_SOURCE="$SCRIPT_DIR/.claude/agents"
 readonly HOOKS_SOURCE="$SCRIPT_DIR/.claude/hooks"
 
+# Lockfile of installed versions and hashes - makes unchanged re-runs a no-op
+readonly INSTALL_LOCK="${TEST_HOME:-$HOME}/.sdd/install.lock"
+readonly LOCK_FORMAT=1
+
 # Color codes for output - following bundle_code_context.md patterns
 readonly RED='\033[0;31m'
 readonly GREEN='\033[0;32m'
@@ -43,6 +56,22 @@ declare -i TEMPLATES_INSTALLED=0
 declare -i COMMANDS_INSTALLED=0
 declare -i AGENTS_INSTALLED=0
 declare -i HOOKS_INSTALLED=0
+declare -i FILES_UNCHANGED=0
+
+# Install plan - parallel arrays indexed by entry (bash 3.2 has no associative arrays)
+PLAN_KINDS=()
+PLAN_SOURCES=()
+PLAN_DESTINATIONS=()
+PLAN_MODES=()
+PLAN_ACTIONS=()
+PLAN_VERSIONS=()
+PLAN_HASHES=()
+PLAN_SOURCE_SIGNATURES=()
+PLAN_DEST_SIGNATURES=()
+
+# Command line options
+DRY_RUN=false
+SHOW_DIFF=false
 
 # Logging functions - following bundle_code_context.md patterns
 log_info() { echo -e "${GREEN}[INFO]${NC} $*"; }
@@ -80,18 +109,31 @@ validate_path() {
 }
 
 # Extract version from YAML frontmatter
+# Pure bash so planning never spawns a sed/grep pipeline per file
 extract_version() {
     local file="$1"
-    
+
     if [ ! -f "$file" ]; then
         echo "0.0.0"  # Default version if file doesn't exist
         return 0
     fi
-    
+
     # Extract version from YAML frontmatter (between first --- and second ---)
-    local version
-    version=$(sed -n '/^---$/,/^---$/p' "$file" | grep '^version:' | sed 's/version: *"*\([^"]*\)"*.*/\1/' | head -1)
-    
+    local line version="" in_frontmatter=false
+    while IFS= read -r line || [ -n "$line" ]; do
+        if [ "$line" = "---" ]; then
+            if [ "$in_frontmatter" = true ]; then
+                in_frontmatter=false
+            else
+                in_frontmatter=true
+            fi
+        elif [ "$in_frontmatter" = true ] && [[ "$line" =~ ^version:[[:space:]]*\"?([^\"]*) ]]; then
+            version="${BASH_REMATCH[1]}"
+            version="${version%"${version##*[![:space:]]}"}"
+            break
+        fi
+    done < "$file"
+
     if [ -z "$version" ]; then
         echo "0.0.0"  # Default version if no version found
     else
@@ -103,14 +145,14 @@ extract_version() {
 version_compare() {
     local v1="$1"
     local v2="$2"
-    
+
     # Split versions into components
     local v1_major v1_minor v1_patch
     local v2_major v2_minor v2_patch
-    
+
     IFS='.' read -r v1_major v1_minor v1_patch <<< "$v1"
     IFS='.' read -r v2_major v2_minor v2_patch <<< "$v2"
-    
+
     # Default missing components to 0
     v1_major=${v1_major:-0}
     v1_minor=${v1_minor:-0}
@@ -118,21 +160,21 @@ version_compare() {
     v2_major=${v2_major:-0}
     v2_minor=${v2_minor:-0}
     v2_patch=${v2_patch:-0}
-    
+
     # Compare major.minor.patch
     if [ "$v1_major" -gt "$v2_major" ]; then
         return 0  # v1 > v2
     elif [ "$v1_major" -lt "$v2_major" ]; then
         return 1  # v1 < v2
     fi
-    
+
     # Major versions equal, compare minor
     if [ "$v1_minor" -gt "$v2_minor" ]; then
         return 0  # v1 > v2
     elif [ "$v1_minor" -lt "$v2_minor" ]; then
         return 1  # v1 < v2
     fi
-    
+
     # Minor versions equal, compare patch
     if [ "$v1_patch" -ge "$v2_patch" ]; then
         return 0  # v1 >= v2
@@ -141,341 +183,478 @@ version_compare() {
     fi
 }
 
-# Version-aware copy - only installs if source version is newer or equal
-copy_if_newer_version() {
-    local source="$1"
-    local destination="$2"
-    
-    # Check if source and destination are the same file - skip if identical
-    if [ "$(realpath "$source" 2>/dev/null)" = "$(realpath "$destination" 2>/dev/null)" ]; then
-        log_info "Source and destination identical, skipping: $(basename "$destination")"
-        return 0
-    fi
-    
-    # Validate paths - security requirement
-    local dest_dir
-    dest_dir=$(dirname "$destination")
-    # Skip path validation for TEST_HOME scenarios and standard installation paths
-    case "$dest_dir" in
-        */.sdd/templates|*/.claude/commands|*/.claude/agents|*/.claude/hooks) 
-            # Standard installation paths - allow
-            ;;
-        *)
-            validate_path "$dest_dir" "$HOME" || return 1
-            ;;
-    esac
-    
-    # Get versions
-    local source_version dest_version
-    source_version=$(extract_version "$source")
-    dest_version=$(extract_version "$destination")
-    
-    log_debug "Comparing versions: source=$source_version, destination=$dest_version"
-    
-    # Check if source version is newer or equal
-    if version_compare "$source_version" "$dest_version"; then
-        # Source version >= destination version, proceed with copy
-        if cp -p "$source" "$destination"; then
-            # Set secure file permissions
-            chmod 644 "$destination"
-            
-            if [ "$source_version" = "$dest_version" ]; then
-                log_info "Reinstalled same version: $(basename "$destination") v$source_version"
-            else
-                log_info "Updated: $(basename "$destination") v$dest_version → v$source_version"
-            fi
-            return 0
-        else
-            log_error "Failed to copy $source to $destination"
-            return 1
-        fi
-    else
-        # Source version < destination version, skip to prevent downgrade
-        log_warn "Skipping downgrade: $(basename "$destination") v$dest_version > v$source_version"
-        return 0
-    fi
-}
-
-# Validate file contents - following bundle_security.md requirements  
+# Validate file contents - following bundle_security.md requirements
 validate_markdown_file() {
     local file="$1"
-    
+
     # Check file exists and is readable
     if [ ! -r "$file" ]; then
         log_error "File is not readable: $file"
         return 1
     fi
-    
+
     # Check for YAML frontmatter - basic content validation
-    if ! head -1 "$file" | grep -q "^---$"; then
+    local first_line=""
+    IFS= read -r first_line < "$file" || true
+    if [ "$first_line" != "---" ]; then
         log_warn "File may not have YAML frontmatter: $(basename "$file")"
         return 0  # Don't fail, just warn
     fi
-    
+
     # Check for version field in frontmatter
     local version
     version=$(extract_version "$file")
     if [ "$version" = "0.0.0" ]; then
         log_warn "File missing version in frontmatter: $(basename "$file")"
     fi
-    
+
     return 0
 }
 
 # Validate command file structure - following bundle_code_context.md patterns
 validate_command_file() {
     local file="$1"
-    
+
     validate_markdown_file "$file" || return 1
-    
+
     # Check for required frontmatter fields - Claude Code integration requirement
     if ! grep -q "^description:" "$file"; then
         log_error "Command file missing required 'description' field: $(basename "$file")"
         return 1
     fi
-    
+
     return 0
 }
 
-# BEHAVIOR 1: Global Template Installation - following task blueprint requirements
-install_templates() {
-    log_info "Installing SDD templates to $SDD_TEMPLATES_DIR..."
-    
-    # Validate source directory exists - error handling requirement
-    if [ ! -d "$TEMPLATES_SOURCE" ]; then
-        log_error "Source templates directory not found: $TEMPLATES_SOURCE"
-        return 1
+# SHA-256 of any number of files in one process, one hash per line in order
+sha256_files() {
+    [ $# -gt 0 ] || return 0
+    if command -v sha256sum >/dev/null 2>&1; then
+        sha256sum -- "$@" | cut -d' ' -f1
+    else
+        shasum -a 256 -- "$@" | cut -d' ' -f1
     fi
-    
-    # Create destination directory with appropriate permissions - security requirement
-    if ! mkdir -p -m 755 "$SDD_TEMPLATES_DIR"; then
-        log_error "Failed to create templates directory: $SDD_TEMPLATES_DIR"
-        return 1
+}
+
+# "mtime:size" of any number of files in one process, with sub-second mtimes
+# where stat supports them (GNU, then BSD stat)
+file_signatures() {
+    [ $# -gt 0 ] || return 0
+    local output
+    output=$(stat -c '%.9Y:%s' -- "$@" 2>/dev/null) \
+        || output=$(stat -c '%Y:%s' -- "$@" 2>/dev/null) \
+        || output=$(stat -f '%Fm:%z' -- "$@")
+    echo "$output"
+}
+
+# Queue one source file in the install plan
+add_to_plan() {
+    local kind="$1"
+    local source="$2"
+    local destination="$3"
+    local mode="$4"
+
+    PLAN_KINDS+=("$kind")
+    PLAN_SOURCES+=("$source")
+    PLAN_DESTINATIONS+=("$destination")
+    PLAN_MODES+=("$mode")
+}
+
+# Gather every installable source file - globbing only, no subprocesses
+collect_sources() {
+    local file
+
+    for file in "$TEMPLATES_SOURCE"/*.md; do
+        if [ -f "$file" ]; then
+            add_to_plan template "$file" "$SDD_TEMPLATES_DIR/${file##*/}" 644
+        fi
+    done
+
+    for file in "$COMMANDS_SOURCE"/*.md; do
+        # Skip temporary/development files - following bundle_code_context.md guidance
+        if [[ "$file" == *"_temp.md" ]]; then
+            log_info "Skipping development file: ${file##*/}"
+        elif [ -f "$file" ]; then
+            add_to_plan command "$file" "$CLAUDE_COMMANDS_DIR/${file##*/}" 644
+        fi
+    done
+
+    # Agents and hooks are optional
+    for file in "$AGENTS_SOURCE"/*.md; do
+        if [ -f "$file" ]; then
+            add_to_plan agent "$file" "$CLAUDE_AGENTS_DIR/${file##*/}" 644
+        fi
+    done
+
+    # Python hook scripts need executable permissions
+    for file in "$HOOKS_SOURCE"/*.py; do
+        if [ -f "$file" ]; then
+            add_to_plan hook "$file" "$CLAUDE_HOOKS_DIR/${file##*/}" 755
+        fi
+    done
+    for file in "$HOOKS_SOURCE"/*.md; do
+        if [ -f "$file" ]; then
+            add_to_plan hook "$file" "$CLAUDE_HOOKS_DIR/${file##*/}" 644
+        fi
+    done
+    for file in "$HOOKS_SOURCE"/lib/* "$HOOKS_SOURCE"/sounds/*; do
+        if [ -f "$file" ]; then
+            add_to_plan hook "$file" "$CLAUDE_HOOKS_DIR/${file#"$HOOKS_SOURCE"/}" 644
+        fi
+    done
+}
+
+# BEHAVIOR 1: Compute the full install plan up front
+# Each entry ends up with one action:
+#   unchanged - source and destination match the lockfile; nothing is read
+#   current   - destination already has the source content
+#   keep      - destination has a newer version; never downgraded
+#   invalid   - source failed validation; skipped with a warning
+#   install / update - copied by apply_plan
+plan_install() {
+    collect_sources
+
+    local count=${#PLAN_SOURCES[@]}
+    local i
+
+    # Stat every source and existing destination in a single call
+    local files=() existing=()
+    for ((i = 0; i < count; i++)); do
+        files+=("${PLAN_SOURCES[$i]}")
+    done
+    for ((i = 0; i < count; i++)); do
+        if [ -f "${PLAN_DESTINATIONS[$i]}" ]; then
+            files+=("${PLAN_DESTINATIONS[$i]}")
+            existing+=("$i")
+        fi
+    done
+    local signatures=() signature
+    while IFS= read -r signature; do
+        signatures+=("$signature")
+    done < <(file_signatures "${files[@]}")
+
+    PLAN_SOURCE_SIGNATURES=("${signatures[@]:0:$count}")
+    PLAN_DEST_SIGNATURES=()
+    for ((i = 0; i < count; i++)); do
+        PLAN_DEST_SIGNATURES+=("")
+    done
+    local n=$count index
+    for index in ${existing[@]+"${existing[@]}"}; do
+        PLAN_DEST_SIGNATURES[$index]="${signatures[$n]}"
+        n=$((n + 1))
+    done
+
+    # Entries whose signatures match the lockfile need no further work
+    local lock_lines=() line
+    if [ -f "$INSTALL_LOCK" ]; then
+        {
+            IFS= read -r line || true
+            if [ "$line" = "# SDD install lock v$LOCK_FORMAT" ]; then
+                while IFS= read -r line; do
+                    lock_lines+=("$line")
+                done
+            fi
+        } < "$INSTALL_LOCK"
     fi
-    
-    # Copy templates with validation - following bundle_architecture.md patterns
-    local template_count=0
-    for template in "$TEMPLATES_SOURCE"/*.md; do
-        if [ -f "$template" ]; then
-            local filename
-            filename=$(basename "$template")
-            
-            # Validate template file before copying
-            if validate_markdown_file "$template"; then
-                if copy_if_newer_version "$template" "$SDD_TEMPLATES_DIR/$filename"; then
-                    ((template_count++))
-                else
-                    log_error "Failed to install template: $filename"
-                    return 1
-                fi
+
+    # The lock is written in plan order, so matches are found by walking a
+    # cursor forward; a full scan is only needed when the source set changed
+    local pending=() cursor=0 j prefix match
+    PLAN_ACTIONS=()
+    PLAN_VERSIONS=()
+    PLAN_HASHES=()
+    for ((i = 0; i < count; i++)); do
+        PLAN_ACTIONS+=("")
+        PLAN_VERSIONS+=("")
+        PLAN_HASHES+=("")
+        prefix="${PLAN_DESTINATIONS[$i]}"$'\t'"${PLAN_SOURCE_SIGNATURES[$i]}"$'\t'"${PLAN_DEST_SIGNATURES[$i]}"$'\t'
+        match=""
+        if [ -n "${PLAN_DEST_SIGNATURES[$i]}" ]; then
+            if [[ "${lock_lines[$cursor]-}" == "$prefix"* ]]; then
+                match=$cursor
             else
-                log_warn "Skipping invalid template: $filename"
+                for ((j = 0; j < ${#lock_lines[@]}; j++)); do
+                    if [[ "${lock_lines[$j]}" == "$prefix"* ]]; then
+                        match=$j
+                        break
+                    fi
+                done
             fi
         fi
+        if [ -n "$match" ]; then
+            cursor=$((match + 1))
+            line="${lock_lines[$match]#"$prefix"}"
+            PLAN_ACTIONS[$i]="unchanged"
+            PLAN_VERSIONS[$i]="${line%%$'\t'*}"
+            PLAN_HASHES[$i]="${line#*$'\t'}"
+            FILES_UNCHANGED+=1
+        else
+            pending+=("$i")
+        fi
     done
-    
-    TEMPLATES_INSTALLED=$template_count
-    log_info "Installed $template_count template files"
-    return 0
-}
 
-# BEHAVIOR 2: Claude Code Commands Installation - following task blueprint requirements
-install_commands() {
-    log_info "Installing SDD commands to $CLAUDE_COMMANDS_DIR..."
-    
-    # Validate source directory exists
-    if [ ! -d "$COMMANDS_SOURCE" ]; then
-        log_error "Source commands directory not found: $COMMANDS_SOURCE"
-        return 1
-    fi
-    
-    # Create destination directory with appropriate permissions
-    if ! mkdir -p -m 755 "$CLAUDE_COMMANDS_DIR"; then
-        log_error "Failed to create commands directory: $CLAUDE_COMMANDS_DIR"
-        return 1
-    fi
-    
-    # Copy commands with validation
-    local command_count=0
-    for command in "$COMMANDS_SOURCE"/*.md; do
-        if [ -f "$command" ]; then
-            local filename
-            filename=$(basename "$command")
-            
-            # Skip temporary/development files - following bundle_code_context.md guidance
-            if [[ "$filename" == *"_temp.md" ]]; then
-                log_info "Skipping development file: $filename"
+    [ ${#pending[@]} -gt 0 ] || return 0
+
+    # Hash changed sources and their existing destinations in a single call
+    local hash_files=() hashed_destinations=()
+    for index in "${pending[@]}"; do
+        hash_files+=("${PLAN_SOURCES[$index]}")
+    done
+    for index in "${pending[@]}"; do
+        if [ -n "${PLAN_DEST_SIGNATURES[$index]}" ]; then
+            hash_files+=("${PLAN_DESTINATIONS[$index]}")
+            hashed_destinations+=("$index")
+        fi
+    done
+    local hashes=() hash
+    while IFS= read -r hash; do
+        hashes+=("$hash")
+    done < <(sha256_files "${hash_files[@]}")
+
+    local dest_hashes=()
+    for ((i = 0; i < count; i++)); do
+        dest_hashes+=("")
+    done
+    n=${#pending[@]}
+    for index in ${hashed_destinations[@]+"${hashed_destinations[@]}"}; do
+        dest_hashes[$index]="${hashes[$n]}"
+        n=$((n + 1))
+    done
+
+    # Decide an action for each changed entry
+    local source destination source_version dest_version
+    n=0
+    for index in "${pending[@]}"; do
+        source="${PLAN_SOURCES[$index]}"
+        destination="${PLAN_DESTINATIONS[$index]}"
+        PLAN_HASHES[$index]="${hashes[$n]}"
+        n=$((n + 1))
+
+        source_version="-"
+        [[ "$source" != *.md ]] || source_version=$(extract_version "$source")
+        PLAN_VERSIONS[$index]="$source_version"
+
+        if [ "$source" -ef "$destination" ]; then
+            log_info "Source and destination identical, skipping: ${destination##*/}"
+            PLAN_ACTIONS[$index]="current"
+            FILES_UNCHANGED+=1
+            continue
+        fi
+
+        if [ -n "${PLAN_DEST_SIGNATURES[$index]}" ]; then
+            if [ "${dest_hashes[$index]}" = "${PLAN_HASHES[$index]}" ]; then
+                PLAN_ACTIONS[$index]="current"
+                FILES_UNCHANGED+=1
                 continue
             fi
-            
-            # Validate command file before copying
-            if validate_command_file "$command"; then
-                if copy_if_newer_version "$command" "$CLAUDE_COMMANDS_DIR/$filename"; then
-                    ((command_count++))
-                else
-                    log_error "Failed to install command: $filename"
-                    return 1
+            if [ "$source_version" != "-" ]; then
+                dest_version=$(extract_version "$destination")
+                log_debug "Comparing versions: source=$source_version, destination=$dest_version"
+                if ! version_compare "$source_version" "$dest_version"; then
+                    PLAN_ACTIONS[$index]="keep"
+                    PLAN_VERSIONS[$index]="$dest_version"
+                    PLAN_HASHES[$index]="${dest_hashes[$index]}"
+                    continue
                 fi
-            else
-                log_warn "Skipping invalid command: $filename"
             fi
         fi
+
+        # Validate markdown sources before they are installed
+        if [ "${PLAN_KINDS[$index]}" = command ]; then
+            if ! validate_command_file "$source"; then
+                PLAN_ACTIONS[$index]="invalid"
+                continue
+            fi
+        elif [ "$source_version" != "-" ] && ! validate_markdown_file "$source"; then
+            PLAN_ACTIONS[$index]="invalid"
+            continue
+        fi
+
+        if [ -n "${PLAN_DEST_SIGNATURES[$index]}" ]; then
+            PLAN_ACTIONS[$index]="update"
+        else
+            PLAN_ACTIONS[$index]="install"
+        fi
     done
-    
-    COMMANDS_INSTALLED=$command_count
-    log_info "Installed $command_count command files"
-    return 0
 }
 
-# Optional: Install Claude Code agents
-install_agents() {
-    log_info "Installing SDD agents to $CLAUDE_AGENTS_DIR..."
-    
-    # Agents are optional - don't fail if directory doesn't exist
-    if [ ! -d "$AGENTS_SOURCE" ]; then
-        log_info "No agents directory found - skipping agent installation"
-        return 0
-    fi
-    
-    # Create destination directory with appropriate permissions
-    if ! mkdir -p -m 755 "$CLAUDE_AGENTS_DIR"; then
-        log_error "Failed to create agents directory: $CLAUDE_AGENTS_DIR"
-        return 1
-    fi
-    
-    # Copy agents with validation
-    local agent_count=0
-    for agent in "$AGENTS_SOURCE"/*.md; do
-        if [ -f "$agent" ]; then
-            local filename
-            filename=$(basename "$agent")
-            
-            # Validate agent file before copying
-            if validate_markdown_file "$agent"; then
-                if copy_if_newer_version "$agent" "$CLAUDE_AGENTS_DIR/$filename"; then
-                    ((agent_count++))
-                else
-                    log_error "Failed to install agent: $filename"
-                    return 1
+# Human-readable label for a plan entry, relative to the install roots
+plan_label() {
+    local destination="$1"
+    case "$destination" in
+        "$SDD_TEMPLATES_DIR"/*) echo "templates/${destination#"$SDD_TEMPLATES_DIR"/}" ;;
+        "$CLAUDE_COMMANDS_DIR"/*) echo "commands/${destination#"$CLAUDE_COMMANDS_DIR"/}" ;;
+        "$CLAUDE_AGENTS_DIR"/*) echo "agents/${destination#"$CLAUDE_AGENTS_DIR"/}" ;;
+        "$CLAUDE_HOOKS_DIR"/*) echo "hooks/${destination#"$CLAUDE_HOOKS_DIR"/}" ;;
+        *) echo "$destination" ;;
+    esac
+}
+
+# Dry run: print the plan (and unified diffs of updates with --diff)
+show_plan() {
+    local count=${#PLAN_SOURCES[@]}
+    local i action label version changes=0
+
+    log_info "Install plan (dry run - nothing will be written):"
+    for ((i = 0; i < count; i++)); do
+        action="${PLAN_ACTIONS[$i]}"
+        label=$(plan_label "${PLAN_DESTINATIONS[$i]}")
+        version="${PLAN_VERSIONS[$i]}"
+        [ "$version" = "-" ] && version="" || version=" v$version"
+        case "$action" in
+            install) echo "  + install  $label$version"; changes=$((changes + 1)) ;;
+            update)
+                echo "  ~ update   $label v$(extract_version "${PLAN_DESTINATIONS[$i]}") →$version"
+                changes=$((changes + 1))
+                if [ "$SHOW_DIFF" = true ]; then
+                    diff -u "${PLAN_DESTINATIONS[$i]}" "${PLAN_SOURCES[$i]}" | sed 's/^/      /' || true
                 fi
-            else
-                log_warn "Skipping invalid agent: $filename"
-            fi
-        fi
+                ;;
+            keep) echo "  ! keep     $label$version (newer than source)" ;;
+            invalid) echo "  ! skip     $label (failed validation)" ;;
+        esac
     done
-    
-    AGENTS_INSTALLED=$agent_count
-    log_info "Installed $agent_count agent files"
-    return 0
+    log_info "$changes files would change, $((count - changes)) unchanged or skipped"
 }
 
-# Optional: Install Claude Code hooks
-install_hooks() {
-    log_info "Installing SDD hooks to $CLAUDE_HOOKS_DIR..."
-    
-    # Hooks are optional - don't fail if directory doesn't exist
-    if [ ! -d "$HOOKS_SOURCE" ]; then
-        log_info "No hooks directory found - skipping hook installation"
-        return 0
-    fi
-    
-    # Create destination directory with appropriate permissions
-    if ! mkdir -p -m 755 "$CLAUDE_HOOKS_DIR"; then
-        log_error "Failed to create hooks directory: $CLAUDE_HOOKS_DIR"
+# Install one destination directory's worth of plan entries with a single cp
+# and a single chmod - validate_path runs once per directory, not per file
+copy_group() {
+    local directory="$1"
+    local mode="$2"
+    shift 2
+
+    # Skip path validation for TEST_HOME scenarios and standard installation paths
+    case "$directory" in
+        */.sdd/templates|*/.claude/commands|*/.claude/agents|*/.claude/hooks|*/.claude/hooks/*)
+            # Standard installation paths - allow
+            ;;
+        *)
+            validate_path "$directory" "$HOME" || return 1
+            ;;
+    esac
+
+    local sources=() destinations=() index
+    for index in "$@"; do
+        sources+=("${PLAN_SOURCES[$index]}")
+        destinations+=("${PLAN_DESTINATIONS[$index]}")
+    done
+
+    if ! cp -p -- "${sources[@]}" "$directory/"; then
+        log_error "Failed to copy files to $directory"
         return 1
     fi
-    
-    # Copy hooks with validation - including subdirectories
-    local hook_count=0
-    
-    # Copy Python hook files
-    for hook in "$HOOKS_SOURCE"/*.py; do
-        if [ -f "$hook" ]; then
-            local filename
-            filename=$(basename "$hook")
-            
-            # Set executable permissions for Python scripts
-            if cp -p "$hook" "$CLAUDE_HOOKS_DIR/$filename"; then
-                chmod 755 "$CLAUDE_HOOKS_DIR/$filename"
-                log_info "Installed hook: $filename"
-                ((hook_count++))
-            else
-                log_error "Failed to install hook: $filename"
-                return 1
-            fi
+    # Set secure file permissions
+    chmod "$mode" -- "${destinations[@]}"
+}
+
+# BEHAVIOR 2: Apply the plan with batched directory creation and copies
+apply_plan() {
+    local count=${#PLAN_SOURCES[@]}
+    local i
+
+    # Group copies by destination directory and file mode
+    local groups=() directories=() group action
+    for ((i = 0; i < count; i++)); do
+        action="${PLAN_ACTIONS[$i]}"
+        [ "$action" = install ] || [ "$action" = update ] || continue
+        group="${PLAN_MODES[$i]} ${PLAN_DESTINATIONS[$i]%/*}"
+        if [[ " ${groups[*]-} " != *" $group "* ]]; then
+            groups+=("$group")
+            directories+=("${PLAN_DESTINATIONS[$i]%/*}")
         fi
     done
-    
-    # Copy README and other markdown files
-    for doc in "$HOOKS_SOURCE"/*.md; do
-        if [ -f "$doc" ]; then
-            local filename
-            filename=$(basename "$doc")
-            
-            if validate_markdown_file "$doc"; then
-                if copy_if_newer_version "$doc" "$CLAUDE_HOOKS_DIR/$filename"; then
-                    ((hook_count++))
-                else
-                    log_error "Failed to install hook documentation: $filename"
-                    return 1
-                fi
-            else
-                log_warn "Skipping invalid hook documentation: $filename"
-            fi
+
+    # Create destination directories with appropriate permissions - security requirement
+    if [ ${#directories[@]} -gt 0 ] && ! mkdir -p -m 755 -- "${directories[@]}"; then
+        log_error "Failed to create installation directories"
+        return 1
+    fi
+
+    local members
+    for group in ${groups[@]+"${groups[@]}"}; do
+        members=()
+        for ((i = 0; i < count; i++)); do
+            action="${PLAN_ACTIONS[$i]}"
+            [ "$action" = install ] || [ "$action" = update ] || continue
+            [ "${PLAN_MODES[$i]} ${PLAN_DESTINATIONS[$i]%/*}" = "$group" ] && members+=("$i")
+        done
+        copy_group "${group#* }" "${group%% *}" "${members[@]}" || return 1
+    done
+
+    local label version
+    for ((i = 0; i < count; i++)); do
+        action="${PLAN_ACTIONS[$i]}"
+        label=$(plan_label "${PLAN_DESTINATIONS[$i]}")
+        if [ "$action" = keep ]; then
+            log_warn "Skipping downgrade: $label v${PLAN_VERSIONS[$i]} is newer than the source"
+            continue
+        elif [ "$action" = invalid ]; then
+            log_warn "Skipping invalid ${PLAN_KINDS[$i]}: $label"
+            continue
+        fi
+        [ "$action" = install ] || [ "$action" = update ] || continue
+        version="${PLAN_VERSIONS[$i]}"
+        if [ "$version" = "-" ]; then
+            log_info "Installed: $label"
+        else
+            log_info "Installed: $label v$version"
         fi
+        case "${PLAN_KINDS[$i]}" in
+            template) TEMPLATES_INSTALLED+=1 ;;
+            command) COMMANDS_INSTALLED+=1 ;;
+            agent) AGENTS_INSTALLED+=1 ;;
+            hook) HOOKS_INSTALLED+=1 ;;
+        esac
     done
-    
-    # Copy lib directory if it exists
-    if [ -d "$HOOKS_SOURCE/lib" ]; then
-        if ! mkdir -p -m 755 "$CLAUDE_HOOKS_DIR/lib"; then
-            log_error "Failed to create hooks lib directory"
-            return 1
+}
+
+# True when the plan copies files or the lockfile needs rewriting
+plan_has_changes() {
+    local action
+    for action in ${PLAN_ACTIONS[@]+"${PLAN_ACTIONS[@]}"}; do
+        [ "$action" = unchanged ] || [ "$action" = invalid ] || return 0
+    done
+    return 1
+}
+
+# Record installed versions and hashes so unchanged re-runs are a no-op
+# Format: <destination> TAB <source mtime:size> TAB <destination mtime:size>
+#         TAB <version> TAB <sha256>
+write_lock() {
+    local count=${#PLAN_SOURCES[@]}
+    local i action
+
+    # Destinations written by this run need fresh signatures
+    local copied=()
+    for ((i = 0; i < count; i++)); do
+        action="${PLAN_ACTIONS[$i]}"
+        if [ "$action" = install ] || [ "$action" = update ]; then
+            copied+=("$i")
         fi
-        
-        for lib_file in "$HOOKS_SOURCE/lib"/*; do
-            if [ -f "$lib_file" ]; then
-                local filename
-                filename=$(basename "$lib_file")
-                
-                if cp -p "$lib_file" "$CLAUDE_HOOKS_DIR/lib/$filename"; then
-                    chmod 644 "$CLAUDE_HOOKS_DIR/lib/$filename"
-                    log_info "Installed lib file: lib/$filename"
-                    ((hook_count++))
-                else
-                    log_error "Failed to install lib file: $filename"
-                    return 1
-                fi
-            fi
+    done
+    if [ ${#copied[@]} -gt 0 ]; then
+        local files=() index signature n=0
+        for index in "${copied[@]}"; do
+            files+=("${PLAN_DESTINATIONS[$index]}")
         done
+        while IFS= read -r signature; do
+            PLAN_DEST_SIGNATURES[${copied[$n]}]="$signature"
+            n=$((n + 1))
+        done < <(file_signatures "${files[@]}")
     fi
-    
-    # Copy sounds directory if it exists
-    if [ -d "$HOOKS_SOURCE/sounds" ]; then
-        if ! mkdir -p -m 755 "$CLAUDE_HOOKS_DIR/sounds"; then
-            log_error "Failed to create hooks sounds directory"
-            return 1
-        fi
-        
-        for sound_file in "$HOOKS_SOURCE/sounds"/*; do
-            if [ -f "$sound_file" ]; then
-                local filename
-                filename=$(basename "$sound_file")
-                
-                if cp -p "$sound_file" "$CLAUDE_HOOKS_DIR/sounds/$filename"; then
-                    chmod 644 "$CLAUDE_HOOKS_DIR/sounds/$filename"
-                    log_info "Installed sound file: sounds/$filename"
-                    ((hook_count++))
-                else
-                    log_error "Failed to install sound file: $filename"
-                    return 1
-                fi
-            fi
+
+    mkdir -p -m 755 "${INSTALL_LOCK%/*}"
+    {
+        echo "# SDD install lock v$LOCK_FORMAT"
+        for ((i = 0; i < count; i++)); do
+            [ "${PLAN_ACTIONS[$i]}" != invalid ] || continue
+            printf '%s\t%s\t%s\t%s\t%s\n' "${PLAN_DESTINATIONS[$i]}" \
+                "${PLAN_SOURCE_SIGNATURES[$i]}" "${PLAN_DEST_SIGNATURES[$i]}" \
+                "${PLAN_VERSIONS[$i]}" "${PLAN_HASHES[$i]}"
         done
-    fi
-    
-    HOOKS_INSTALLED=$hook_count
-    log_info "Installed $hook_count hook files"
-    return 0
+    } > "$INSTALL_LOCK.tmp"
+    mv "$INSTALL_LOCK.tmp" "$INSTALL_LOCK"
 }
 
 # BEHAVIOR 3: Installation Validation - following task blueprint requirements
@@ -553,6 +732,7 @@ show_installation_summary() {
     echo "  Commands installed: $COMMANDS_INSTALLED (in $CLAUDE_COMMANDS_DIR)"
     echo "  Agents installed: $AGENTS_INSTALLED (in $CLAUDE_AGENTS_DIR)"
     echo "  Hooks installed: $HOOKS_INSTALLED (in $CLAUDE_HOOKS_DIR)"
+    echo "  Already up to date: $FILES_UNCHANGED files"
     echo
     log_info "SDD system is now ready to use!"
     log_info "Try: /init_greenfield your-project-name"
@@ -580,8 +760,31 @@ handle_error() {
 # Set up error handling - following bundle_security.md patterns
 trap 'handle_error $LINENO' ERR
 
+# Parse command line options
+parse_args() {
+    while [ $# -gt 0 ]; do
+        case "$1" in
+            --dry-run) DRY_RUN=true ;;
+            --diff) DRY_RUN=true; SHOW_DIFF=true ;;
+            -h|--help)
+                echo "Usage: $SCRIPT_NAME [--dry-run] [--diff]"
+                echo "  --dry-run  show the install plan without writing anything"
+                echo "  --diff     like --dry-run, with unified diffs of updated files"
+                exit 0
+                ;;
+            *)
+                log_error "Unknown option: $1"
+                exit 2
+                ;;
+        esac
+        shift
+    done
+}
+
 # Main installation function - following bundle_code_context.md patterns  
 main() {
+    parse_args "$@"
+
     log_info "Starting SDD system installation..."
     log_info "Script location: $SCRIPT_DIR"
     
@@ -603,11 +806,22 @@ main() {
         exit 10
     fi
     
+    # Compute the full plan before touching anything
+    plan_install || { log_error "Install planning failed"; exit 1; }
+    
+    if [ "$DRY_RUN" = true ]; then
+        show_plan
+        exit 0
+    fi
+    
+    if ! plan_has_changes; then
+        log_info "SDD system already up to date ($FILES_UNCHANGED files unchanged)"
+        exit 0
+    fi
+    
     # Perform installation steps
-    install_templates || { log_error "Template installation failed"; exit 1; }
-    install_commands || { log_error "Commands installation failed"; exit 1; }
-    install_agents || { log_error "Agents installation failed"; exit 1; }
-    install_hooks || { log_error "Hooks installation failed"; exit 1; }
+    apply_plan || { log_error "Installation failed"; exit 1; }
+    write_lock || { log_error "Failed to write install lock: $INSTALL_LOCK"; exit 1; }
     
     # Validate installation
     verify_installation || { log_error "Installation verification failed"; exit 13; }
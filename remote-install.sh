@@ -10,6 +10,17 @@
 #   curl -sSL https://raw.githubusercontent.com/kpiteira/spec-driven-development/main/remote-install.sh -o /tmp/sdd-install.sh
 #   # Review script contents
 #   bash /tmp/sdd-install.sh
+#
+# Options:
+#   --mirror <dir|file://path>  Install from a local checkout, directory or
+#                               tarball instead of GitHub (air-gapped CI)
+#   --jobs <n>                  Parallel downloads (default: 8, or $SDD_JOBS)
+#   --write-manifest [dir]      Regenerate install-manifest.txt for a checkout
+#
+# Every release publishes install-manifest.txt listing the SHA-256 checksum
+# and frontmatter version of each installable file. Files whose checksum
+# already matches are skipped, downloads are verified and staged in
+# ~/.sdd/cache/install/ so an interrupted install resumes where it stopped.
 
 set -euo pipefail
 
@@ -18,7 +29,18 @@ readonly REPO_OWNER="${SDD_REPO_OWNER:-kpiteira}"
 readonly REPO_NAME="${SDD_REPO_NAME:-spec-driven-development}"
 readonly REPO_VERSION="${SDD_VERSION:-main}"
 readonly BASE_URL="https://github.com/$REPO_OWNER/$REPO_NAME"
-readonly RAW_URL="$BASE_URL/raw/$REPO_VERSION"
+readonly RAW_URL="${SDD_RAW_URL:-$BASE_URL/raw/$REPO_VERSION}"
+
+# Only HTTPS downloads unless a test stand-in is explicitly allowed
+if [[ "$RAW_URL" != https://* && "${SDD_ALLOW_INSECURE:-false}" == "true" ]]; then
+    readonly CURL_PROTOCOLS="=http,https"
+else
+    readonly CURL_PROTOCOLS="=https"
+fi
+
+# Install manifest: "<sha256> <version> <path>" per installable file
+readonly MANIFEST_NAME="install-manifest.txt"
+readonly MANIFEST_FORMAT=1
 
 # Installation paths - identical to local installation
 readonly SDD_TEMPLATES_DIR="${TEST_HOME:-$HOME}/.sdd/templates"
@@ -30,6 +52,46 @@ readonly CLAUDE_HOOKS_DIR="${TEST_HOME:-$HOME}/.claude/hooks"
 readonly TEMP_DIR="/tmp/sdd-install-$$"
 readonly INSTALL_LOG="$TEMP_DIR/install.log"
 
+# Verified downloads, kept until an install completes so it can be resumed
+readonly STAGING_DIR="${SDD_CACHE_DIR:-${TEST_HOME:-$HOME}/.sdd/cache}/install"
+
+# Installable files (repository paths), used to write the manifest and for
+# versions published before it existed
+readonly INSTALL_FILES=(
+    "specs/templates/0_Project_Vision_Template.md"
+    "specs/templates/1_Product_Requirements_Template.md"
+    "specs/templates/2_Architecture_Template.md"
+    "specs/templates/3_Roadmap_Template.md"
+    "specs/templates/4_Milestone_Plan_Template.md"
+    "specs/templates/5_Task_Blueprint_Template.md"
+    ".claude/commands/init_greenfield.md"
+    ".claude/commands/plan_milestone.md"
+    ".claude/commands/task.md"
+    ".claude/agents/architecture-specialist.md"
+    ".claude/agents/bundler-specialist.md"
+    ".claude/agents/coder-specialist.md"
+    ".claude/agents/milestone-planning-specialist.md"
+    ".claude/agents/requirements-specialist.md"
+    ".claude/agents/roadmap-specialist.md"
+    ".claude/agents/task-blueprint-specialist.md"
+    ".claude/agents/validator-specialist.md"
+    ".claude/hooks/README.md"
+    ".claude/hooks/sdd-session-logger.py"
+    ".claude/hooks/sdd-activity-logger.py"
+    ".claude/hooks/sdd-performance-tracker.py"
+    ".claude/hooks/sdd-session-summary.py"
+    ".claude/hooks/lib/notification_system.py"
+    ".claude/hooks/sounds/success.wav"
+    ".claude/hooks/sounds/error.wav"
+    ".claude/hooks/sounds/warning.wav"
+    ".claude/hooks/sounds/progress.wav"
+)
+
+# Command line options
+MIRROR_SOURCE=""
+MIRROR_DIR=""
+SDD_JOBS="${SDD_JOBS:-8}"
+
 # Color codes for output
 readonly RED='\033[0;31m'
 readonly GREEN='\033[0;32m'
@@ -42,6 +104,13 @@ declare -i TEMPLATES_INSTALLED=0
 declare -i COMMANDS_INSTALLED=0
 declare -i AGENTS_INSTALLED=0
 declare -i HOOKS_INSTALLED=0
+declare -i FILES_UNCHANGED=0
+declare -i FILES_DOWNLOADED=0
+
+# Parsed install manifest (parallel arrays, bash 3.2 has no associative arrays)
+MANIFEST_HASHES=()
+MANIFEST_VERSIONS=()
+MANIFEST_PATHS=()
 
 # Logging functions
 log_info() { 
@@ -82,7 +151,11 @@ show_security_warning() {
     echo "  • Install Claude Code agents to: $CLAUDE_AGENTS_DIR"
     echo "  • Install Claude Code hooks to: $CLAUDE_HOOKS_DIR"
     echo
-    echo "Source repository: $BASE_URL"
+    if [[ -n "$MIRROR_SOURCE" ]]; then
+        echo "Source mirror: $MIRROR_SOURCE"
+    else
+        echo "Source repository: $BASE_URL"
+    fi
     echo "Version: $REPO_VERSION"
     echo "Installation log: $INSTALL_LOG"
     echo
@@ -106,11 +179,13 @@ show_security_warning() {
 check_prerequisites() {
     log_info "Checking prerequisites..."
     
-    # Check required commands
-    command -v curl >/dev/null 2>&1 || {
-        log_error "curl is required but not installed"
-        exit 1
-    }
+    # Check required commands (mirror installs need no network access)
+    if [[ -z "$MIRROR_SOURCE" ]]; then
+        command -v curl >/dev/null 2>&1 || {
+            log_error "curl is required but not installed"
+            exit 1
+        }
+    fi
     
     # Check checksum utility
     if ! command -v shasum >/dev/null 2>&1 && ! command -v sha256sum >/dev/null 2>&1; then
@@ -128,8 +203,19 @@ check_prerequisites() {
         log_warn "Using older bash version $BASH_VERSION - consider upgrading to bash 4.0+ for better compatibility"
     fi
     
+    if [[ -n "$MIRROR_SOURCE" ]]; then
+        log_info "Prerequisites check passed (mirror install, network not required)"
+        return 0
+    fi
+
+    # Refuse plain HTTP unless explicitly allowed for a local test stand-in
+    if [[ "$RAW_URL" != https://* && "$CURL_PROTOCOLS" == "=https" ]]; then
+        log_error "Refusing non-HTTPS source $RAW_URL (set SDD_ALLOW_INSECURE=true for local testing)"
+        exit 1
+    fi
+
     # Check network connectivity
-    if ! curl -sSL --max-time 10 -I https://github.com >/dev/null 2>&1; then
+    if [[ -z "${SDD_RAW_URL:-}" ]] && ! curl -sSL --max-time 10 -I https://github.com >/dev/null 2>&1; then
         log_error "Network connectivity to GitHub required"
         exit 1
     fi
@@ -141,8 +227,8 @@ check_prerequisites() {
 setup_workspace() {
     log_info "Setting up temporary workspace..."
     
-    # Create temp directory with restricted permissions
-    mkdir -p -m 700 "$TEMP_DIR" || {
+    # Create temp and staging directories with restricted permissions
+    mkdir -p -m 700 "$TEMP_DIR" "$STAGING_DIR" || {
         log_error "Cannot create temporary directory: $TEMP_DIR"
         exit 1
     }
@@ -164,58 +250,85 @@ cleanup() {
     fi
 }
 
+# Compute SHA-256 checksums for any number of files in one process
+# Prints one hash per line, in argument order
+sha256_files() {
+    [[ $# -gt 0 ]] || return 0
+    if command -v sha256sum >/dev/null 2>&1; then
+        sha256sum -- "$@" | cut -d' ' -f1
+    else
+        shasum -a 256 -- "$@" | cut -d' ' -f1
+    fi
+}
+
+# Security: Verify a file against its expected SHA-256 checksum
+verify_checksum() {
+    local file="$1"
+    local expected_hash="$2"
+    local label="${3:-$(basename "$file")}"
+
+    local actual_hash
+    actual_hash=$(sha256_files "$file")
+
+    if [[ "$actual_hash" != "$expected_hash" ]]; then
+        log_error "Checksum verification failed for $label"
+        log_error "Expected: $expected_hash"
+        log_error "Actual: $actual_hash"
+        return 1
+    fi
+
+    log_debug "Checksum verified: $label"
+    return 0
+}
+
 # Security: Download and verify file
 secure_download() {
     local url="$1"
     local output_file="$2"
     local expected_hash="${3:-}"  # Optional checksum
-    
+
     log_debug "Downloading: $(basename "$url")"
-    
+
     # Download with security options and retry logic
     if ! curl -sSL --fail --max-time 30 --retry 3 --retry-delay 2 -A "SDD-Installer/1.0" \
-        "$url" -o "$output_file"; then
+        --proto "$CURL_PROTOCOLS" "$url" -o "$output_file"; then
         log_error "Failed to download: $url"
         return 1
     fi
-    
+
     # Verify checksum if provided
     if [[ -n "${expected_hash:-}" ]]; then
-        local actual_hash
-        if command -v sha256sum >/dev/null 2>&1; then
-            actual_hash=$(sha256sum "$output_file" | cut -d' ' -f1)
-        else
-            actual_hash=$(shasum -a 256 "$output_file" | cut -d' ' -f1)
-        fi
-        
-        if [[ "$actual_hash" != "$expected_hash" ]]; then
-            log_error "Checksum verification failed for $(basename "$output_file")"
-            log_error "Expected: $expected_hash"
-            log_error "Actual: $actual_hash"
-            return 1
-        fi
-        
-        log_debug "Checksum verified: $(basename "$output_file")"
+        verify_checksum "$output_file" "$expected_hash" "$(basename "$url")" || return 1
     fi
-    
+
     return 0
 }
 
 # Extract version from YAML frontmatter
+# Pure bash so version checks do not spawn a sed/grep pipeline per file
 extract_version() {
     local file="$1"
-    
+
     if [[ ! -f "$file" ]]; then
         echo "0.0.0"
         return 0
     fi
-    
-    local version
-    version=$(sed -n '/^---$/,/^---$/p' "$file" | \
-              grep '^version:' | \
-              sed 's/version: *"*\([^"]*\)"*.*/\1/' | \
-              head -1)
-    
+
+    local line version="" in_frontmatter=false
+    while IFS= read -r line || [[ -n "$line" ]]; do
+        if [[ "$line" == "---" ]]; then
+            if [[ "$in_frontmatter" == true ]]; then
+                in_frontmatter=false
+            else
+                in_frontmatter=true
+            fi
+        elif [[ "$in_frontmatter" == true && "$line" =~ ^version:[[:space:]]*\"?([^\"]*) ]]; then
+            version="${BASH_REMATCH[1]}"
+            version="${version%"${version##*[![:space:]]}"}"
+            break
+        fi
+    done < "$file"
+
     if [[ -z "$version" ]]; then
         echo "0.0.0"
     else
@@ -227,14 +340,14 @@ extract_version() {
 version_compare() {
     local v1="$1"
     local v2="$2"
-    
+
     # Split versions into components
     local v1_major v1_minor v1_patch
     local v2_major v2_minor v2_patch
-    
+
     IFS='.' read -r v1_major v1_minor v1_patch <<< "$v1"
     IFS='.' read -r v2_major v2_minor v2_patch <<< "$v2"
-    
+
     # Default missing components to 0
     v1_major=${v1_major:-0}
     v1_minor=${v1_minor:-0}
@@ -242,21 +355,21 @@ version_compare() {
     v2_major=${v2_major:-0}
     v2_minor=${v2_minor:-0}
     v2_patch=${v2_patch:-0}
-    
+
     # Compare major.minor.patch
     if [[ $v1_major -gt $v2_major ]]; then
         return 0  # v1 > v2
     elif [[ $v1_major -lt $v2_major ]]; then
         return 1  # v1 < v2
     fi
-    
+
     # Major versions equal, compare minor
     if [[ $v1_minor -gt $v2_minor ]]; then
         return 0  # v1 > v2
     elif [[ $v1_minor -lt $v2_minor ]]; then
         return 1  # v1 < v2
     fi
-    
+
     # Minor versions equal, compare patch
     if [[ $v1_patch -ge $v2_patch ]]; then
         return 0  # v1 >= v2
@@ -265,251 +378,344 @@ version_compare() {
     fi
 }
 
-# Version-aware file installation
-install_file_with_version() {
-    local source_file="$1"
-    local destination="$2"
-    
-    # Create destination directory if needed
-    local dest_dir
-    dest_dir=$(dirname "$destination")
-    mkdir -p "$dest_dir" || {
-        log_error "Cannot create directory: $dest_dir"
-        return 1
-    }
-    
-    # Get versions
-    local source_version dest_version
-    source_version=$(extract_version "$source_file")
-    dest_version=$(extract_version "$destination")
-    
-    log_debug "Comparing versions: source=$source_version, destination=$dest_version"
-    
-    # Check if source version is newer or equal
-    if version_compare "$source_version" "$dest_version"; then
-        # Copy with appropriate permissions
-        if cp "$source_file" "$destination"; then
-            chmod 644 "$destination"
-            
-            if [[ "$source_version" == "$dest_version" ]]; then
-                log_info "Reinstalled same version: $(basename "$destination") v$source_version"
-            else
-                log_info "Updated: $(basename "$destination") v$dest_version → v$source_version"
-            fi
-            return 0
-        else
-            log_error "Failed to copy $(basename "$source_file") to $destination"
+# Map a repository path from the manifest to its installed location
+# Rejects anything outside the four installable trees
+destination_for() {
+    local path="$1"
+
+    case "$path" in
+        */../*|../*|*/..) return 1 ;;
+        specs/templates/?*) echo "$SDD_TEMPLATES_DIR/${path#specs/templates/}" ;;
+        .claude/commands/?*) echo "$CLAUDE_COMMANDS_DIR/${path#.claude/commands/}" ;;
+        .claude/agents/?*) echo "$CLAUDE_AGENTS_DIR/${path#.claude/agents/}" ;;
+        .claude/hooks/?*) echo "$CLAUDE_HOOKS_DIR/${path#.claude/hooks/}" ;;
+        *) return 1 ;;
+    esac
+}
+
+# Templates and commands are required; agents and hooks are best effort
+is_required() {
+    case "$1" in
+        specs/templates/*|.claude/commands/*) return 0 ;;
+        *) return 1 ;;
+    esac
+}
+
+# Top-level hook scripts are executable, everything else is a document
+file_mode() {
+    case "$1" in
+        .claude/hooks/*/*) echo 644 ;;
+        .claude/hooks/*.py) echo 755 ;;
+        *) echo 644 ;;
+    esac
+}
+
+# Write install-manifest.txt for a repository checkout or mirror
+# Format: <sha256> <version or -> <repository path>, one file per line
+write_manifest() {
+    local repo_dir="$1"
+    local output="$2"
+
+    local present=()
+    local path
+    for path in "${INSTALL_FILES[@]}"; do
+        if [[ -f "$repo_dir/$path" ]]; then
+            present+=("$path")
+        elif is_required "$path"; then
+            log_error "Required file missing from $repo_dir: $path"
             return 1
+        else
+            log_warn "Optional file missing from $repo_dir: $path (skipping)"
         fi
-    else
-        # Skip downgrade
-        log_warn "Skipping downgrade: $(basename "$destination") v$dest_version > v$source_version"
-        return 0
+    done
+
+    local hashes=()
+    if [[ ${#present[@]} -gt 0 ]]; then
+        local hash
+        while IFS= read -r hash; do
+            hashes+=("$hash")
+        done < <(cd "$repo_dir" && sha256_files "${present[@]}")
     fi
-}
 
-# Download and install templates
-install_templates() {
-    log_info "Installing SDD templates..."
-    
-    # Template files to download
-    local templates=(
-        "0_Project_Vision_Template.md"
-        "1_Product_Requirements_Template.md"
-        "2_Architecture_Template.md"
-        "3_Roadmap_Template.md"
-        "4_Milestone_Plan_Template.md"
-        "5_Task_Blueprint_Template.md"
-    )
-    
-    local template_count=0
-    for template in "${templates[@]}"; do
-        local url="$RAW_URL/specs/templates/$template"
-        local temp_file="$TEMP_DIR/$template"
-        local dest_file="$SDD_TEMPLATES_DIR/$template"
-        
-        if secure_download "$url" "$temp_file"; then
-            if install_file_with_version "$temp_file" "$dest_file"; then
-                ((template_count++))
+    {
+        echo "# SDD install manifest v$MANIFEST_FORMAT"
+        echo "# <sha256> <version> <path>"
+        local i version
+        for ((i = 0; i < ${#present[@]}; i++)); do
+            path="${present[$i]}"
+            version="-"
+            if [[ "$path" == *.md ]]; then
+                version=$(extract_version "$repo_dir/$path")
             fi
-        else
-            log_error "Failed to download template: $template"
+            echo "${hashes[$i]} $version $path"
+        done
+    } > "$output.tmp.$$"
+    mv "$output.tmp.$$" "$output"
+
+    log_info "Wrote manifest with ${#present[@]} files: $output"
+}
+
+# Parse a manifest into the MANIFEST_* arrays
+load_manifest() {
+    local manifest="$1"
+
+    MANIFEST_HASHES=()
+    MANIFEST_VERSIONS=()
+    MANIFEST_PATHS=()
+
+    local hash version path extra
+    while read -r hash version path extra || [[ -n "$hash" ]]; do
+        [[ -z "$hash" || "$hash" == \#* ]] && continue
+        if [[ ! "$hash" =~ ^[0-9a-f]{64}$ ]] || [[ -z "$path" || -n "$extra" ]]; then
+            log_error "Malformed manifest entry: $hash $version $path $extra"
             return 1
         fi
-    done
-    
-    TEMPLATES_INSTALLED=$template_count
-    log_info "Installed $template_count template files"
-    return 0
+        if ! destination_for "$path" >/dev/null; then
+            log_error "Manifest path outside installable directories: $path"
+            return 1
+        fi
+        MANIFEST_HASHES+=("$hash")
+        MANIFEST_VERSIONS+=("$version")
+        MANIFEST_PATHS+=("$path")
+    done < "$manifest"
+
+    if [[ ${#MANIFEST_PATHS[@]} -eq 0 ]]; then
+        log_error "Manifest lists no files: $manifest"
+        return 1
+    fi
+    log_debug "Manifest lists ${#MANIFEST_PATHS[@]} files"
 }
 
-# Download and install commands
-install_commands() {
-    log_info "Installing SDD commands..."
-    
-    # Command files to download
-    local commands=(
-        "init_greenfield.md"
-        "plan_milestone.md"
-        "task.md"
-    )
-    
-    local command_count=0
-    for command in "${commands[@]}"; do
-        local url="$RAW_URL/.claude/commands/$command"
-        local temp_file="$TEMP_DIR/$command"
-        local dest_file="$CLAUDE_COMMANDS_DIR/$command"
-        
-        if secure_download "$url" "$temp_file"; then
-            if install_file_with_version "$temp_file" "$dest_file"; then
-                ((command_count++))
+# Fetch one manifest entry into the staging cache
+# Objects are stored by checksum and only renamed into place once verified,
+# so anything already in the cache can be trusted by a resumed install
+fetch_object() {
+    local path="$1"
+    local hash="$2"
+    local object="$STAGING_DIR/$hash"
+    local partial
+    partial=$(mktemp "$STAGING_DIR/.partial-XXXXXX") || return 1
+
+    if [[ -n "$MIRROR_DIR" ]]; then
+        cp "$MIRROR_DIR/$path" "$partial" 2>/dev/null || {
+            log_error "Missing from mirror: $path"
+            rm -f "$partial"
+            return 1
+        }
+        verify_checksum "$partial" "$hash" "$path" || {
+            rm -f "$partial"
+            return 1
+        }
+    elif ! secure_download "$RAW_URL/$path" "$partial" "$hash"; then
+        rm -f "$partial"
+        return 1
+    fi
+
+    mv "$partial" "$object"
+}
+
+# BEHAVIOR: Plan, fetch (bounded parallelism) and install manifest entries
+install_from_manifest() {
+    local count=${#MANIFEST_PATHS[@]}
+    local i path destination
+
+    # Checksum every existing destination in a single pass
+    local destinations=() existing=() current_hashes=()
+    for ((i = 0; i < count; i++)); do
+        destination=$(destination_for "${MANIFEST_PATHS[$i]}")
+        destinations+=("$destination")
+        current_hashes+=("")
+        [[ -f "$destination" ]] && existing+=("$i")
+    done
+    if [[ ${#existing[@]} -gt 0 ]]; then
+        local existing_files=() index hash
+        for index in "${existing[@]}"; do
+            existing_files+=("${destinations[$index]}")
+        done
+        i=0
+        while IFS= read -r hash; do
+            current_hashes[${existing[$i]}]="$hash"
+            i=$((i + 1))
+        done < <(sha256_files "${existing_files[@]}")
+    fi
+
+    # Plan: skip files that already match, refuse downgrades, fetch the rest
+    local pending=() to_fetch=() queued=" "
+    local source_version dest_version
+    for ((i = 0; i < count; i++)); do
+        path="${MANIFEST_PATHS[$i]}"
+        destination="${destinations[$i]}"
+        if [[ "${current_hashes[$i]}" == "${MANIFEST_HASHES[$i]}" ]]; then
+            FILES_UNCHANGED+=1
+            continue
+        fi
+        source_version="${MANIFEST_VERSIONS[$i]}"
+        if [[ -n "${current_hashes[$i]}" && "$source_version" != "-" ]]; then
+            dest_version=$(extract_version "$destination")
+            if ! version_compare "$source_version" "$dest_version"; then
+                log_warn "Skipping downgrade: $(basename "$destination") v$dest_version > v$source_version"
+                continue
             fi
+        fi
+        pending+=("$i")
+        if [[ -f "$STAGING_DIR/${MANIFEST_HASHES[$i]}" ]]; then
+            log_debug "Resuming with staged copy: $path"
+        elif [[ "$queued" != *" ${MANIFEST_HASHES[$i]} "* ]]; then
+            to_fetch+=("$i")
+            queued+="${MANIFEST_HASHES[$i]} "
+        fi
+    done
+
+    log_info "${#pending[@]} files to install, $FILES_UNCHANGED already up to date, ${#to_fetch[@]} to fetch"
+
+    # Fetch with at most $SDD_JOBS transfers in flight
+    local pids=() pid_entries=() failed=()
+    local index
+    for index in ${to_fetch[@]+"${to_fetch[@]}"}; do
+        fetch_object "${MANIFEST_PATHS[$index]}" "${MANIFEST_HASHES[$index]}" &
+        pids+=("$!")
+        pid_entries+=("$index")
+        if [[ ${#pids[@]} -ge $SDD_JOBS ]]; then
+            wait "${pids[0]}" || failed+=("${pid_entries[0]}")
+            pids=(${pids[@]+"${pids[@]:1}"})
+            pid_entries=(${pid_entries[@]+"${pid_entries[@]:1}"})
+        fi
+    done
+    for ((i = 0; i < ${#pids[@]}; i++)); do
+        wait "${pids[$i]}" || failed+=("${pid_entries[$i]}")
+    done
+    FILES_DOWNLOADED=$(( ${#to_fetch[@]} - ${#failed[@]} ))
+
+    local required_failures=0
+    for index in ${failed[@]+"${failed[@]}"}; do
+        path="${MANIFEST_PATHS[$index]}"
+        if is_required "$path"; then
+            log_error "Failed to fetch required file: $path"
+            required_failures=$((required_failures + 1))
         else
-            log_error "Failed to download command: $command"
-            return 1
+            log_warn "Failed to fetch optional file: $path (continuing installation)"
         fi
     done
-    
-    COMMANDS_INSTALLED=$command_count
-    log_info "Installed $command_count command files"
-    return 0
-}
+    if [[ $required_failures -gt 0 ]]; then
+        log_error "Staged files are kept in $STAGING_DIR - re-run to resume"
+        return 1
+    fi
 
-# Download and install agents
-install_agents() {
-    log_info "Installing SDD agents..."
-    
-    # Agent files to download  
-    local agents=(
-        "architecture-specialist.md"
-        "bundler-specialist.md"
-        "coder-specialist.md" 
-        "milestone-planning-specialist.md"
-        "requirements-specialist.md"
-        "roadmap-specialist.md"
-        "task-blueprint-specialist.md"
-        "validator-specialist.md"
-    )
-    
-    local agent_count=0
-    for agent in "${agents[@]}"; do
-        local url="$RAW_URL/.claude/agents/$agent"
-        local temp_file="$TEMP_DIR/$agent"
-        local dest_file="$CLAUDE_AGENTS_DIR/$agent"
-        
-        if secure_download "$url" "$temp_file"; then
-            if install_file_with_version "$temp_file" "$dest_file"; then
-                ((agent_count++))
-            fi
+    # Apply: atomic replace of every planned file from the staging cache
+    local object mode
+    for index in ${pending[@]+"${pending[@]}"}; do
+        path="${MANIFEST_PATHS[$index]}"
+        destination="${destinations[$index]}"
+        object="$STAGING_DIR/${MANIFEST_HASHES[$index]}"
+        [[ -f "$object" ]] || continue  # optional file that failed to fetch
+
+        mode=$(file_mode "$path")
+        mkdir -p "$(dirname "$destination")" || {
+            log_error "Cannot create directory: $(dirname "$destination")"
+            return 1
+        }
+        cp "$object" "$destination.sdd-tmp" && chmod "$mode" "$destination.sdd-tmp" \
+            && mv "$destination.sdd-tmp" "$destination" || {
+            log_error "Failed to install $path"
+            rm -f "$destination.sdd-tmp"
+            return 1
+        }
+
+        if [[ -z "${current_hashes[$index]}" ]]; then
+            log_info "Installed: $(basename "$destination")"
+        elif [[ "${MANIFEST_VERSIONS[$index]}" == "-" ]]; then
+            log_info "Updated: $(basename "$destination")"
         else
-            log_warn "Failed to download agent: $agent (continuing installation)"
+            log_info "Updated: $(basename "$destination") → v${MANIFEST_VERSIONS[$index]}"
         fi
+        case "$path" in
+            specs/templates/*) TEMPLATES_INSTALLED+=1 ;;
+            .claude/commands/*) COMMANDS_INSTALLED+=1 ;;
+            .claude/agents/*) AGENTS_INSTALLED+=1 ;;
+            .claude/hooks/*) HOOKS_INSTALLED+=1 ;;
+        esac
     done
-    
-    AGENTS_INSTALLED=$agent_count
-    log_info "Installed $agent_count agent files"
+
     return 0
 }
 
-# Download and install hooks
-install_hooks() {
-    log_info "Installing SDD hooks..."
-    
-    # Hooks are optional - create directory and try to download key files
-    mkdir -p "$CLAUDE_HOOKS_DIR" || {
-        log_warn "Cannot create hooks directory, skipping hooks installation"
-        return 0
+# Unpack a mirror tarball, descending into a single top-level directory
+# such as the one in GitHub release archives
+unpack_mirror() {
+    local tarball="$1"
+    local target="$TEMP_DIR/mirror"
+
+    mkdir -p "$target"
+    tar -xf "$tarball" -C "$target" || {
+        log_error "Cannot extract mirror tarball: $tarball"
+        return 1
     }
-    
-    # Hook files to download
-    local hook_files=(
-        "README.md"
-        "sdd-session-logger.py"
-        "sdd-activity-logger.py"
-        "sdd-performance-tracker.py"
-        "sdd-session-summary.py"
-    )
-    
-    local lib_files=(
-        "lib/notification_system.py"
-    )
-    
-    local sound_files=(
-        "sounds/success.wav"
-        "sounds/error.wav" 
-        "sounds/warning.wav"
-        "sounds/progress.wav"
-    )
-    
-    local hook_count=0
-    
-    # Download main hook files
-    for hook_file in "${hook_files[@]}"; do
-        local url="$RAW_URL/.claude/hooks/$hook_file"
-        local temp_file="$TEMP_DIR/$(basename "$hook_file")"
-        local dest_file="$CLAUDE_HOOKS_DIR/$(basename "$hook_file")"
-        
-        if secure_download "$url" "$temp_file"; then
-            if [[ "$hook_file" == *.py ]]; then
-                # Python files need executable permissions
-                if cp "$temp_file" "$dest_file" && chmod 755 "$dest_file"; then
-                    log_info "Installed hook: $(basename "$hook_file")"
-                    ((hook_count++))
-                fi
-            else
-                # Markdown files use version comparison
-                if install_file_with_version "$temp_file" "$dest_file"; then
-                    ((hook_count++))
-                fi
-            fi
+
+    local entries=("$target"/*)
+    if [[ ${#entries[@]} -eq 1 && -d "${entries[0]}" && ! -d "$target/specs" ]]; then
+        target="${entries[0]}"
+    fi
+    echo "$target"
+}
+
+# Resolve the install source and produce $TEMP_DIR/install-manifest.txt
+prepare_manifest() {
+    local manifest="$TEMP_DIR/$MANIFEST_NAME"
+
+    if [[ -n "$MIRROR_SOURCE" ]]; then
+        local source="${MIRROR_SOURCE#file://}"
+        if [[ -f "$source" ]]; then
+            log_info "Installing from mirror tarball: $source"
+            MIRROR_DIR=$(unpack_mirror "$source") || return 1
+        elif [[ -d "$source" ]]; then
+            log_info "Installing from mirror directory: $source"
+            MIRROR_DIR=$(cd "$source" && pwd)
         else
-            log_warn "Failed to download hook: $hook_file (continuing installation)"
+            log_error "Mirror not found: $MIRROR_SOURCE"
+            return 1
         fi
-    done
-    
-    # Download lib files
-    mkdir -p "$CLAUDE_HOOKS_DIR/lib" || {
-        log_warn "Cannot create hooks lib directory"
-    }
-    
-    for lib_file in "${lib_files[@]}"; do
-        local url="$RAW_URL/.claude/hooks/$lib_file"
-        local temp_file="$TEMP_DIR/$(basename "$lib_file")"
-        local dest_file="$CLAUDE_HOOKS_DIR/$lib_file"
-        
-        if secure_download "$url" "$temp_file"; then
-            if cp "$temp_file" "$dest_file" && chmod 644 "$dest_file"; then
-                log_info "Installed lib: $(basename "$lib_file")"
-                ((hook_count++))
-            fi
+
+        if [[ -f "$MIRROR_DIR/$MANIFEST_NAME" ]]; then
+            cp "$MIRROR_DIR/$MANIFEST_NAME" "$manifest"
         else
-            log_warn "Failed to download lib file: $lib_file (continuing installation)"
+            log_warn "Mirror has no $MANIFEST_NAME - computing checksums locally"
+            write_manifest "$MIRROR_DIR" "$manifest" || return 1
         fi
-    done
-    
-    # Download sound files
-    mkdir -p "$CLAUDE_HOOKS_DIR/sounds" || {
-        log_warn "Cannot create hooks sounds directory"
-    }
-    
-    for sound_file in "${sound_files[@]}"; do
-        local url="$RAW_URL/.claude/hooks/$sound_file"
-        local temp_file="$TEMP_DIR/$(basename "$sound_file")"
-        local dest_file="$CLAUDE_HOOKS_DIR/$sound_file"
-        
-        if secure_download "$url" "$temp_file"; then
-            if cp "$temp_file" "$dest_file" && chmod 644 "$dest_file"; then
-                log_info "Installed sound: $(basename "$sound_file")"
-                ((hook_count++))
-            fi
-        else
-            log_warn "Failed to download sound file: $sound_file (continuing installation)"
+    elif [[ -n "${SDD_MANIFEST_SHA256:-}" ]]; then
+        # Pinned manifest: a missing or altered manifest is fatal
+        secure_download "$RAW_URL/$MANIFEST_NAME" "$manifest" "$SDD_MANIFEST_SHA256" || return 1
+    elif secure_download "$RAW_URL/$MANIFEST_NAME" "$manifest" 2>/dev/null; then
+        log_info "Fetched install manifest"
+    else
+        log_warn "No $MANIFEST_NAME at $REPO_VERSION - downloading the default file set unverified"
+        fetch_default_files || return 1
+        write_manifest "$MIRROR_DIR" "$manifest" || return 1
+    fi
+
+    load_manifest "$manifest"
+}
+
+# Fallback for versions published before the manifest existed: download the
+# built-in file list in parallel and install it like a mirror
+fetch_default_files() {
+    MIRROR_DIR="$TEMP_DIR/mirror"
+
+    local pids=() path
+    for path in "${INSTALL_FILES[@]}"; do
+        mkdir -p "$MIRROR_DIR/$(dirname "$path")"
+        {
+            secure_download "$RAW_URL/$path" "$MIRROR_DIR/$path.part" 2>/dev/null \
+                && mv "$MIRROR_DIR/$path.part" "$MIRROR_DIR/$path"
+        } &
+        pids+=("$!")
+        if [[ ${#pids[@]} -ge $SDD_JOBS ]]; then
+            wait "${pids[0]}" || true
+            pids=(${pids[@]+"${pids[@]:1}"})
         fi
     done
-    
-    HOOKS_INSTALLED=$hook_count
-    log_info "Installed $hook_count hook files"
-    return 0
+    for path in ${pids[@]+"${pids[@]}"}; do
+        wait "$path" || true
+    done
 }
 
 # Verify installation
@@ -579,6 +785,8 @@ show_summary() {
     echo "  Commands installed: $COMMANDS_INSTALLED (in $CLAUDE_COMMANDS_DIR)"
     echo "  Agents installed: $AGENTS_INSTALLED (in $CLAUDE_AGENTS_DIR)"
     echo "  Hooks installed: $HOOKS_INSTALLED (in $CLAUDE_HOOKS_DIR)"
+    echo "  Already up to date: $FILES_UNCHANGED files"
+    echo "  Fetched: $FILES_DOWNLOADED files"
     echo
     echo "  Installation log: $INSTALL_LOG"
     echo
@@ -610,9 +818,48 @@ trap 'handle_error $LINENO' ERR
 trap cleanup EXIT
 
 # Main installation flow
+show_usage() {
+    echo "Usage: remote-install.sh [--mirror <dir|file://path>] [--jobs <n>]"
+    echo "       remote-install.sh --write-manifest [repository-dir]"
+}
+
+# Parse command line options
+parse_args() {
+    while [[ $# -gt 0 ]]; do
+        case "$1" in
+            --mirror)
+                [[ $# -ge 2 ]] || { show_usage >&2; exit 2; }
+                MIRROR_SOURCE="$2"
+                shift 2
+                ;;
+            --jobs)
+                [[ $# -ge 2 && "$2" =~ ^[1-9][0-9]*$ ]] || { show_usage >&2; exit 2; }
+                SDD_JOBS="$2"
+                shift 2
+                ;;
+            --write-manifest)
+                local repo_dir="${2:-.}"
+                write_manifest "$repo_dir" "$repo_dir/$MANIFEST_NAME" || exit 1
+                exit 0
+                ;;
+            -h|--help)
+                show_usage
+                exit 0
+                ;;
+            *)
+                log_error "Unknown option: $1"
+                show_usage >&2
+                exit 2
+                ;;
+        esac
+    done
+}
+
 main() {
+    parse_args "$@"
+
     log_info "Starting SDD remote installation..."
-    log_info "Repository: $BASE_URL"
+    log_info "Repository: ${MIRROR_SOURCE:-$BASE_URL}"
     log_info "Version: $REPO_VERSION"
     
     show_security_warning
@@ -620,13 +867,12 @@ main() {
     setup_workspace
     
     # Perform installation
-    install_templates || exit 1
-    install_commands || exit 1
-    install_agents || exit 1
-    install_hooks || exit 1
+    prepare_manifest || exit 1
+    install_from_manifest || exit 1
     
     # Verify and complete
     verify_installation || exit 1
+    rm -rf "$STAGING_DIR"
     
     show_summary
     log_info "Remote installation completed successfully!"
@@ -0,0 +1,6 @@
+"""
+SDD (Spec-Driven Development) tooling
+
+Python helpers that operate on the specification tree: task blueprints,
+templates and the artifacts produced by the assembly line.
+"""
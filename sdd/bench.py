@@ -0,0 +1,308 @@
+"""
+sdd-bench: regression benchmarks for the assembly line tooling
+
+Replays blueprint corpora - the ``sample_tasks/`` blueprints plus synthetic
+corpora of any size generated from them - through each stage the tooling
+implements (parsing, scheduling, bundling, validation, indexing) and records
+wall time, peak RSS and I/O counts with ``sdd.telemetry.measure``.
+
+Every repetition runs in a freshly spawned process with an empty cache
+directory, so results measure the cold path and peak RSS belongs to the stage
+alone. The fastest repetition is kept. Results are compared against a stored
+baseline (``~/.sdd/cache/bench/baseline.json`` by default); a metric that
+grows by more than ``--threshold`` and by more than its noise floor fails the
+run. The first run, or ``--update-baseline``, records the baseline.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import re
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sdd.blueprints import BlueprintCorpus
+from sdd.bundles import BundleCache, fragment_key
+from sdd.cache import cache_root, write_json_atomic
+from sdd.index import RepositoryIndex
+from sdd.scheduler import TaskGraph
+from sdd.telemetry import StageMetrics, estimate_tokens, measure
+from sdd.validate import run as validate_documents
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+SAMPLE_TASKS_DIR = PROJECT_DIR / "project_sdd_on_claude" / "sample_tasks"
+TEMPLATES_DIR = PROJECT_DIR / "specs" / "templates"
+
+BLUEPRINT_PATTERN = "*-*.md"
+
+BASELINE_VERSION = 1
+
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_SYNTHETIC_SIZES = (250,)
+DEFAULT_REPEAT = 5
+
+# Absolute growth a metric must also exceed before it counts as a regression,
+# so scheduler noise on millisecond-sized stages never fails a run
+METRIC_FLOORS: Dict[str, float] = {
+    "wall_ms": 5.0,
+    "peak_rss_kb": 2048,
+    "read_ops": 64,
+    "write_ops": 64,
+}
+
+
+def _stage_parsing(corpus: Path, scratch: Path, metrics: StageMetrics) -> None:
+    metrics.details["documents"] = len(BlueprintCorpus(corpus, BLUEPRINT_PATTERN))
+
+
+def _stage_scheduling(corpus: Path, scratch: Path, metrics: StageMetrics) -> None:
+    graph = TaskGraph.from_blueprints(BlueprintCorpus(corpus, BLUEPRINT_PATTERN))
+    metrics.details["critical_path"] = len(graph.critical_path()[0])
+
+
+def _stage_bundling(corpus: Path, scratch: Path, metrics: StageMetrics) -> None:
+    """Build one context fragment per blueprint section into task bundles
+
+    Synthetic tasks share section text with the sample they were derived
+    from, so later tasks hit the fragment cache like a real milestone does.
+    """
+    cache = BundleCache(scratch / "bundles")
+    total = 0
+    for blueprint in BlueprintCorpus(corpus, BLUEPRINT_PATTERN):
+        task_id = blueprint.frontmatter.get("id") or blueprint.path.stem
+        bundle = scratch / ".task_bundles" / task_id
+        for heading, body in blueprint.sections.items():
+            kind = re.sub(r"\W+", "_", heading.lstrip("#").strip().lower()).strip("_")
+            key = fragment_key(kind, [f"{blueprint.path}#{heading.lstrip('#').strip()}"])
+            destination = bundle / f"bundle_{kind}.md"
+            cache.get_or_build(key, destination, lambda: f"{heading}\n\n{body}\n".encode("utf-8"))
+            total += destination.stat().st_size
+    metrics.bundle_bytes = total
+    metrics.tokens = estimate_tokens(total)
+
+
+def _stage_validation(corpus: Path, scratch: Path, metrics: StageMetrics) -> None:
+    outcome = validate_documents(sorted(corpus.glob(BLUEPRINT_PATTERN)), TEMPLATES_DIR, jobs=1)
+    metrics.details["documents"] = outcome.validated
+
+
+def _stage_indexing(corpus: Path, scratch: Path, metrics: StageMetrics) -> None:
+    stats = RepositoryIndex(scratch / "index.sqlite").build([corpus], jobs=1)
+    metrics.details["documents"] = stats.parsed
+
+
+STAGES: Dict[str, Callable[[Path, Path, StageMetrics], None]] = {
+    "parsing": _stage_parsing,
+    "scheduling": _stage_scheduling,
+    "bundling": _stage_bundling,
+    "validation": _stage_validation,
+    "indexing": _stage_indexing,
+}
+
+
+@dataclass
+class Regression:
+    benchmark: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return (self.current - self.baseline) / self.baseline if self.baseline else float("inf")
+
+
+def synthesize_corpus(source: Path, destination: Path, count: int) -> Path:
+    """Write ``count`` blueprints derived from the ones in ``source``
+
+    Task IDs are rewritten to ``TASK-0001``... so the documents are governed
+    by the task blueprint template; output is deterministic for a given
+    source corpus.
+    """
+    samples = list(BlueprintCorpus(source, BLUEPRINT_PATTERN))
+    if not samples:
+        raise ValueError(f"No blueprints matching {BLUEPRINT_PATTERN} in {source}")
+    destination.mkdir(parents=True, exist_ok=True)
+    for number in range(1, count + 1):
+        sample = samples[(number - 1) % len(samples)]
+        sample_id = sample.frontmatter.get("id") or sample.path.stem.split("_", 1)[0]
+        task_id = f"TASK-{number:04d}"
+        suffix = sample.path.name.split("_", 1)[1] if "_" in sample.path.name else sample.path.name
+        (destination / f"{task_id}_{suffix}").write_text(
+            sample.content.replace(sample_id, task_id), encoding="utf-8"
+        )
+    return destination
+
+
+def _run_stage(stage: str, corpus: str, scratch: str) -> Dict[str, Any]:
+    """Entry point of the spawned benchmark process"""
+    os.environ["SDD_CACHE_DIR"] = str(Path(scratch) / "cache")
+    with measure(stage) as metrics:
+        STAGES[stage](Path(corpus), Path(scratch), metrics)
+    return metrics.to_event()
+
+
+def run_benchmark(stage: str, corpus: Path, repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    """Best of ``repeat`` cold runs of ``stage`` over ``corpus``"""
+    context = multiprocessing.get_context("spawn")
+    runs = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="sdd-bench-") as scratch:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                runs.append(pool.submit(_run_stage, stage, str(corpus), scratch).result())
+    best = min(runs, key=lambda run: run["wall_ms"])
+    best["peak_rss_kb"] = max(run["peak_rss_kb"] for run in runs)
+    for key in ("event", "stage", "ts"):
+        best.pop(key, None)
+    return best
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Regression]:
+    """Metrics that grew past ``threshold`` (a fraction) and their noise floor"""
+    regressions = []
+    for benchmark, metrics in sorted(results.items()):
+        previous = baseline.get(benchmark)
+        if previous is None:
+            continue
+        for metric, floor in METRIC_FLOORS.items():
+            if metric not in metrics or metric not in previous:
+                continue
+            current, before = metrics[metric], previous[metric]
+            if current - before > floor and current > before * (1 + threshold):
+                regressions.append(Regression(benchmark, metric, before, current))
+    return regressions
+
+
+def load_baseline(path: Path) -> Optional[Dict[str, Any]]:
+    """The recorded baseline, or None when absent or from an older version
+
+    Raises ValueError when the file is not a baseline at all.
+    """
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError as error:
+        raise ValueError(f"Baseline {path} is not valid JSON: {error}") from error
+    if not isinstance(data, dict):
+        raise ValueError(f"Baseline {path} is malformed: expected a JSON object")
+    if data.get("version") != BASELINE_VERSION:
+        return None
+    if not isinstance(data.get("results"), dict):
+        raise ValueError(f"Baseline {path} is malformed: missing \"results\" object")
+    return data
+
+
+def _corpora(args: argparse.Namespace, scratch: Path) -> Dict[str, Path]:
+    corpora: Dict[str, Path] = {}
+    for directory in args.corpus or [SAMPLE_TASKS_DIR]:
+        if not directory.is_dir():
+            raise ValueError(f"Corpus directory not found: {directory}")
+        corpora[directory.name] = directory
+    for size in args.synthetic if args.synthetic is not None else DEFAULT_SYNTHETIC_SIZES:
+        if size > 0:
+            corpora[f"synthetic-{size}"] = synthesize_corpus(SAMPLE_TASKS_DIR, scratch / f"synthetic-{size}", size)
+    return corpora
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="sdd-bench", description="Benchmark SDD stages and detect regressions.")
+    parser.add_argument("--stage", action="append", choices=sorted(STAGES), help="stage to run (default: all)")
+    parser.add_argument("--corpus", action="append", type=Path, metavar="DIR",
+                        help="blueprint directory to replay (default: sample_tasks/)")
+    parser.add_argument("--synthetic", action="append", type=int, metavar="N",
+                        help=f"also replay a synthetic corpus of N blueprints (default: {DEFAULT_SYNTHETIC_SIZES[0]}, 0 to skip)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="cold runs per benchmark, best is kept")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed growth as a fraction of the baseline (default: 0.25)")
+    parser.add_argument("--baseline", type=Path, help="baseline file (default: ~/.sdd/cache/bench/baseline.json)")
+    parser.add_argument("--update-baseline", action="store_true", help="record these results as the new baseline")
+    parser.add_argument("--output", type=Path, help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    baseline_path = args.baseline or cache_root() / "bench" / "baseline.json"
+    stages = args.stage or list(STAGES)
+    try:
+        baseline = load_baseline(baseline_path)
+    except ValueError as error:
+        if not args.update_baseline:
+            print(f"[ERROR] {error}; rerun with --update-baseline to replace it", file=sys.stderr)
+            return 2
+        baseline = None
+
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory(prefix="sdd-bench-corpora-") as scratch:
+        try:
+            corpora = _corpora(args, Path(scratch))
+        except ValueError as error:
+            print(f"[ERROR] {error}", file=sys.stderr)
+            return 2
+        for name, corpus in corpora.items():
+            for stage in stages:
+                results[f"{name}/{stage}"] = run_benchmark(stage, corpus, args.repeat)
+
+    regressions = compare(results, baseline["results"], args.threshold) if baseline else []
+    flagged = {(regression.benchmark, regression.metric) for regression in regressions}
+
+    for benchmark, metrics in results.items():
+        line = (
+            f"{benchmark:<32} {metrics['wall_ms']:>9.1f} ms  peak_rss={metrics['peak_rss_kb']} KB"
+            f"  reads={metrics['read_ops']} writes={metrics['write_ops']}"
+        )
+        previous = baseline["results"].get(benchmark) if baseline else None
+        if previous is not None:
+            line += f"  (baseline {previous['wall_ms']:.1f} ms)"
+        level = "ERROR" if any(key[0] == benchmark for key in flagged) else "INFO"
+        print(f"[{level}] {line}")
+
+    if args.output:
+        write_json_atomic(args.output, {"environment": environment(), "results": results})
+
+    if baseline is not None and baseline.get("environment") != environment():
+        print("[WARN] Baseline was recorded on a different environment; comparisons may be noisy", file=sys.stderr)
+
+    if baseline is None or args.update_baseline:
+        write_json_atomic(baseline_path, {
+            "version": BASELINE_VERSION,
+            "environment": environment(),
+            "results": results,
+        })
+        print(f"[INFO] Baseline written to {baseline_path}")
+        return 0
+
+    for regression in regressions:
+        print(
+            f"[ERROR] {regression.benchmark}: {regression.metric} regressed "
+            f"{regression.baseline:g} -> {regression.current:g} ({regression.change:+.0%})",
+            file=sys.stderr,
+        )
+    if regressions:
+        print(f"[ERROR] {len(regressions)} regression(s) beyond {args.threshold:.0%} of the baseline", file=sys.stderr)
+        return 1
+    print(f"[INFO] No regressions beyond {args.threshold:.0%} of the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Blueprint corpus loader
+
+Reads task blueprint files exactly once, parses their YAML frontmatter and
+numbered ``## N.`` sections into immutable records, and keeps those records
+in a cache that is invalidated by file mtime and size. Repeated checks over
+thousands of blueprints then cost one read per changed file instead of one
+read per check.
+"""
+
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+FRONTMATTER_PATTERN = re.compile(r"\A---\n(.*?)\n---", re.DOTALL)
+SECTION_PATTERN = re.compile(r"^## (\d+)\.(.*)$", re.MULTILINE)
+
+# (st_mtime_ns, st_size) - cheap to obtain and changes on every rewrite
+Signature = Tuple[int, int]
+
+
+def parse_frontmatter(content: str) -> Dict[str, Optional[str]]:
+    """Parse simple ``key: value`` YAML frontmatter at the top of a document.
+
+    Values are stripped of surrounding quotes; keys without a value map to
+    ``None``. Nested YAML is not interpreted - SDD frontmatter is flat.
+    """
+    match = FRONTMATTER_PATTERN.match(content)
+    if match is None:
+        return {}
+
+    frontmatter: Dict[str, Optional[str]] = {}
+    for line in match.group(1).split("\n"):
+        if ":" not in line or line.strip().startswith("#"):
+            continue
+        key, value = line.split(":", 1)
+        value = value.strip()
+        frontmatter[key.strip()] = value.strip("\"'") if value else None
+    return frontmatter
+
+
+def parse_sections(content: str) -> Dict[str, str]:
+    """Split a document into its numbered ``## N. Title`` sections.
+
+    Keys are the full heading lines (e.g. ``## 1. Task Overview & Goal``);
+    values are the section bodies up to the next numbered heading.
+    """
+    headings = list(SECTION_PATTERN.finditer(content))
+    sections: Dict[str, str] = {}
+    for index, heading in enumerate(headings):
+        end = headings[index + 1].start() if index + 1 < len(headings) else len(content)
+        sections[heading.group(0).rstrip()] = content[heading.end():end].strip("\n")
+    return sections
+
+
+@dataclass(frozen=True)
+class Blueprint:
+    """Immutable, fully parsed view of a single blueprint file"""
+
+    path: Path
+    content: str
+    lowered: str
+    frontmatter: Mapping[str, Optional[str]]
+    sections: Mapping[str, str]
+    signature: Signature
+    _keyword_hits: Dict[str, bool] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    def contains(self, keyword: str) -> bool:
+        """Case-insensitive substring check, memoised per keyword"""
+        hit = self._keyword_hits.get(keyword)
+        if hit is None:
+            hit = keyword.lower() in self.lowered
+            self._keyword_hits[keyword] = hit
+        return hit
+
+    def contains_any(self, keywords: List[str]) -> bool:
+        return any(self.contains(keyword) for keyword in keywords)
+
+    def count_matching(self, keywords: List[str]) -> int:
+        return sum(1 for keyword in keywords if self.contains(keyword))
+
+
+def read_blueprint(path: Path, signature: Optional[Signature] = None) -> Blueprint:
+    """Read and parse one blueprint file"""
+    if signature is None:
+        signature = stat_signature(path)
+    content = path.read_text(encoding="utf-8")
+    return Blueprint(
+        path=path,
+        content=content,
+        lowered=content.lower(),
+        frontmatter=MappingProxyType(parse_frontmatter(content)),
+        sections=MappingProxyType(parse_sections(content)),
+        signature=signature,
+    )
+
+
+def stat_signature(path: Path) -> Signature:
+    stat = path.stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class BlueprintCorpus:
+    """Cached collection of blueprints matched by a glob in one directory
+
+    ``refresh()`` re-stats every file and only re-reads those whose mtime or
+    size changed; records for deleted files are dropped.
+    """
+
+    def __init__(self, directory: Path, pattern: str = "*.md") -> None:
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self._records: Dict[Path, Blueprint] = {}
+        self.reads = 0
+        self.refresh()
+
+    def refresh(self) -> "BlueprintCorpus":
+        records: Dict[Path, Blueprint] = {}
+        for path in sorted(self.directory.glob(self.pattern)):
+            if not path.is_file():
+                continue
+            signature = stat_signature(path)
+            cached = self._records.get(path)
+            if cached is not None and cached.signature == signature:
+                records[path] = cached
+            else:
+                records[path] = read_blueprint(path, signature)
+                self.reads += 1
+        self._records = records
+        return self
+
+    def get(self, name: str) -> Optional[Blueprint]:
+        return self._records.get(self.directory / name)
+
+    def __getitem__(self, name: str) -> Blueprint:
+        record = self.get(name)
+        if record is None:
+            raise KeyError(f"No blueprint named {name} in {self.directory}")
+        return record
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.get(name) is not None
+
+    def __iter__(self) -> Iterator[Blueprint]:
+        return iter(self._records.values())
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+# Long-running processes (scheduler, bench) touch many directories; keep only
+# the most recently used corpora so their records do not accumulate
+MAX_CACHED_CORPORA = 8
+
+_CORPORA: "OrderedDict[Tuple[Path, str], BlueprintCorpus]" = OrderedDict()
+
+
+def load_corpus(directory: Path, pattern: str = "*.md") -> BlueprintCorpus:
+    """Return the process-wide corpus for ``directory``, refreshed against disk"""
+    key = (Path(directory).resolve(), pattern)
+    corpus = _CORPORA.get(key)
+    if corpus is None:
+        corpus = _CORPORA[key] = BlueprintCorpus(key[0], pattern)
+        while len(_CORPORA) > MAX_CACHED_CORPORA:
+            _CORPORA.popitem(last=False)
+    else:
+        _CORPORA.move_to_end(key)
+        corpus.refresh()
+    return corpus
@@ -0,0 +1,339 @@
+"""
+Content-addressed context bundle cache
+
+Most tasks in a milestone extract the same ``2_Architecture.md`` sections
+and the same code files into their ``bundle_*.md`` files. Each generated
+fragment is stored once under ``~/.sdd/cache/bundles`` keyed by
+
+    sha256(extraction rule version + source spec sections + referenced files)
+
+so an edit elsewhere in a spec does not invalidate it. Task bundles are
+assembled from cached fragments by hardlink (copy across filesystems); the
+cached objects are read-only because agents never modify existing bundle
+files. Least-recently-used objects are evicted once the cache exceeds its
+size limit.
+
+Each bundle keeps hit/miss counters in ``bundle_cache.json`` so runs can
+report the savings across a milestone.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from sdd.cache import cache_dir, write_json_atomic
+
+# Bump when the deterministic section extraction below changes
+EXTRACTION_RULES_VERSION = "1"
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+STATS_FILE = "bundle_cache.json"
+
+HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*$")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    bytes_reused: int = 0
+
+    def add(self, other: "CacheStats") -> None:
+        self.hits += other.hits
+        self.misses += other.misses
+        self.bytes_reused += other.bytes_reused
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def normalize_title(text: str) -> str:
+    """``6. Key Design Patterns`` and ``Key Design Patterns`` compare equal"""
+    return re.sub(r"^\d+(?:\.\d+)*\.?\s+", "", text.replace("**", "")).strip().lower()
+
+
+def extract_section(content: str, heading: str) -> Optional[str]:
+    """Return a markdown section (heading line included) up to the next
+    heading of the same or a higher level, ignoring fenced code blocks"""
+    wanted = normalize_title(heading.lstrip("#").strip())
+    lines = content.splitlines(keepends=True)
+    start = level = None
+    in_code_block = False
+    for index, line in enumerate(lines):
+        if line.startswith("```"):
+            in_code_block = not in_code_block
+            continue
+        match = None if in_code_block else HEADING.match(line)
+        if match is None:
+            continue
+        if start is None:
+            if normalize_title(match.group(2)) == wanted:
+                start, level = index, len(match.group(1))
+        elif level is not None and len(match.group(1)) <= level:
+            return "".join(lines[start:index])
+    return "".join(lines[start:]) if start is not None else None
+
+
+def parse_section_ref(ref: str) -> Tuple[Path, str]:
+    """``specs/2_Architecture.md#Key Design Patterns`` -> (path, heading)"""
+    path, _, heading = ref.partition("#")
+    if not heading:
+        raise ValueError(f"Section reference needs a '#heading' part: {ref}")
+    return Path(path), heading
+
+
+def fragment_key(
+    kind: str,
+    sections: Sequence[str] = (),
+    files: Sequence[Path] = (),
+    rules_version: str = EXTRACTION_RULES_VERSION,
+) -> str:
+    """Content address for a fragment built from spec sections and files
+
+    Only the referenced section text contributes, not the whole spec, and
+    files are hashed by content so renames of unrelated files do not matter.
+    """
+    digest = hashlib.sha256()
+
+    def feed(label: str, data: bytes) -> None:
+        digest.update(f"{label}\0{len(data)}\0".encode("utf-8"))
+        digest.update(data)
+
+    feed("kind", kind.encode("utf-8"))
+    feed("rules", rules_version.encode("utf-8"))
+    for ref in sections:
+        path, heading = parse_section_ref(ref)
+        section = extract_section(path.read_text(encoding="utf-8"), heading)
+        if section is None:
+            raise ValueError(f"Section '{heading}' not found in {path}")
+        feed("section", heading.encode("utf-8") + b"\0" + section.encode("utf-8"))
+    for path in files:
+        feed("file", Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+class BundleCache:
+    """Size-bounded LRU store of bundle fragments"""
+
+    def __init__(self, root: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = Path(root) if root is not None else cache_dir("bundles")
+        self.objects = self.root / "objects"
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None
+
+    def _object(self, key: str) -> Path:
+        return self.objects / key[:2] / key
+
+    def get(self, key: str) -> Optional[Path]:
+        path = self._object(key)
+        if not path.exists():
+            return None
+        os.utime(str(path))  # recency for LRU eviction
+        return path
+
+    def put(self, key: str, content: bytes) -> Path:
+        path = self._object(key)
+        if path.exists():
+            return path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(content)
+            os.chmod(tmp_name, 0o444)
+            os.replace(tmp_name, path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += len(content)
+        if self._size > self.max_bytes:
+            self.evict()
+        return path
+
+    def size(self) -> int:
+        return sum(
+            path.stat().st_size
+            for path in self.objects.glob("*/*")
+            if not path.name.startswith(".tmp-")
+        )
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """Remove least-recently-used objects until under the limit"""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = []
+        total = 0
+        for path in self.objects.glob("*/*"):
+            if path.name.startswith(".tmp-"):
+                continue
+            stat = path.stat()
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total += stat.st_size
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= limit:
+                break
+            path.unlink()
+            total -= size
+            removed += 1
+        self._size = total
+        return removed
+
+    def link(self, key: str, destination: Path) -> bool:
+        """Place a cached fragment at ``destination``; False on a miss"""
+        source = self.get(key)
+        if source is None:
+            return False
+        _place(source, Path(destination))
+        return True
+
+    def fetch(self, key: str, destination: Path) -> bool:
+        """``link`` plus hit/miss accounting in the destination bundle"""
+        destination = Path(destination)
+        hit = self.link(key, destination)
+        _record(destination.parent, CacheStats(
+            hits=int(hit),
+            misses=int(not hit),
+            bytes_reused=destination.stat().st_size if hit else 0,
+        ))
+        return hit
+
+    def store(self, key: str, content: bytes, destination: Optional[Path] = None) -> Path:
+        """Cache freshly generated content, placing it in a bundle if given"""
+        path = self.put(key, content)
+        if destination is not None:
+            _place(path, Path(destination))
+        return path
+
+    def get_or_build(self, key: str, destination: Path, build: Callable[[], bytes]) -> bool:
+        """Fetch a fragment, generating and caching it on a miss; True on a hit"""
+        if self.fetch(key, destination):
+            return True
+        self.store(key, build(), destination)
+        return False
+
+
+def _place(source: Path, destination: Path) -> None:
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    if destination.exists() or destination.is_symlink():
+        destination.unlink()
+    try:
+        os.link(str(source), str(destination))
+    except OSError:
+        shutil.copyfile(str(source), str(destination))
+
+
+def _record(bundle: Path, delta: CacheStats) -> None:
+    stats = read_bundle_stats(bundle)
+    stats.add(delta)
+    write_json_atomic(bundle / STATS_FILE, asdict(stats))
+
+
+def read_bundle_stats(bundle: Path) -> CacheStats:
+    path = Path(bundle) / STATS_FILE
+    if not path.exists():
+        return CacheStats()
+    try:
+        return CacheStats(**json.loads(path.read_text(encoding="utf-8")))
+    except (ValueError, TypeError):
+        return CacheStats()
+
+
+def assemble(destination: Path, keys: Sequence[str], cache: BundleCache) -> List[str]:
+    """Build one bundle file from several cached fragments
+
+    A single fragment is hardlinked; several are concatenated in order.
+    Returns the keys that were missing (nothing is written in that case).
+    """
+    paths = [cache.get(key) for key in keys]
+    missing = [key for key, path in zip(keys, paths) if path is None]
+    if missing:
+        return missing
+    if len(keys) == 1:
+        cache.fetch(keys[0], destination)
+        return []
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    with open(destination, "wb") as out:
+        for path in paths:
+            if path is not None:
+                with open(path, "rb") as handle:
+                    shutil.copyfileobj(handle, out)
+    _record(destination.parent, CacheStats(hits=len(keys), bytes_reused=destination.stat().st_size))
+    return []
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="sdd-bundle", description="Content-addressed bundle fragment cache.")
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES, help="cache size limit")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    key = commands.add_parser("key", help="print the cache key for a fragment")
+    key.add_argument("--kind", required=True, help="fragment kind, e.g. architecture, security, code_context")
+    key.add_argument("--section", action="append", default=[], metavar="SPEC#HEADING")
+    key.add_argument("--file", action="append", default=[], type=Path)
+    key.add_argument("--rules-version", default=EXTRACTION_RULES_VERSION)
+
+    fetch = commands.add_parser("fetch", help="link a cached fragment into a bundle (exit 1 on miss)")
+    fetch.add_argument("key")
+    fetch.add_argument("destination", type=Path)
+
+    store = commands.add_parser("store", help="cache a generated fragment read from stdin or --from")
+    store.add_argument("key")
+    store.add_argument("destination", type=Path, nargs="?")
+    store.add_argument("--from", dest="source", type=Path)
+
+    extract = commands.add_parser("extract", help="print one section of a spec document")
+    extract.add_argument("section", metavar="SPEC#HEADING")
+
+    stats = commands.add_parser("stats", help="print hit/miss counters for bundle directories")
+    stats.add_argument("bundles", nargs="+", type=Path)
+
+    commands.add_parser("gc", help="evict least-recently-used fragments over the size limit")
+
+    args = parser.parse_args(argv)
+    cache = BundleCache(max_bytes=args.max_bytes)
+
+    try:
+        if args.command == "key":
+            print(fragment_key(args.kind, args.section, args.file, args.rules_version))
+        elif args.command == "fetch":
+            return 0 if cache.fetch(args.key, args.destination) else 1
+        elif args.command == "store":
+            content = args.source.read_bytes() if args.source else sys.stdin.buffer.read()
+            print(cache.store(args.key, content, args.destination))
+        elif args.command == "extract":
+            path, heading = parse_section_ref(args.section)
+            section = extract_section(path.read_text(encoding="utf-8"), heading)
+            if section is None:
+                print(f"[ERROR] Section '{heading}' not found in {path}", file=sys.stderr)
+                return 1
+            sys.stdout.write(section)
+        elif args.command == "stats":
+            total = CacheStats()
+            for bundle in args.bundles:
+                total.add(read_bundle_stats(bundle))
+            print(json.dumps(dict(asdict(total), hit_rate=round(total.hit_rate, 3))))
+        else:
+            print(f"[INFO] Evicted {cache.evict()} fragments")
+    except (OSError, ValueError) as error:
+        print(f"[ERROR] {error}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
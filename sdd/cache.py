@@ -0,0 +1,56 @@
+"""
+On-disk cache locations
+
+Everything the tooling caches lives under ``~/.sdd/cache`` next to the
+installed templates, honouring the same ``TEST_HOME`` override as
+``install.sh``. ``SDD_CACHE_DIR`` points the whole cache somewhere else.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+
+def cache_root() -> Path:
+    override = os.environ.get("SDD_CACHE_DIR")
+    if override:
+        return Path(override)
+    home = os.environ.get("TEST_HOME") or str(Path.home())
+    return Path(home) / ".sdd" / "cache"
+
+
+def cache_dir(*parts: str) -> Path:
+    """Return (and create) a subdirectory of the cache root"""
+    directory = cache_root().joinpath(*parts)
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """Write JSON via a temp file + rename so readers never see partial data"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
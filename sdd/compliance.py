@@ -0,0 +1,521 @@
+"""
+Template compliance engine
+
+Derives validation rules directly from the files in ``specs/templates``:
+
+* frontmatter keys the template declares beyond its own metadata
+  (``version``, ``template_type``, ``description``), with value formats
+  taken from placeholders such as ``TASK-XXX`` or ``feature/TASK-XXX-[slug]``
+* the document title prefix (``# Milestone Plan:``)
+* every numbered ``## N. Section`` heading not marked optional
+* ``**Link to ...:**`` traceability lines
+* for JSON templates, every key path with its value type and any
+  ``a|b|c`` enumerations
+
+Markdown rules are compiled once into a single combined scanner per template
+so each document is checked in one streaming line-by-line pass. Derived rule
+sets are cached on disk keyed by template version and content hash.
+"""
+
+import fnmatch
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Tuple
+
+from sdd.blueprints import Signature, parse_frontmatter, stat_signature
+from sdd.cache import cache_dir, sha256_bytes, write_json_atomic
+
+# Bump whenever derivation or checking logic changes so cached rule sets
+# (and reports cached against them) are rebuilt
+RULES_VERSION = 2
+
+TEMPLATE_METADATA_KEYS = {"version", "template_type", "description"}
+
+# Which documents each template governs, matched against the file name
+TEMPLATE_DOCUMENT_PATTERNS: Dict[str, List[str]] = {
+    "0_Project_Vision_Template.md": ["*Project_Vision.md"],
+    "1_Product_Requirements_Template.md": ["*Product_Requirements.md"],
+    "2_Architecture_Template.md": ["*Architecture.md"],
+    "3_Roadmap_Template.md": ["*Roadmap.md"],
+    "4_Milestone_Plan_Template.md": ["*Milestone_Plan.md"],
+    "5_Task_Blueprint_Template.md": ["TASK-*.md", "SAMPLE-*.md"],
+    "6_Milestone_Retrospective_Template.md": ["*Milestone_Retrospective*.md"],
+    "implementation_manifest_template.json": ["implementation_manifest*.json"],
+}
+
+PLACEHOLDER_TOKEN = re.compile(r"(\[[^\]]*\]|[A-Z]+-XXX|XXX)")
+ENUM_VALUE = re.compile(r"^[a-z_]+(?:\|[a-z_]+)+$")
+NUMBERED_HEADING = re.compile(r"^##\s+\d+\.?\s+(.+?)\s*$")
+TITLE_LINE = re.compile(r"^#\s+([^\[]+?:)")
+LINK_LINE = re.compile(r"^\*\*(Link to [^*:]+):\*\*")
+
+# YAML block scalar headers; the value is on the following indented lines
+BLOCK_SCALAR_INDICATORS = {"|", ">", "|-", ">-", "|+", ">+"}
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A single requirement derived from a template"""
+
+    rule_id: str
+    kind: str  # frontmatter | title | heading | link | json_key
+    target: str
+    pattern: Optional[str] = None
+    expected_type: Optional[str] = None
+
+    def describe(self) -> str:
+        if self.kind == "frontmatter":
+            return f"frontmatter key '{self.target}'"
+        if self.kind == "title":
+            return f"title '# {self.target}'"
+        if self.kind == "heading":
+            return f"section '## {self.target}'"
+        if self.kind == "link":
+            return f"traceability line '**{self.target}:**'"
+        return f"key '{self.target}'"
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """Serializable rules derived from one template"""
+
+    template: str
+    template_type: str
+    version: str
+    content_hash: str
+    format: str  # markdown | json
+    rules: Tuple[Rule, ...]
+    rules_version: int = RULES_VERSION
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RuleSet":
+        return cls(
+            template=data["template"],
+            template_type=data["template_type"],
+            version=data["version"],
+            content_hash=data["content_hash"],
+            format=data["format"],
+            rules=tuple(Rule(**rule) for rule in data["rules"]),
+            rules_version=data["rules_version"],
+        )
+
+
+@dataclass(frozen=True)
+class Finding:
+    rule_id: str
+    message: str
+    line: Optional[int] = None
+
+
+@dataclass
+class ComplianceReport:
+    """Per-document result of checking against one template"""
+
+    path: Path
+    template: str
+    template_version: str
+    findings: List[Finding] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.findings
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "template": self.template,
+            "template_version": self.template_version,
+            "passed": self.passed,
+            "findings": [asdict(finding) for finding in self.findings],
+        }
+
+
+def placeholder_pattern(value: str) -> Optional[str]:
+    """Translate a template placeholder value into an anchored regex
+
+    ``[anything]`` becomes ``.+``, an uppercase prefix followed by ``-XXX``
+    becomes any uppercase ID prefix plus a number (so ``TASK-XXX`` also
+    accepts ``SAMPLE-CLI-001``), and ``a|b|c`` becomes an enumeration.
+    Values without placeholders are examples and yield ``None``.
+    """
+    if ENUM_VALUE.match(value):
+        return "^(?:" + value + ")$"
+    parts = PLACEHOLDER_TOKEN.split(value)
+    if len(parts) == 1:
+        return None
+    regex = []
+    for index, part in enumerate(parts):
+        if index % 2 == 0:
+            regex.append(re.escape(part))
+        elif part.startswith("["):
+            regex.append(".+")
+        elif part == "XXX":
+            regex.append(r"\d+")
+        else:
+            regex.append(r"[A-Z]+(?:-[A-Z]+)*-\d+")
+    return "^" + "".join(regex) + "$"
+
+
+def normalize_heading(title: str) -> str:
+    """Heading text without bold markers or trailing parentheticals"""
+    title = title.replace("**", "").strip()
+    return re.sub(r"\s*\([^)]*\)\s*$", "", title).strip()
+
+
+def derive_rules(template_path: Path) -> RuleSet:
+    """Build the rule set for a template by reading it once"""
+    raw = template_path.read_bytes()
+    content = raw.decode("utf-8")
+    content_hash = sha256_bytes(raw)
+
+    if template_path.suffix == ".json":
+        data = json.loads(content)
+        return RuleSet(
+            template=template_path.name,
+            template_type=template_path.stem,
+            version="unversioned",
+            content_hash=content_hash,
+            format="json",
+            rules=tuple(_derive_json_rules(data)),
+        )
+
+    frontmatter = parse_frontmatter(content)
+    rules: List[Rule] = []
+    for key, value in frontmatter.items():
+        if key in TEMPLATE_METADATA_KEYS:
+            continue
+        rules.append(Rule(
+            rule_id=f"frontmatter.{key}",
+            kind="frontmatter",
+            target=key,
+            pattern=placeholder_pattern(value) if value else None,
+        ))
+
+    in_frontmatter = content.startswith("---\n")
+    in_code_block = False
+    for number, line in enumerate(content.splitlines(), 1):
+        if in_frontmatter:
+            if number > 1 and line == "---":
+                in_frontmatter = False
+            continue
+        if line.startswith("```"):
+            in_code_block = not in_code_block
+        if in_code_block:
+            continue
+
+        title = TITLE_LINE.match(line)
+        if title and not any(rule.kind == "title" for rule in rules):
+            rules.append(Rule(rule_id="title", kind="title", target=title.group(1)))
+            continue
+        heading = NUMBERED_HEADING.match(line)
+        if heading:
+            if "optional" in heading.group(1).lower():
+                continue
+            target = normalize_heading(heading.group(1))
+            rules.append(Rule(rule_id=f"heading.{_slug(target)}", kind="heading", target=target))
+            continue
+        link = LINK_LINE.match(line)
+        if link:
+            target = link.group(1)
+            rules.append(Rule(rule_id=f"link.{_slug(target)}", kind="link", target=target))
+
+    return RuleSet(
+        template=template_path.name,
+        template_type=frontmatter.get("template_type") or template_path.stem,
+        version=frontmatter.get("version") or "unversioned",
+        content_hash=content_hash,
+        format="markdown",
+        rules=tuple(rules),
+    )
+
+
+def _derive_json_rules(data: Any, prefix: str = "") -> Iterator[Rule]:
+    for key, value in data.items():
+        path = f"{prefix}{key}"
+        pattern = placeholder_pattern(value) if isinstance(value, str) else None
+        # Only enumerations and whole-value IDs constrain JSON strings; other
+        # strings in the template are illustrative examples.
+        if pattern is not None and not (ENUM_VALUE.match(value) or pattern.endswith(r"\d+$")):
+            pattern = None
+        yield Rule(
+            rule_id=f"json.{path}",
+            kind="json_key",
+            target=path,
+            pattern=pattern,
+            expected_type=_json_type(value),
+        )
+        if isinstance(value, dict):
+            yield from _derive_json_rules(value, f"{path}.")
+        elif isinstance(value, list) and value and isinstance(value[0], dict):
+            yield from _derive_json_rules(value[0], f"{path}[].")
+
+
+def _json_type(value: Any) -> str:
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, dict):
+        return "object"
+    return "null"
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")
+
+
+class CompiledRules:
+    """A rule set with its combined line scanner compiled"""
+
+    def __init__(self, rule_set: RuleSet) -> None:
+        self.rule_set = rule_set
+        self.rules = rule_set.rules
+        self.value_patterns: Dict[str, Pattern[str]] = {
+            rule.rule_id: re.compile(rule.pattern)
+            for rule in rule_set.rules
+            if rule.pattern is not None
+        }
+        self.scanner = self._compile_scanner() if rule_set.format == "markdown" else None
+
+    def _compile_scanner(self) -> Optional[Pattern[str]]:
+        alternatives = []
+        for index, rule in enumerate(self.rules):
+            target = re.escape(rule.target).replace(r"\ ", r"\s+")
+            if rule.kind == "frontmatter":
+                regex = rf"{target}:"
+            elif rule.kind == "title":
+                regex = rf"\#\s+{target}"
+            elif rule.kind == "heading":
+                regex = rf"\#\#\s+(?:\d+\.?\s+)?(?:\*\*)?{target}(?:\*\*)?(?:\s|\(|$)"
+            else:
+                regex = rf"\*\*{target}:\*\*"
+            alternatives.append(f"(?P<r{index}>{regex})")
+        if not alternatives:
+            return None
+        return re.compile("|".join(alternatives), re.IGNORECASE)
+
+    def check(self, path: Path) -> ComplianceReport:
+        """Check one document; unreadable documents are reported, not raised"""
+        try:
+            if self.rule_set.format == "json":
+                return self._check_json(path)
+            return self._check_markdown(path)
+        except UnicodeDecodeError as error:
+            report = self._report(path)
+            report.findings.append(Finding("document.decode", f"Not valid UTF-8: {error.reason} at byte {error.start}"))
+            return report
+        except OSError as error:
+            report = self._report(path)
+            report.findings.append(Finding("document.read", f"Cannot read document: {error.strerror or error}"))
+            return report
+
+    def _report(self, path: Path) -> ComplianceReport:
+        return ComplianceReport(
+            path=path,
+            template=self.rule_set.template,
+            template_version=self.rule_set.version,
+        )
+
+    def _check_markdown(self, path: Path) -> ComplianceReport:
+        report = self._report(path)
+        seen = set()
+        in_frontmatter = False
+        in_code_block = False
+        scanner = self.scanner
+        # Frontmatter key whose value continues on indented lines (a YAML
+        # block scalar or list): (rule, line, is block scalar, value seen)
+        pending: Optional[Tuple[Rule, int, bool, bool]] = None
+
+        with path.open(encoding="utf-8") as handle:
+            for number, line in enumerate(handle, 1):
+                line = line.rstrip("\n")
+                if number == 1 and line == "---":
+                    in_frontmatter = True
+                    continue
+                if pending is not None:
+                    rule, start, scalar, continued = pending
+                    if in_frontmatter and line != "---" and line.strip() and line[:1] in (" ", "\t", "-"):
+                        item = line.strip()
+                        if not scalar and item.startswith("- "):
+                            self._check_frontmatter_value(rule, item[2:], number, report)
+                        pending = (rule, start, scalar, True)
+                        continue
+                    if not continued:
+                        report.findings.append(Finding(rule.rule_id, f"Empty {rule.describe()}", start))
+                    pending = None
+                if in_frontmatter and line == "---":
+                    in_frontmatter = False
+                    continue
+                if line.startswith("```"):
+                    in_code_block = not in_code_block
+                if in_code_block or scanner is None:
+                    continue
+
+                match = scanner.match(line)
+                if match is None or match.lastgroup is None:
+                    continue
+                rule = self.rules[int(match.lastgroup[1:])]
+                if (rule.kind == "frontmatter") != in_frontmatter:
+                    continue
+                seen.add(rule.rule_id)
+                if rule.kind == "frontmatter":
+                    value = line.split(":", 1)[1].strip()
+                    if not value or value in BLOCK_SCALAR_INDICATORS:
+                        pending = (rule, number, bool(value), False)
+                    else:
+                        self._check_frontmatter_value(rule, value, number, report)
+
+        for rule in self.rules:
+            if rule.rule_id not in seen:
+                report.findings.append(Finding(rule.rule_id, f"Missing {rule.describe()}"))
+        return report
+
+    def _check_frontmatter_value(
+        self, rule: Rule, value: str, number: int, report: ComplianceReport
+    ) -> None:
+        value = value.strip().strip("\"'")
+        if not value:
+            report.findings.append(Finding(rule.rule_id, f"Empty {rule.describe()}", number))
+            return
+        pattern = self.value_patterns.get(rule.rule_id)
+        if pattern is not None and not pattern.match(value):
+            report.findings.append(Finding(
+                rule.rule_id,
+                f"Value '{value}' for {rule.describe()} does not match {pattern.pattern}",
+                number,
+            ))
+
+    def _check_json(self, path: Path) -> ComplianceReport:
+        report = self._report(path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError as error:
+            report.findings.append(Finding("json.parse", f"Invalid JSON: {error.msg}", error.lineno))
+            return report
+        if not isinstance(data, dict):
+            report.findings.append(Finding("json.root", f"Top level should be object, got {_json_type(data)}"))
+            return report
+
+        for rule in self.rules:
+            for where, value in _resolve(data, rule.target):
+                if value is _MISSING:
+                    report.findings.append(Finding(rule.rule_id, f"Missing key '{where}'"))
+                    continue
+                actual = _json_type(value)
+                if actual != rule.expected_type:
+                    report.findings.append(Finding(
+                        rule.rule_id, f"Key '{where}' should be {rule.expected_type}, got {actual}"
+                    ))
+                    continue
+                pattern = self.value_patterns.get(rule.rule_id)
+                if pattern is not None and not pattern.match(value):
+                    report.findings.append(Finding(
+                        rule.rule_id, f"Value '{value}' for '{where}' does not match {pattern.pattern}"
+                    ))
+        return report
+
+
+_MISSING = object()
+
+
+def _resolve(data: Any, target: str) -> Iterator[Tuple[str, Any]]:
+    """Yield (concrete path, value) pairs for an ``a.b[].c`` rule target
+
+    Only the final key is reported as missing; a missing or mistyped parent
+    is already reported by the parent's own rule.
+    """
+    def walk(node: Any, parts: List[str], where: str) -> Iterator[Tuple[str, Any]]:
+        part, rest = parts[0], parts[1:]
+        is_list = part.endswith("[]")
+        key = part[:-2] if is_list else part
+        child_where = f"{where}.{key}" if where else key
+        if not isinstance(node, dict):
+            return
+        if key not in node:
+            if not rest:
+                yield child_where, _MISSING
+            return
+        child = node[key]
+        if not rest:
+            yield child_where, child
+        elif is_list:
+            if isinstance(child, list):
+                for index, item in enumerate(child):
+                    yield from walk(item, rest, f"{child_where}[{index}]")
+        else:
+            yield from walk(child, rest, child_where)
+
+    yield from walk(data, target.split("."), "")
+
+
+_COMPILED: Dict[Path, Tuple[Signature, CompiledRules]] = {}
+
+
+def load_rules(template_path: Path, use_disk_cache: bool = True) -> CompiledRules:
+    """Return compiled rules for a template
+
+    Rules are memoised in-process by file signature and, across processes,
+    stored under ``~/.sdd/cache/rules`` keyed by template version and hash.
+    """
+    template_path = Path(template_path).resolve()
+    signature = stat_signature(template_path)
+    cached = _COMPILED.get(template_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    rule_set = None
+    cache_file = None
+    if use_disk_cache:
+        raw = template_path.read_bytes()
+        version = parse_frontmatter(raw.decode("utf-8")).get("version") or "unversioned"
+        cache_file = cache_dir("rules") / (
+            f"{template_path.stem}-{version}-{sha256_bytes(raw)[:16]}-r{RULES_VERSION}.json"
+        )
+        if cache_file.exists():
+            try:
+                rule_set = RuleSet.from_dict(json.loads(cache_file.read_text(encoding="utf-8")))
+            except (ValueError, KeyError, TypeError):
+                rule_set = None
+
+    if rule_set is None:
+        rule_set = derive_rules(template_path)
+        if cache_file is not None:
+            write_json_atomic(cache_file, rule_set.to_dict())
+
+    compiled = CompiledRules(rule_set)
+    _COMPILED[template_path] = (signature, compiled)
+    return compiled
+
+
+class TemplateRegistry:
+    """Maps documents to the template that governs them"""
+
+    def __init__(self, templates_dir: Path, use_disk_cache: bool = True) -> None:
+        self.templates_dir = Path(templates_dir)
+        self.use_disk_cache = use_disk_cache
+
+    def template_for(self, path: Path) -> Optional[Path]:
+        name = Path(path).name
+        if name in TEMPLATE_DOCUMENT_PATTERNS:
+            return None  # templates govern documents, they are not governed
+        for template, patterns in TEMPLATE_DOCUMENT_PATTERNS.items():
+            if any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+                template_path = self.templates_dir / template
+                return template_path if template_path.exists() else None
+        return None
+
+    def check(self, path: Path) -> Optional[ComplianceReport]:
+        """Check one document; ``None`` if no template governs it"""
+        template = self.template_for(path)
+        if template is None:
+            return None
+        return load_rules(template, self.use_disk_cache).check(Path(path))
@@ -0,0 +1,402 @@
+"""
+Symbol, section and requirement index
+
+An incremental SQLite index over a repository so context extraction
+(TASK-008) and the brownfield analysis agents (TASK-036/TASK-039) can look
+things up in milliseconds instead of scanning the tree per query:
+
+* Python symbols - classes, functions, methods and module constants via ``ast``
+* markdown sections - every heading with its line range
+* requirement references - ``REQ-009``, ``NFR-PERF-004`` etc. per document
+
+``sdd-index build`` only re-parses files whose mtime/size changed and whose
+content hash differs from the indexed one. Queries open the database
+read-only with SQLite memory-mapped I/O.
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sdd.blueprints import parse_frontmatter
+from sdd.bundles import HEADING, normalize_title
+from sdd.cache import cache_dir, sha256_bytes
+
+SCHEMA_VERSION = 1
+
+INDEXED_SUFFIXES = {".py", ".md"}
+SKIPPED_DIRECTORIES = {
+    ".git", ".task_bundles", "__pycache__", "node_modules",
+    ".venv", "venv", ".tox", ".nox", ".mypy_cache", ".pytest_cache",
+}
+
+REQUIREMENT_ID = re.compile(r"\b(?:REQ|NFR)(?:-[A-Z]+)*-\d+\b")
+
+MMAP_SIZE = 1 << 30
+
+# Below this many changed files the process pool costs more than it saves
+MIN_PARALLEL_FILES = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, hash TEXT
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    name TEXT, qualname TEXT, kind TEXT, path TEXT, line INTEGER, end_line INTEGER
+);
+CREATE TABLE IF NOT EXISTS sections (
+    title TEXT, heading TEXT, level INTEGER, path TEXT, line INTEGER, end_line INTEGER
+);
+CREATE TABLE IF NOT EXISTS refs (
+    ref_id TEXT, path TEXT, doc_id TEXT, line INTEGER
+);
+CREATE INDEX IF NOT EXISTS symbols_name ON symbols (name);
+CREATE INDEX IF NOT EXISTS symbols_qualname ON symbols (qualname);
+CREATE INDEX IF NOT EXISTS symbols_path ON symbols (path);
+CREATE INDEX IF NOT EXISTS sections_title ON sections (title);
+CREATE INDEX IF NOT EXISTS sections_path ON sections (path);
+CREATE INDEX IF NOT EXISTS refs_ref_id ON refs (ref_id);
+CREATE INDEX IF NOT EXISTS refs_path ON refs (path);
+"""
+
+
+@dataclass
+class ParsedFile:
+    path: str
+    mtime_ns: int
+    size: int
+    hash: str
+    symbols: List[Tuple[str, str, str, int, int]] = field(default_factory=list)
+    sections: List[Tuple[str, str, int, int, int]] = field(default_factory=list)
+    refs: List[Tuple[str, Optional[str], int]] = field(default_factory=list)
+    # Set when only mtime/size moved and the content hash still matches
+    unchanged: bool = False
+
+
+@dataclass
+class BuildStats:
+    scanned: int = 0
+    parsed: int = 0
+    removed: int = 0
+
+
+def python_symbols(source: str) -> List[Tuple[str, str, str, int, int]]:
+    """(name, qualname, kind, line, end_line) for classes, functions and constants"""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+
+    symbols: List[Tuple[str, str, str, int, int]] = []
+
+    def visit(node: ast.AST, prefix: str, in_class: bool) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.ClassDef):
+                qualname = prefix + child.name
+                end = child.end_lineno or child.lineno
+                symbols.append((child.name, qualname, "class", child.lineno, end))
+                visit(child, qualname + ".", True)
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                qualname = prefix + child.name
+                end = child.end_lineno or child.lineno
+                symbols.append((child.name, qualname, "method" if in_class else "function", child.lineno, end))
+                visit(child, qualname + ".<locals>.", False)
+            elif isinstance(child, (ast.Assign, ast.AnnAssign)) and not prefix:
+                targets = child.targets if isinstance(child, ast.Assign) else [child.target]
+                end = child.end_lineno or child.lineno
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        symbols.append((target.id, target.id, "variable", child.lineno, end))
+
+    visit(tree, "", False)
+    return symbols
+
+
+def markdown_sections(text: str) -> List[Tuple[str, str, int, int, int]]:
+    """(normalized title, heading text, level, line, end_line) per heading"""
+    headings: List[Tuple[str, str, int, int]] = []
+    in_code_block = False
+    lines = text.splitlines()
+    for number, text_line in enumerate(lines, 1):
+        if text_line.startswith("```"):
+            in_code_block = not in_code_block
+            continue
+        match = None if in_code_block else HEADING.match(text_line)
+        if match:
+            heading = match.group(2)
+            headings.append((normalize_title(heading), heading, len(match.group(1)), number))
+
+    sections = []
+    for index, (title, heading, level, line) in enumerate(headings):
+        end_line = len(lines)
+        for _, _, next_level, next_line in headings[index + 1:]:
+            if next_level <= level:
+                end_line = next_line - 1
+                break
+        sections.append((title, heading, level, line, end_line))
+    return sections
+
+
+def requirement_refs(text: str) -> List[Tuple[str, int]]:
+    return [
+        (match.group(0), number)
+        for number, line in enumerate(text.splitlines(), 1)
+        for match in REQUIREMENT_ID.finditer(line)
+    ]
+
+
+def parse_file(path: str, mtime_ns: int, size: int) -> ParsedFile:
+    raw = Path(path).read_bytes()
+    parsed = ParsedFile(path, mtime_ns, size, sha256_bytes(raw))
+    text = raw.decode("utf-8", errors="replace")
+    if path.endswith(".py"):
+        parsed.symbols = python_symbols(text)
+    else:
+        parsed.sections = markdown_sections(text)
+        doc_id = parse_frontmatter(text).get("id")
+        parsed.refs = [(ref_id, doc_id, line) for ref_id, line in requirement_refs(text)]
+    return parsed
+
+
+def _parse_batch(batch: List[Tuple[str, int, int, Optional[str]]]) -> List[ParsedFile]:
+    """Worker entry point; files whose hash is unchanged come back unparsed"""
+    results = []
+    for path, mtime_ns, size, known_hash in batch:
+        try:
+            raw = Path(path).read_bytes()
+        except OSError:
+            continue
+        if known_hash is not None and sha256_bytes(raw) == known_hash:
+            results.append(ParsedFile(path, mtime_ns, size, known_hash, unchanged=True))
+            continue
+        results.append(parse_file(path, mtime_ns, size))
+    return results
+
+
+def walk(roots: Sequence[Path]) -> Iterator[Tuple[str, int, int]]:
+    """(path, mtime_ns, size) for every indexable file under ``roots``"""
+    for root in roots:
+        for directory, subdirectories, files in os.walk(str(root)):
+            subdirectories[:] = [name for name in subdirectories if name not in SKIPPED_DIRECTORIES]
+            for name in files:
+                if os.path.splitext(name)[1] not in INDEXED_SUFFIXES:
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+def default_index_path(repo_root: Path) -> Path:
+    key = sha256_bytes(str(repo_root.resolve()).encode("utf-8"))[:16]
+    return cache_dir("index") / f"{key}.sqlite"
+
+
+class RepositoryIndex:
+    """Build and query the on-disk index"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+
+    def _connect(self, readonly: bool) -> sqlite3.Connection:
+        if readonly:
+            connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            version = connection.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+            if version is None or int(version[0]) != SCHEMA_VERSION:
+                for table in ("files", "symbols", "sections", "refs"):
+                    connection.execute(f"DELETE FROM {table}")
+                connection.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('schema', ?)", (str(SCHEMA_VERSION),)
+                )
+        connection.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        return connection
+
+    def build(self, roots: Sequence[Path], jobs: Optional[int] = None) -> BuildStats:
+        """Bring the index up to date with the files under ``roots``"""
+        stats = BuildStats()
+        connection = self._connect(readonly=False)
+        try:
+            known: Dict[str, Tuple[int, int, str]] = {
+                path: (mtime_ns, size, digest)
+                for path, mtime_ns, size, digest in connection.execute(
+                    "SELECT path, mtime_ns, size, hash FROM files"
+                )
+            }
+            seen = set()
+            changed: List[Tuple[str, int, int, Optional[str]]] = []
+            for path, mtime_ns, size in walk(roots):
+                stats.scanned += 1
+                seen.add(path)
+                previous = known.get(path)
+                if previous is not None and previous[:2] == (mtime_ns, size):
+                    continue
+                changed.append((path, mtime_ns, size, previous[2] if previous else None))
+
+            root_prefixes = tuple(str(Path(root).resolve()) + os.sep for root in roots)
+            removed = [
+                path for path in known
+                if path not in seen and path.startswith(root_prefixes)
+            ]
+            with connection:
+                for path in removed:
+                    self._delete(connection, path)
+                stats.removed = len(removed)
+                for parsed in self._parse(changed, jobs):
+                    if parsed.unchanged:
+                        connection.execute(
+                            "UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?",
+                            (parsed.mtime_ns, parsed.size, parsed.path),
+                        )
+                        continue
+                    self._store(connection, parsed)
+                    stats.parsed += 1
+        finally:
+            connection.close()
+        return stats
+
+    def _parse(
+        self, changed: List[Tuple[str, int, int, Optional[str]]], jobs: Optional[int]
+    ) -> Iterator[ParsedFile]:
+        workers = max(1, min(jobs or os.cpu_count() or 1, len(changed)))
+        if workers == 1 or len(changed) < MIN_PARALLEL_FILES:
+            yield from _parse_batch(changed)
+            return
+        batches = [changed[index::workers] for index in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for results in pool.map(_parse_batch, batches):
+                yield from results
+
+    @staticmethod
+    def _delete(connection: sqlite3.Connection, path: str) -> None:
+        for table in ("files", "symbols", "sections", "refs"):
+            connection.execute(f"DELETE FROM {table} WHERE path = ?", (path,))
+
+    def _store(self, connection: sqlite3.Connection, parsed: ParsedFile) -> None:
+        self._delete(connection, parsed.path)
+        connection.execute(
+            "INSERT INTO files VALUES (?, ?, ?, ?)",
+            (parsed.path, parsed.mtime_ns, parsed.size, parsed.hash),
+        )
+        connection.executemany(
+            "INSERT INTO symbols VALUES (?, ?, ?, ?, ?, ?)",
+            [(name, qualname, kind, parsed.path, line, end) for name, qualname, kind, line, end in parsed.symbols],
+        )
+        connection.executemany(
+            "INSERT INTO sections VALUES (?, ?, ?, ?, ?, ?)",
+            [(title, heading, level, parsed.path, line, end) for title, heading, level, line, end in parsed.sections],
+        )
+        connection.executemany(
+            "INSERT INTO refs VALUES (?, ?, ?, ?)",
+            [(ref_id, parsed.path, doc_id, line) for ref_id, doc_id, line in parsed.refs],
+        )
+
+    def _query(self, sql: str, parameters: Sequence[Any]) -> List[Dict[str, Any]]:
+        connection = self._connect(readonly=True)
+        try:
+            connection.row_factory = sqlite3.Row
+            return [dict(row) for row in connection.execute(sql, parameters)]
+        finally:
+            connection.close()
+
+    def find_symbol(self, name: str, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Match a bare name (``run``) or a qualified name (``Scheduler.run``)"""
+        column = "qualname" if "." in name else "name"
+        sql = f"SELECT name, qualname, kind, path, line, end_line FROM symbols WHERE {column} = ?"
+        parameters: List[Any] = [name]
+        if kind is not None:
+            sql += " AND kind = ?"
+            parameters.append(kind)
+        return self._query(sql + " ORDER BY path, line", parameters)
+
+    def find_section(self, title: str, path_suffix: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Headings matching ``title`` (numbering and case ignored)"""
+        sql = "SELECT heading, level, path, line, end_line FROM sections WHERE title = ?"
+        parameters: List[Any] = [normalize_title(title.lstrip("#").strip())]
+        if path_suffix is not None:
+            sql += " AND path LIKE ?"
+            parameters.append("%" + path_suffix)
+        return self._query(sql + " ORDER BY path, line", parameters)
+
+    def find_references(self, ref_id: str) -> List[Dict[str, Any]]:
+        """Every document line that mentions a requirement ID"""
+        return self._query(
+            "SELECT ref_id, path, doc_id, line FROM refs WHERE ref_id = ? ORDER BY path, line",
+            [ref_id],
+        )
+
+    def requirements_for(self, doc_id: str) -> List[str]:
+        """Requirement IDs referenced by one blueprint (by frontmatter id)"""
+        rows = self._query("SELECT DISTINCT ref_id FROM refs WHERE doc_id = ? ORDER BY ref_id", [doc_id])
+        return [row["ref_id"] for row in rows]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="sdd-index", description="Build and query the repository index.")
+    parser.add_argument("--repo-root", default=".", help="repository root (default: current directory)")
+    parser.add_argument("--index", type=Path, help="index file (default: ~/.sdd/cache/index/<repo>.sqlite)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="index new and changed files")
+    build.add_argument("paths", nargs="*", help="directories to index (default: repo root)")
+    build.add_argument("-j", "--jobs", type=int, help="parser processes (default: CPU count)")
+
+    symbol = commands.add_parser("symbol", help="find a Python symbol")
+    symbol.add_argument("name")
+    symbol.add_argument("--kind", choices=("class", "function", "method", "variable"))
+
+    section = commands.add_parser("section", help="find a markdown section by title")
+    section.add_argument("title")
+    section.add_argument("--in", dest="path_suffix", help="only files whose path ends with this")
+
+    refs = commands.add_parser("refs", help="find documents referencing a requirement ID")
+    refs.add_argument("ref_id")
+
+    requirements = commands.add_parser("requirements", help="list requirement IDs a blueprint references")
+    requirements.add_argument("doc_id")
+
+    args = parser.parse_args(argv)
+    repo_root = Path(args.repo_root).resolve()
+    index = RepositoryIndex(args.index or default_index_path(repo_root))
+
+    if args.command == "build":
+        roots = [Path(path).resolve() for path in args.paths] or [repo_root]
+        stats = index.build(roots, args.jobs)
+        print(f"[INFO] Indexed {stats.parsed} changed files ({stats.scanned} scanned, {stats.removed} removed)")
+        return 0
+
+    if not index.path.exists():
+        print("[ERROR] No index found - run 'sdd-index build' first", file=sys.stderr)
+        return 2
+    if args.command == "symbol":
+        rows = index.find_symbol(args.name, args.kind)
+    elif args.command == "section":
+        rows = index.find_section(args.title, args.path_suffix)
+    elif args.command == "refs":
+        rows = index.find_references(args.ref_id)
+    else:
+        for ref_id in index.requirements_for(args.doc_id):
+            print(ref_id)
+        return 0
+    for row in rows:
+        print(json.dumps(row, sort_keys=True))
+    return 0 if rows else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,541 @@
+"""
+Milestone task scheduler
+
+Builds a dependency graph for a milestone's task blueprints and runs
+independent tasks concurrently through a bounded asyncio worker pool.
+
+Dependencies come from blueprint frontmatter:
+
+* ``depends_on`` - explicit list of task IDs, inline (``[TASK-031, TASK-032]``)
+  or as a YAML block list; when present, even ``[]``, it is authoritative
+* otherwise each task depends on the previous task in the same ``slice``,
+  and separate slices are independent
+
+Dependencies on tasks of another milestone are external: they are not run,
+and their dependents only start once the status index records them as
+completed.
+
+Ready tasks are dispatched longest-remaining-path first so the critical path
+is never starved. Each task runs with its own ``.task_bundles/TASK-ID/``
+directory and, optionally, its own git worktree on the task's branch, started
+from its dependencies' branches so dependents build on upstream commits.
+Completed tasks are recorded in the status index and skipped on resume;
+dependents of a failed task are not started. Bundle cache hit/miss counters
+from every task are summed into the run report.
+"""
+
+import argparse
+import asyncio
+import heapq
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from sdd.blueprints import FRONTMATTER_PATTERN, Blueprint, BlueprintCorpus
+from sdd.bundles import CacheStats, read_bundle_stats
+from sdd.status import COMPLETED, FAILED, IN_PROGRESS, StatusIndex
+
+# Used when a blueprint has no "Time Estimate: N hours" line
+DEFAULT_ESTIMATE_HOURS = 1.0
+
+TASK_ID = re.compile(r"[A-Z]+(?:-[A-Z]+)*-\d+")
+TIME_ESTIMATE = re.compile(r"Time Estimate\**:\**\s*([\d.]+)\s*hours?", re.IGNORECASE)
+TASK_NUMBER = re.compile(r"(\d+)$")
+DEPENDS_ON_BLOCK = re.compile(r"^depends_on:[ \t]*\n((?:[ \t]*-.*(?:\n|$))+)", re.MULTILINE)
+
+# Worktree branch for tasks whose blueprint has no "branch:"
+DEFAULT_BRANCH_PREFIX = "sdd/"
+
+SKIPPED = "skipped"
+
+
+class CycleError(ValueError):
+    """Raised when blueprint dependencies form a cycle"""
+
+    def __init__(self, cycle: List[str]) -> None:
+        super().__init__("Dependency cycle: " + " -> ".join(cycle))
+        self.cycle = cycle
+
+
+@dataclass(frozen=True)
+class TaskNode:
+    task_id: str
+    blueprint: Path
+    milestone_id: Optional[str]
+    slice: Optional[str]
+    depends_on: Tuple[str, ...]
+    estimate: float = DEFAULT_ESTIMATE_HOURS
+    branch: Optional[str] = None
+
+
+def parse_depends_on(value: Optional[str]) -> Tuple[str, ...]:
+    """``[TASK-001, TASK-002]``, ``TASK-001, TASK-002`` or empty
+
+    Raises ValueError when an item is not a task ID.
+    """
+    text = (value or "").strip()
+    if text.startswith("[") and text.endswith("]"):
+        text = text[1:-1]
+    items = [item.strip().strip("\"'") for item in text.split(",")]
+    items = [item for item in items if item]
+    invalid = [item for item in items if not TASK_ID.fullmatch(item)]
+    if invalid:
+        raise ValueError(f"not task IDs: {', '.join(invalid)}")
+    return tuple(items)
+
+
+def _declared_depends_on(blueprint: Blueprint, task_id: str) -> Tuple[str, ...]:
+    """``depends_on`` written inline or as a YAML block list of task IDs"""
+    value = blueprint.frontmatter["depends_on"]
+    try:
+        if value is not None:
+            return parse_depends_on(value)
+        match = FRONTMATTER_PATTERN.match(blueprint.content)
+        block = DEPENDS_ON_BLOCK.search(match.group(1) + "\n") if match else None
+        if block is None:
+            raise ValueError("no value")
+        return parse_depends_on(", ".join(item.strip()[1:] for item in block.group(1).splitlines()))
+    except ValueError as error:
+        raise ValueError(
+            f"{task_id} has an unreadable depends_on ({error}); "
+            "list task IDs (depends_on: [TASK-001, TASK-002]) or write depends_on: [] for none"
+        ) from None
+
+
+def _blueprint_task_id(blueprint: Blueprint) -> str:
+    return blueprint.frontmatter.get("id") or blueprint.path.stem.split("_", 1)[0]
+
+
+def _task_sort_key(task_id: str) -> Tuple[str, int]:
+    match = TASK_NUMBER.search(task_id)
+    return (task_id[: match.start()] if match else task_id, int(match.group(1)) if match else 0)
+
+
+class TaskGraph:
+    """Dependency DAG over one milestone's tasks
+
+    ``external`` maps dependencies outside the graph (tasks of other
+    milestones) to their declared branch; they are never scheduled.
+    """
+
+    def __init__(
+        self, nodes: Sequence[TaskNode], external: Optional[Mapping[str, Optional[str]]] = None
+    ) -> None:
+        self.nodes: Dict[str, TaskNode] = {node.task_id: node for node in nodes}
+        self.external: Dict[str, Optional[str]] = dict(external or {})
+        self.dependents: Dict[str, List[str]] = {task_id: [] for task_id in self.nodes}
+        self.upstream: Dict[str, Tuple[str, ...]] = {}
+        for node in nodes:
+            for dependency in node.depends_on:
+                if dependency in self.nodes:
+                    self.dependents[dependency].append(node.task_id)
+                elif dependency not in self.external:
+                    raise ValueError(f"{node.task_id} depends on unknown task {dependency}")
+            self.upstream[node.task_id] = tuple(dep for dep in node.depends_on if dep in self.nodes)
+        self.order = self._topological_order()
+        self.remaining = self._remaining_path()
+
+    @classmethod
+    def from_blueprints(
+        cls, blueprints: Iterable[Blueprint], milestone_id: Optional[str] = None
+    ) -> "TaskGraph":
+        nodes: List[TaskNode] = []
+        previous_in_slice: Dict[Optional[str], str] = {}
+        ordered = sorted(blueprints, key=lambda blueprint: _task_sort_key(_blueprint_task_id(blueprint)))
+        branches = {_blueprint_task_id(blueprint): blueprint.frontmatter.get("branch") for blueprint in ordered}
+
+        for blueprint in ordered:
+            frontmatter = blueprint.frontmatter
+            if milestone_id is not None and frontmatter.get("milestone_id") != milestone_id:
+                continue
+            task_id = _blueprint_task_id(blueprint)
+            slice_name = frontmatter.get("slice")
+            if "depends_on" in frontmatter:
+                depends_on = _declared_depends_on(blueprint, task_id)
+            elif slice_name in previous_in_slice:
+                depends_on = (previous_in_slice[slice_name],)
+            else:
+                depends_on = ()
+            previous_in_slice[slice_name] = task_id
+
+            estimate = TIME_ESTIMATE.search(blueprint.content)
+            nodes.append(TaskNode(
+                task_id=task_id,
+                blueprint=blueprint.path,
+                milestone_id=frontmatter.get("milestone_id"),
+                slice=slice_name,
+                depends_on=depends_on,
+                estimate=float(estimate.group(1)) if estimate else DEFAULT_ESTIMATE_HOURS,
+                branch=frontmatter.get("branch"),
+            ))
+        selected = {node.task_id for node in nodes}
+        external = {
+            dependency: branches[dependency]
+            for node in nodes
+            for dependency in node.depends_on
+            if dependency not in selected and dependency in branches
+        }
+        return cls(nodes, external)
+
+    def _topological_order(self) -> List[str]:
+        """Kahn's algorithm; on failure report one concrete cycle"""
+        indegree = {task_id: len(upstream) for task_id, upstream in self.upstream.items()}
+        ready = sorted((task_id for task_id, count in indegree.items() if count == 0), key=_task_sort_key)
+        order: List[str] = []
+        while ready:
+            task_id = ready.pop(0)
+            order.append(task_id)
+            for dependent in self.dependents[task_id]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self.nodes):
+            raise CycleError(self._find_cycle({task_id for task_id, count in indegree.items() if count}))
+        return order
+
+    def _find_cycle(self, candidates: Set[str]) -> List[str]:
+        start = min(candidates, key=_task_sort_key)
+        path: List[str] = []
+        seen: Dict[str, int] = {}
+        current = start
+        while current not in seen:
+            seen[current] = len(path)
+            path.append(current)
+            current = next(dep for dep in self.upstream[current] if dep in candidates)
+        return path[seen[current]:] + [current]
+
+    def _remaining_path(self) -> Dict[str, float]:
+        """Longest estimated path from each task to the end of the milestone"""
+        remaining: Dict[str, float] = {}
+        for task_id in reversed(self.order):
+            tail = max((remaining[dependent] for dependent in self.dependents[task_id]), default=0.0)
+            remaining[task_id] = self.nodes[task_id].estimate + tail
+        return remaining
+
+    def critical_path(self) -> Tuple[List[str], float]:
+        """The chain of tasks bounding the milestone's wall-clock time"""
+        if not self.nodes:
+            return [], 0.0
+        current: Optional[str] = max(
+            (task_id for task_id, upstream in self.upstream.items() if not upstream),
+            key=lambda task_id: self.remaining[task_id],
+        )
+        total = self.remaining[current] if current else 0.0
+        path: List[str] = []
+        while current is not None:
+            path.append(current)
+            current = max(self.dependents[current], key=lambda task_id: self.remaining[task_id], default=None)
+        return path, total
+
+    def total_estimate(self) -> float:
+        return sum(node.estimate for node in self.nodes.values())
+
+
+Runner = Callable[[TaskNode, Path, Path], Awaitable[bool]]
+
+
+@dataclass
+class ScheduleResult:
+    statuses: Dict[str, str] = field(default_factory=dict)
+    started: List[str] = field(default_factory=list)
+    # Tasks not started because an external dependency is not completed
+    blocked: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    bundle_cache: CacheStats = field(default_factory=CacheStats)
+
+    @property
+    def succeeded(self) -> bool:
+        return all(status == COMPLETED for status in self.statuses.values())
+
+
+class Scheduler:
+    """Runs a TaskGraph with at most ``jobs`` tasks in flight"""
+
+    def __init__(
+        self,
+        graph: TaskGraph,
+        workspace: Path,
+        jobs: int = 1,
+        status_index: Optional[StatusIndex] = None,
+        use_worktrees: bool = False,
+    ) -> None:
+        if jobs < 1:
+            raise ValueError("jobs must be at least 1")
+        self.graph = graph
+        self.workspace = Path(workspace)
+        self.jobs = jobs
+        self.status_index = status_index
+        self.use_worktrees = use_worktrees
+
+    def branch_for(self, task_id: str) -> str:
+        """The branch a task's worktree commits to"""
+        node = self.graph.nodes.get(task_id)
+        branch = node.branch if node is not None else self.graph.external.get(task_id)
+        return branch or DEFAULT_BRANCH_PREFIX + task_id
+
+    def _git(self, *args: str, cwd: Optional[Path] = None, check: bool = True) -> "subprocess.CompletedProcess[str]":
+        return subprocess.run(["git", *args], cwd=str(cwd or self.workspace), check=check,
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+
+    def _branch_exists(self, branch: str) -> bool:
+        return self._git("rev-parse", "--verify", "--quiet", f"refs/heads/{branch}", check=False).returncode == 0
+
+    def prepare_bundle(self, node: TaskNode) -> Tuple[Path, Path]:
+        """Create the task's bundle directory and working directory
+
+        With worktrees the task works on its own branch, started from its first
+        dependency's branch with the other dependencies merged in. Dependencies
+        without a branch (e.g. completed before worktrees were used) are
+        assumed to be in ``HEAD``.
+        """
+        bundle = self.workspace / ".task_bundles" / node.task_id
+        bundle.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(str(node.blueprint), str(bundle / "Task_Blueprint.md"))
+        if not self.use_worktrees:
+            return bundle, self.workspace
+
+        worktree = bundle / "worktree"
+        if not worktree.exists():
+            branch = self.branch_for(node.task_id)
+            upstream = [self.branch_for(dependency) for dependency in node.depends_on]
+            upstream = [ref for ref in upstream if self._branch_exists(ref)]
+            if self._branch_exists(branch):
+                self._git("worktree", "add", str(worktree), branch)
+            else:
+                self._git("worktree", "add", "-b", branch, str(worktree), upstream[0] if upstream else "HEAD")
+            try:
+                for ref in upstream:
+                    self._git("merge", "--no-edit", "--quiet", ref, cwd=worktree)
+            except subprocess.CalledProcessError:
+                # Never leave a half-merged worktree for the next run to reuse
+                self._git("merge", "--abort", cwd=worktree, check=False)
+                self._git("worktree", "remove", "--force", str(worktree), check=False)
+                raise
+        return bundle, worktree
+
+    def release_worktree(self, bundle: Path) -> bool:
+        """Remove a successful task's worktree once its work is safe on a branch
+
+        Worktrees with uncommitted changes, or whose commits no branch
+        references, are kept. Failed tasks keep theirs for debugging.
+        """
+        worktree = bundle / "worktree"
+        if not self.use_worktrees or not worktree.exists():
+            return False
+        if self._git("status", "--porcelain", cwd=worktree).stdout.strip():
+            print(
+                f"[WARN] {bundle.name} left uncommitted changes in {worktree}; "
+                "dependents only see committed work",
+                file=sys.stderr,
+            )
+            return False
+        referenced = self._git("for-each-ref", "--count=1", "--contains", "HEAD", "refs/heads", cwd=worktree)
+        if not referenced.stdout.strip():
+            print(f"[WARN] {bundle.name} has commits on no branch; keeping {worktree}", file=sys.stderr)
+            return False
+        return self._git("worktree", "remove", str(worktree), check=False).returncode == 0
+
+    def _record(self, node: TaskNode, status: str, **details: int) -> None:
+        if self.status_index is not None:
+            self.status_index.record(node.task_id, status, node.milestone_id, node.slice, **details)
+
+    async def run(self, runner: Runner) -> ScheduleResult:
+        graph = self.graph
+        result = ScheduleResult()
+        if self.status_index is not None:
+            already = self.status_index.statuses(graph.order)
+            result.statuses.update({
+                task_id: COMPLETED for task_id, status in already.items() if status == COMPLETED
+            })
+
+        waiting = {task_id: len(upstream) for task_id, upstream in graph.upstream.items()}
+        ready: List[Tuple[float, Tuple[str, int], str]] = []
+
+        def release(task_id: str) -> None:
+            for dependent in graph.dependents[task_id]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    heapq.heappush(ready, (-graph.remaining[dependent], _task_sort_key(dependent), dependent))
+
+        def skip(task_id: str) -> None:
+            for dependent in graph.dependents[task_id]:
+                if dependent not in result.statuses:
+                    result.statuses[dependent] = SKIPPED
+                    skip(dependent)
+
+        if graph.external:
+            index = self.status_index
+            external_statuses = index.statuses(sorted(graph.external)) if index is not None else {}
+            for task_id in graph.order:
+                unmet = tuple(
+                    dependency for dependency in graph.nodes[task_id].depends_on
+                    if dependency in graph.external and external_statuses.get(dependency) != COMPLETED
+                )
+                if unmet and task_id not in result.statuses:
+                    result.blocked[task_id] = unmet
+                    result.statuses[task_id] = SKIPPED
+                    skip(task_id)
+
+        for task_id in graph.order:
+            if waiting[task_id] == 0:
+                heapq.heappush(ready, (-graph.remaining[task_id], _task_sort_key(task_id), task_id))
+
+        async def execute(node: TaskNode) -> bool:
+            try:
+                bundle, workdir = self.prepare_bundle(node)
+            except (OSError, subprocess.CalledProcessError) as error:
+                stderr = getattr(error, "stderr", None) or ""
+                print(f"[ERROR] {node.task_id}: could not prepare workspace: {stderr.strip() or error}",
+                      file=sys.stderr)
+                self._record(node, FAILED)
+                return False
+            self._record(node, IN_PROGRESS)
+            try:
+                ok = await runner(node, bundle, workdir)
+            except Exception as error:
+                message = f"[ERROR] {node.task_id}: runner failed: {type(error).__name__}: {error}"
+                print(message, file=sys.stderr)
+                with open(bundle / "run.log", "a", encoding="utf-8") as log:
+                    log.write(message + "\n")
+                ok = False
+            cache_stats = read_bundle_stats(bundle)
+            result.bundle_cache.add(cache_stats)
+            self._record(
+                node,
+                COMPLETED if ok else FAILED,
+                bundle_cache_hits=cache_stats.hits,
+                bundle_cache_misses=cache_stats.misses,
+            )
+            if ok:
+                self.release_worktree(bundle)
+            return ok
+
+        running: Dict["asyncio.Future[bool]", str] = {}
+        while ready or running:
+            while ready and len(running) < self.jobs:
+                task_id = heapq.heappop(ready)[2]
+                status = result.statuses.get(task_id)
+                if status == COMPLETED:
+                    release(task_id)
+                    continue
+                if status == SKIPPED:
+                    continue
+                result.started.append(task_id)
+                running[asyncio.ensure_future(execute(graph.nodes[task_id]))] = task_id
+            if not running:
+                continue
+            done, _ = await asyncio.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                task_id = running.pop(future)
+                if future.result():
+                    result.statuses[task_id] = COMPLETED
+                    release(task_id)
+                else:
+                    result.statuses[task_id] = FAILED
+                    skip(task_id)
+        return result
+
+
+class CommandRunner:
+    """Runs a shell command per task, logging to ``<bundle>/run.log``
+
+    The command template may use ``{task_id}``, ``{blueprint}``, ``{bundle}``
+    and ``{workdir}``; values are shell-quoted, so placeholders must not be
+    wrapped in quotes. Literal braces are written ``{{`` and ``}}``.
+    """
+
+    def __init__(self, template: str) -> None:
+        try:
+            template.format(task_id="", blueprint="", bundle="", workdir="")
+        except (AttributeError, KeyError, IndexError, ValueError) as error:
+            raise ValueError(
+                f"Invalid command template ({type(error).__name__}: {error}); "
+                "placeholders are {task_id}, {blueprint}, {bundle} and {workdir}, "
+                "literal braces are written {{ and }}"
+            ) from None
+        self.template = template
+
+    async def __call__(self, node: TaskNode, bundle: Path, workdir: Path) -> bool:
+        command = self.template.format(
+            task_id=shlex.quote(node.task_id),
+            blueprint=shlex.quote(str(bundle / "Task_Blueprint.md")),
+            bundle=shlex.quote(str(bundle)),
+            workdir=shlex.quote(str(workdir)),
+        )
+        with open(bundle / "run.log", "wb") as log:
+            process = await asyncio.create_subprocess_shell(
+                command, cwd=str(workdir), stdout=log, stderr=asyncio.subprocess.STDOUT
+            )
+            return await process.wait() == 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="sdd-schedule",
+        description="Run a milestone's task blueprints concurrently in dependency order.",
+    )
+    parser.add_argument("tasks_dir", help="directory containing TASK-*.md blueprints")
+    parser.add_argument("--milestone", help="only tasks with this milestone_id")
+    parser.add_argument("--workspace", default=".", help="project root (default: current directory)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="tasks to run at once (default: 1)")
+    parser.add_argument(
+        "--command",
+        help="shell command per task; placeholders are shell-quoted, e.g. 'claude -p \"/task \"{blueprint}'",
+    )
+    parser.add_argument("--worktrees", action="store_true", help="give every task its own git worktree")
+    parser.add_argument("--plan", action="store_true", help="print the schedule without running it")
+    args = parser.parse_args(argv)
+
+    corpus = BlueprintCorpus(Path(args.tasks_dir), "TASK-*.md")
+    try:
+        graph = TaskGraph.from_blueprints(corpus, args.milestone)
+    except ValueError as error:
+        print(f"[ERROR] {error}", file=sys.stderr)
+        return 2
+
+    path, critical = graph.critical_path()
+    total = graph.total_estimate()
+    print(f"[INFO] {len(graph.nodes)} tasks, {total:g}h of work, critical path {critical:g}h")
+    print(f"[INFO] Critical path: {' -> '.join(path)}")
+    if critical:
+        print(f"[INFO] Maximum useful parallelism: {total / critical:.1f}x")
+    if args.plan:
+        for task_id in graph.order:
+            node = graph.nodes[task_id]
+            after = ", ".join(
+                f"{dependency} (external)" if dependency in graph.external else dependency
+                for dependency in node.depends_on
+            ) or "-"
+            print(f"  {task_id}  after: {after}  ({node.estimate:g}h, {node.slice or 'no slice'})")
+        return 0
+    if not args.command:
+        print("[ERROR] --command is required unless --plan is given", file=sys.stderr)
+        return 2
+
+    try:
+        runner = CommandRunner(args.command)
+    except ValueError as error:
+        print(f"[ERROR] {error}", file=sys.stderr)
+        return 2
+
+    workspace = Path(args.workspace)
+    scheduler = Scheduler(graph, workspace, args.jobs, StatusIndex(workspace), args.worktrees)
+    result = asyncio.run(scheduler.run(runner))
+    for task_id in graph.order:
+        waiting_on = result.blocked.get(task_id)
+        note = f" (waiting on {', '.join(waiting_on)})" if waiting_on else ""
+        print(f"  {task_id}: {result.statuses.get(task_id, 'pending')}{note}")
+    cache = result.bundle_cache
+    print(
+        f"[INFO] Bundle cache: {cache.hits} hits, {cache.misses} misses "
+        f"({cache.hit_rate:.0%} hit rate, {cache.bytes_reused} bytes reused)"
+    )
+    return 0 if result.succeeded else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
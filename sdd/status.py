@@ -0,0 +1,347 @@
+"""
+Task status index
+
+A compact, append-only record of task outcomes kept in the workspace's
+``.task_bundles/`` directory, so milestone resume (TASK-031/TASK-032) is a
+dictionary lookup per task instead of a crawl over bundle directories:
+
+* ``status_index.jsonl`` - one JSON event per line, appended atomically
+* ``status_index.snapshot.json`` - periodic compaction of the log
+* ``status_index.lock`` - ``flock`` lock shared by readers, exclusive for writers
+
+If the index is lost it can be rebuilt from the bundle directories using the
+same success indicators the ``/milestone`` command relies on; ambiguous
+bundles are recorded as in progress so resume never skips them.
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import sys
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sdd.blueprints import Signature, parse_frontmatter, stat_signature
+from sdd.cache import write_json_atomic
+
+PENDING = "pending"
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+FAILED = "failed"
+STATUSES = (PENDING, IN_PROGRESS, COMPLETED, FAILED)
+
+SNAPSHOT_VERSION = 1
+
+# Fold the log into the snapshot once it grows past this many events
+COMPACT_THRESHOLD = 1000
+
+BLUEPRINT_NAMES = ("Task_Blueprint.md", "task_blueprint.md")
+
+
+@dataclass(frozen=True)
+class TaskStatus:
+    task_id: str
+    status: str
+    milestone_id: Optional[str] = None
+    slice: Optional[str] = None
+    updated_at: str = ""
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TaskStatus":
+        return cls(
+            task_id=data["task_id"],
+            status=data["status"],
+            milestone_id=data.get("milestone_id"),
+            slice=data.get("slice"),
+            updated_at=data.get("updated_at", ""),
+            details=data.get("details") or {},
+        )
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+class StatusIndex:
+    """Queryable task status store for one workspace"""
+
+    def __init__(self, workspace: Path, compact_threshold: int = COMPACT_THRESHOLD) -> None:
+        self.bundles_dir = Path(workspace) / ".task_bundles"
+        self.log_path = self.bundles_dir / "status_index.jsonl"
+        self.snapshot_path = self.bundles_dir / "status_index.snapshot.json"
+        self.lock_path = self.bundles_dir / "status_index.lock"
+        self.compact_threshold = compact_threshold
+        self._tasks: Dict[str, TaskStatus] = {}
+        self._snapshot_signature: Optional[Signature] = None
+        self._log_offset = 0
+        self._log_events = 0
+
+    @contextmanager
+    def _locked(self, exclusive: bool) -> Iterator[None]:
+        self.bundles_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def _refresh(self) -> None:
+        """Bring the in-memory view up to date; caller holds the lock
+
+        Only log bytes appended since the last refresh are read unless the
+        snapshot changed or the log was truncated by compaction.
+        """
+        snapshot_signature = (
+            stat_signature(self.snapshot_path) if self.snapshot_path.exists() else None
+        )
+        log_size = self.log_path.stat().st_size if self.log_path.exists() else 0
+        if snapshot_signature != self._snapshot_signature or log_size < self._log_offset:
+            self._tasks = {}
+            if snapshot_signature is not None:
+                data = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+                for entry in data.get("tasks", {}).values():
+                    status = TaskStatus.from_dict(entry)
+                    self._tasks[status.task_id] = status
+            self._snapshot_signature = snapshot_signature
+            self._log_offset = 0
+            self._log_events = 0
+
+        if log_size == self._log_offset:
+            return
+        with open(self.log_path, "rb") as handle:
+            handle.seek(self._log_offset)
+            for raw in handle:
+                if not raw.endswith(b"\n"):
+                    break  # partially written line; picked up next time
+                self._log_offset += len(raw)
+                try:
+                    status = TaskStatus.from_dict(json.loads(raw))
+                except (ValueError, KeyError):
+                    continue
+                self._tasks[status.task_id] = status
+                self._log_events += 1
+
+    def _append(self, statuses: Iterable[TaskStatus]) -> None:
+        payload = b"".join(
+            json.dumps(asdict(status), sort_keys=True).encode("utf-8") + b"\n"
+            for status in statuses
+        )
+        fd = os.open(str(self.log_path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, payload)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def record(
+        self,
+        task_id: str,
+        status: str,
+        milestone_id: Optional[str] = None,
+        slice: Optional[str] = None,
+        **details: Any,
+    ) -> TaskStatus:
+        """Append a status change; milestone/slice default to the last known values"""
+        if status not in STATUSES:
+            raise ValueError(f"Unknown status '{status}' (expected one of {', '.join(STATUSES)})")
+        with self._locked(exclusive=True):
+            self._refresh()
+            previous = self._tasks.get(task_id)
+            entry = TaskStatus(
+                task_id=task_id,
+                status=status,
+                milestone_id=milestone_id or (previous.milestone_id if previous else None),
+                slice=slice or (previous.slice if previous else None),
+                updated_at=_now(),
+                details=details,
+            )
+            self._append([entry])
+            self._refresh()
+            if self._log_events >= self.compact_threshold:
+                self._compact()
+        return entry
+
+    def get(self, task_id: str) -> Optional[TaskStatus]:
+        with self._locked(exclusive=False):
+            self._refresh()
+            return self._tasks.get(task_id)
+
+    def statuses(self, task_ids: Sequence[str]) -> Dict[str, str]:
+        """Status of each listed task, ``pending`` when unknown - one lookup each"""
+        with self._locked(exclusive=False):
+            self._refresh()
+            return {
+                task_id: self._tasks[task_id].status if task_id in self._tasks else PENDING
+                for task_id in task_ids
+            }
+
+    def query(
+        self,
+        milestone_id: Optional[str] = None,
+        slice: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> List[TaskStatus]:
+        with self._locked(exclusive=False):
+            self._refresh()
+            return sorted(
+                (
+                    entry for entry in self._tasks.values()
+                    if (milestone_id is None or entry.milestone_id == milestone_id)
+                    and (slice is None or entry.slice == slice)
+                    and (status is None or entry.status == status)
+                ),
+                key=lambda entry: entry.task_id,
+            )
+
+    def compact(self) -> None:
+        with self._locked(exclusive=True):
+            self._refresh()
+            self._compact()
+
+    def _compact(self) -> None:
+        write_json_atomic(self.snapshot_path, {
+            "version": SNAPSHOT_VERSION,
+            "tasks": {task_id: asdict(entry) for task_id, entry in sorted(self._tasks.items())},
+        })
+        with open(self.log_path, "wb"):
+            pass
+        self._snapshot_signature = stat_signature(self.snapshot_path)
+        self._log_offset = 0
+        self._log_events = 0
+
+    def rebuild(self) -> int:
+        """Recreate the index from ``.task_bundles/TASK-*/`` directories"""
+        with self._locked(exclusive=True):
+            entries = [
+                entry for entry in (
+                    infer_bundle_status(bundle)
+                    for bundle in sorted(self.bundles_dir.glob("*-*"))
+                    if bundle.is_dir()
+                )
+                if entry is not None
+            ]
+            self._tasks = {entry.task_id: entry for entry in entries}
+            self._compact()
+        return len(entries)
+
+
+def infer_bundle_status(bundle: Path) -> Optional[TaskStatus]:
+    """Derive a task's status from its bundle's success/failure indicators
+
+    Mirrors the indicators written by the git verification protocol:
+    ``validation_status.txt`` marks failures, while ``bundle_status.yaml``
+    with ``status: completed`` or ``verified_commit_sha.txt`` marks success.
+    The protocol never deletes old indicators, so after a retry the most
+    recently written one wins (success on a tie). Anything else is ambiguous
+    and yields ``in_progress`` so it is never skipped on resume.
+    """
+    milestone_id = slice_name = None
+    for name in BLUEPRINT_NAMES:
+        blueprint = bundle / name
+        if blueprint.is_file():
+            frontmatter = parse_frontmatter(blueprint.read_text(encoding="utf-8"))
+            milestone_id = frontmatter.get("milestone_id")
+            slice_name = frontmatter.get("slice")
+            break
+
+    status, details = _bundle_indicators(bundle)
+    if status is None:
+        return None
+    return TaskStatus(
+        task_id=bundle.name,
+        status=status,
+        milestone_id=milestone_id,
+        slice=slice_name,
+        updated_at=_now(),
+        details=dict(details, rebuilt=True),
+    )
+
+
+def _bundle_indicators(bundle: Path) -> Tuple[Optional[str], Dict[str, Any]]:
+    # (mtime, status, details) per indicator, successes first so they win ties
+    indicators: List[Tuple[int, str, Dict[str, Any]]] = []
+
+    sha_file = bundle / "verified_commit_sha.txt"
+    if sha_file.is_file():
+        sha = sha_file.read_text(encoding="utf-8").strip()
+        indicators.append((sha_file.stat().st_mtime_ns, COMPLETED, {"git_commit_sha": sha}))
+
+    bundle_status = bundle / "bundle_status.yaml"
+    if bundle_status.is_file():
+        text = bundle_status.read_text(encoding="utf-8")
+        try:
+            data: Dict[str, Any] = json.loads(text)
+        except ValueError:
+            data = {}
+            for line in text.splitlines():
+                if ":" in line:
+                    key, value = line.split(":", 1)
+                    data[key.strip()] = value.strip().strip("\"'")
+        state = str(data.get("status", "")).lower()
+        mtime = bundle_status.stat().st_mtime_ns
+        if state == COMPLETED:
+            recorded = data.get("git_commit_sha")
+            indicators.insert(0, (mtime, COMPLETED, {"git_commit_sha": recorded} if recorded else {}))
+        elif state == FAILED:
+            indicators.append((mtime, FAILED, {}))
+
+    validation = bundle / "validation_status.txt"
+    if validation.is_file() and "fail" in validation.read_text(encoding="utf-8").lower():
+        indicators.append((validation.stat().st_mtime_ns, FAILED, {}))
+
+    if indicators:
+        _, status, details = max(indicators, key=lambda indicator: indicator[0])
+        return status, details
+    return (IN_PROGRESS, {}) if any(bundle.iterdir()) else (None, {})
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="sdd-status", description="Query or update the task status index.")
+    parser.add_argument("--workspace", default=".", help="project root containing .task_bundles/")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="record a task status change")
+    record.add_argument("task_id")
+    record.add_argument("status", choices=STATUSES)
+    record.add_argument("--milestone")
+    record.add_argument("--slice")
+
+    query = commands.add_parser("query", help="list tasks, optionally filtered")
+    query.add_argument("--milestone")
+    query.add_argument("--slice")
+    query.add_argument("--status", choices=STATUSES)
+
+    resume = commands.add_parser("resume", help="print the tasks that still need to run, in order")
+    resume.add_argument("task_ids", nargs="+")
+
+    commands.add_parser("compact", help="fold the event log into the snapshot")
+    commands.add_parser("rebuild", help="recreate the index from bundle directories")
+
+    args = parser.parse_args(argv)
+    index = StatusIndex(Path(args.workspace))
+
+    if args.command == "record":
+        index.record(args.task_id, args.status, args.milestone, args.slice)
+    elif args.command == "query":
+        for entry in index.query(args.milestone, args.slice, args.status):
+            print(json.dumps(asdict(entry), sort_keys=True))
+    elif args.command == "resume":
+        statuses = index.statuses(args.task_ids)
+        for task_id in args.task_ids:
+            if statuses[task_id] != COMPLETED:
+                print(task_id)
+    elif args.command == "compact":
+        index.compact()
+    else:
+        print(f"[INFO] Rebuilt status index with {index.rebuild()} tasks", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
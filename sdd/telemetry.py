@@ -0,0 +1,413 @@
+"""
+Per-task performance telemetry
+
+Every assembly line stage (bundling, coding, validation, ...) appends
+compact JSON events to ``.task_bundles/<task>/telemetry.jsonl``, one per
+line, so a milestone run can be broken down by where its time went::
+
+    {"event":"end","stage":"validation","ts":"...","wall_ms":812.4,"peak_rss_kb":40960,...}
+
+Tooling that runs in-process wraps its work in ``measure()``; shell stages use
+``sdd-telemetry run``. Agent stages are recorded by ``sdd-telemetry hook``
+wired into Claude Code's PreToolUse/PostToolUse hooks: launching a sub-agent
+through the Task tool opens its stage, the tool result closes it, and
+Read/Write/Edit calls on the task's bundle files count as file I/O for
+whichever stage is open. Hook recording never fails the workflow.
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import resource
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+TELEMETRY_FILE = "telemetry.jsonl"
+
+# Rough size of a token in English prose and Markdown
+CHARS_PER_TOKEN = 4
+
+# Exit status recorded for a command that cannot be started, as in the shell
+COMMAND_NOT_RUNNABLE = 127
+
+TASK_ID_PATTERN = re.compile(r"\b(?:TASK|SAMPLE)(?:-[A-Z]+)*-\d+\b")
+
+# Sub-agent name fragment -> assembly line stage
+AGENT_STAGES = {
+    "bundler": "bundling",
+    "coder": "coding",
+    "validator": "validation",
+}
+
+# Claude Code file tools -> the counter they increment
+FILE_TOOLS = {
+    "Read": "read_ops",
+    "Write": "write_ops",
+    "Edit": "write_ops",
+    "MultiEdit": "write_ops",
+    "NotebookEdit": "write_ops",
+}
+
+
+@dataclass
+class StageMetrics:
+    """Resource usage of one execution of a stage"""
+
+    stage: str
+    wall_ms: float = 0.0
+    peak_rss_kb: int = 0
+    read_ops: int = 0
+    write_ops: int = 0
+    bundle_bytes: Optional[int] = None
+    tokens: Optional[int] = None
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    def to_event(self) -> Dict[str, Any]:
+        event: Dict[str, Any] = {
+            "event": "end",
+            "stage": self.stage,
+            "wall_ms": round(self.wall_ms, 3),
+            "peak_rss_kb": self.peak_rss_kb,
+            "read_ops": self.read_ops,
+            "write_ops": self.write_ops,
+        }
+        if self.bundle_bytes is not None:
+            event["bundle_bytes"] = self.bundle_bytes
+        if self.tokens is not None:
+            event["tokens"] = self.tokens
+        event.update(self.details)
+        return event
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def _parse_time(stamp: str) -> float:
+    return datetime.strptime(stamp, "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc).timestamp()
+
+
+def _rss_kb(maxrss: int) -> int:
+    # ru_maxrss is in kilobytes on Linux but bytes on macOS
+    return maxrss // 1024 if sys.platform == "darwin" else maxrss
+
+
+def peak_rss_kb(children: bool = False) -> int:
+    """High-water resident set size of this process (or its waited-for children)"""
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    return _rss_kb(resource.getrusage(who).ru_maxrss)
+
+
+def io_counters() -> Tuple[int, int]:
+    """(read, write) operation counts for this process
+
+    Uses the read/write syscall counters from ``/proc/self/io`` where
+    available and falls back to block I/O counts from ``getrusage``.
+    """
+    try:
+        with open("/proc/self/io", "rb") as handle:
+            counters = dict(line.split(b":", 1) for line in handle.read().splitlines() if b":" in line)
+        return int(counters[b"syscr"]), int(counters[b"syscw"])
+    except (OSError, KeyError, ValueError):
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return usage.ru_inblock, usage.ru_oublock
+
+
+def estimate_tokens(size_bytes: int) -> int:
+    return math.ceil(size_bytes / CHARS_PER_TOKEN)
+
+
+def bundle_size(bundle: Path) -> int:
+    """Total bytes of the ``bundle_*.md`` context files in a task bundle"""
+    return sum(path.stat().st_size for path in Path(bundle).glob("bundle_*.md") if path.is_file())
+
+
+@contextmanager
+def measure(stage: str, log: Optional["TelemetryLog"] = None) -> Iterator[StageMetrics]:
+    """Time a block and capture its resource usage
+
+    The yielded metrics can be annotated inside the block (bundle sizes,
+    tokens, details). Peak RSS is the process high-water mark, so stages are
+    only comparable when each runs in a fresh process. The event is appended
+    to ``log`` even if the block raises.
+    """
+    metrics = StageMetrics(stage)
+    reads, writes = io_counters()
+    started = time.perf_counter()
+    try:
+        yield metrics
+    finally:
+        metrics.wall_ms = (time.perf_counter() - started) * 1000
+        end_reads, end_writes = io_counters()
+        metrics.read_ops = end_reads - reads
+        metrics.write_ops = end_writes - writes
+        metrics.peak_rss_kb = peak_rss_kb()
+        if log is not None:
+            log.record(metrics)
+
+
+class TelemetryLog:
+    """Append-only event log of one task"""
+
+    def __init__(self, workspace: Path, task_id: str) -> None:
+        self.bundle = Path(workspace) / ".task_bundles" / task_id
+        self.path = self.bundle / TELEMETRY_FILE
+
+    def append(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Write one event with a single O_APPEND write
+
+        Concurrent writers never interleave within a line. Unlike the status
+        index there is no fsync: losing the tail of a log on power loss is
+        preferable to slowing every stage down.
+        """
+        event = dict(event, ts=event.get("ts") or _now())
+        payload = json.dumps(event, separators=(",", ":"), sort_keys=True).encode("utf-8") + b"\n"
+        self.bundle.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(self.path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+        return event
+
+    def record(self, metrics: StageMetrics) -> Dict[str, Any]:
+        return self.append(metrics.to_event())
+
+    def events(self) -> List[Dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        events = []
+        with open(self.path, "rb") as handle:
+            for raw in handle:
+                if not raw.endswith(b"\n"):
+                    break  # partially written line
+                try:
+                    events.append(json.loads(raw))
+                except ValueError:
+                    continue
+        return events
+
+    def open_stage(self) -> Optional[Dict[str, Any]]:
+        """The most recent ``start`` event that has no matching ``end``"""
+        open_starts: List[Dict[str, Any]] = []
+        for event in self.events():
+            if event.get("event") == "start":
+                open_starts.append(event)
+            elif event.get("event") == "end":
+                for index in range(len(open_starts) - 1, -1, -1):
+                    if open_starts[index].get("stage") == event.get("stage"):
+                        del open_starts[index]
+                        break
+        return open_starts[-1] if open_starts else None
+
+    def start(self, stage: str, **details: Any) -> Dict[str, Any]:
+        return self.append(dict(details, event="start", stage=stage))
+
+    def end(self, stage: str, **details: Any) -> Dict[str, Any]:
+        """Close ``stage``, deriving wall time from its start event"""
+        event: Dict[str, Any] = dict(details, event="end", stage=stage, ts=_now())
+        starts = [
+            entry for entry in self.events()
+            if entry.get("event") == "start" and entry.get("stage") == stage
+        ]
+        if starts and "wall_ms" not in event:
+            elapsed = _parse_time(event["ts"]) - _parse_time(starts[-1]["ts"])
+            event["wall_ms"] = round(max(elapsed, 0.0) * 1000, 3)
+        if self.bundle.is_dir() and "bundle_bytes" not in event:
+            size = bundle_size(self.bundle)
+            event["bundle_bytes"] = size
+            event.setdefault("bundle_tokens", estimate_tokens(size))
+        return self.append(event)
+
+
+def summarize(events: Sequence[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Per-stage totals: runs, wall time, I/O counts, peak RSS and sizes"""
+    stages: Dict[str, Dict[str, Any]] = {}
+    for event in events:
+        kind = event.get("event")
+        if kind not in ("end", "io"):
+            continue
+        totals = stages.setdefault(event.get("stage") or "unattributed", {
+            "runs": 0, "wall_ms": 0.0, "read_ops": 0, "write_ops": 0, "peak_rss_kb": 0,
+        })
+        if kind == "io":
+            totals[event["op"]] = totals.get(event["op"], 0) + 1
+            continue
+        totals["runs"] += 1
+        totals["wall_ms"] = round(totals["wall_ms"] + event.get("wall_ms", 0.0), 3)
+        totals["read_ops"] += event.get("read_ops", 0)
+        totals["write_ops"] += event.get("write_ops", 0)
+        totals["peak_rss_kb"] = max(totals["peak_rss_kb"], event.get("peak_rss_kb", 0))
+        for key in ("bundle_bytes", "bundle_tokens", "tokens"):
+            if key in event:
+                totals[key] = max(totals.get(key, 0), event[key])
+    return stages
+
+
+def stage_for_agent(agent: str) -> str:
+    """``coder-specialist`` -> ``coding``; unknown agents keep their name"""
+    for fragment, stage in AGENT_STAGES.items():
+        if fragment in agent:
+            return stage
+    return agent[: -len("-specialist")] if agent.endswith("-specialist") else agent
+
+
+def task_id_for_hook(data: Dict[str, Any]) -> Optional[str]:
+    """Find the task a hook event belongs to in its tool input or cwd"""
+    tool_input = data.get("tool_input") or {}
+    candidates = [str(tool_input.get(key, "")) for key in ("file_path", "notebook_path", "description", "prompt")]
+    candidates.append(str(data.get("cwd", "")))
+    for text in candidates:
+        match = TASK_ID_PATTERN.search(text)
+        if match:
+            return match.group(0)
+    return None
+
+
+def _response_tokens(response: Any) -> Optional[int]:
+    if not isinstance(response, dict):
+        return None
+    if isinstance(response.get("totalTokens"), int):
+        return int(response["totalTokens"])
+    usage = response.get("usage")
+    if isinstance(usage, dict):
+        counts = [value for key, value in usage.items() if key.endswith("_tokens") and isinstance(value, int)]
+        return sum(counts) if counts else None
+    return None
+
+
+def record_hook_event(
+    data: Dict[str, Any],
+    workspace: Path,
+    task_id: Optional[str] = None,
+    stage: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """Translate one Claude Code hook payload into a telemetry event
+
+    Returns the event written, or ``None`` when the payload is not
+    relevant or cannot be attributed to a task.
+    """
+    task_id = task_id or os.environ.get("SDD_TASK_ID") or task_id_for_hook(data)
+    if not task_id:
+        return None
+    log = TelemetryLog(workspace, task_id)
+    hook = data.get("hook_event_name")
+    tool = data.get("tool_name")
+    tool_input = data.get("tool_input") or {}
+
+    if tool == "Task" or hook == "SubagentStop":
+        stage = stage or stage_for_agent(str(tool_input.get("subagent_type") or "agent"))
+        if hook == "PreToolUse":
+            return log.start(stage)
+        if hook in ("PostToolUse", "SubagentStop"):
+            tokens = _response_tokens(data.get("tool_response"))
+            return log.end(stage, **({"tokens": tokens} if tokens is not None else {}))
+        return None
+
+    if hook == "PostToolUse" and tool in FILE_TOOLS:
+        open_stage = log.open_stage()
+        return log.append({
+            "event": "io",
+            "op": FILE_TOOLS[tool],
+            "stage": stage or (open_stage["stage"] if open_stage else None),
+        })
+    return None
+
+
+def run_command(log: TelemetryLog, stage: str, command: Sequence[str]) -> int:
+    """Run a shell stage and record its wall time and child resource usage
+
+    I/O counts for commands are block reads/writes from ``getrusage``; the
+    syscall counters ``measure()`` uses are not available for children.
+    A command that cannot be started is recorded with the shell's exit code
+    127.
+    """
+    before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    started = time.perf_counter()
+    try:
+        returncode = subprocess.call(list(command))
+    except OSError as error:
+        print(f"[ERROR] Cannot run {command[0]}: {error.strerror or error}", file=sys.stderr)
+        returncode = COMMAND_NOT_RUNNABLE
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    metrics = StageMetrics(
+        stage,
+        wall_ms=(time.perf_counter() - started) * 1000,
+        peak_rss_kb=_rss_kb(after.ru_maxrss),
+        read_ops=after.ru_inblock - before.ru_inblock,
+        write_ops=after.ru_oublock - before.ru_oublock,
+        details={"exit_code": returncode},
+    )
+    if log.bundle.is_dir():
+        metrics.bundle_bytes = bundle_size(log.bundle)
+        metrics.details["bundle_tokens"] = estimate_tokens(metrics.bundle_bytes)
+    log.record(metrics)
+    return returncode
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="sdd-telemetry", description="Record and report per-task stage telemetry.")
+    parser.add_argument("--workspace", help="project root containing .task_bundles/ (default: current directory)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    hook = commands.add_parser("hook", help="record a Claude Code hook event read from stdin")
+    hook.add_argument("--task", help="task ID (default: $SDD_TASK_ID or inferred from the event)")
+    hook.add_argument("--stage", help="stage name (default: derived from the sub-agent)")
+
+    run = commands.add_parser("run", help="run a command as a measured stage and exit with its status")
+    run.add_argument("task_id")
+    run.add_argument("stage")
+    run.add_argument("cmd", nargs=argparse.REMAINDER, metavar="-- COMMAND")
+
+    show = commands.add_parser("show", help="print per-stage totals for a task")
+    show.add_argument("task_id")
+    show.add_argument("--json", action="store_true", help="print the totals as JSON")
+
+    args = parser.parse_args(argv)
+    if args.command == "hook":
+        # Hooks run from the project directory Claude Code exports; they are
+        # for observability only and must never block or fail the workflow
+        workspace = Path(args.workspace or os.environ.get("CLAUDE_PROJECT_DIR") or ".")
+        try:
+            record_hook_event(json.load(sys.stdin), workspace, args.task, args.stage)
+        except Exception as error:
+            print(f"[WARN] Telemetry hook error: {error}", file=sys.stderr)
+        return 0
+
+    workspace = Path(args.workspace or ".")
+    if args.command == "run":
+        command = args.cmd[1:] if args.cmd[:1] == ["--"] else args.cmd
+        if not command:
+            parser.error("run needs a command after '--'")
+        return run_command(TelemetryLog(workspace, args.task_id), args.stage, command)
+
+    log = TelemetryLog(workspace, args.task_id)
+    stages = summarize(log.events())
+    if not stages:
+        print(f"[ERROR] No telemetry recorded for {args.task_id}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(stages, indent=2, sort_keys=True))
+        return 0
+    for stage, totals in sorted(stages.items(), key=lambda item: -item[1]["wall_ms"]):
+        # Agent stages run outside any process we can measure: no RSS
+        rss = f"  peak_rss={totals['peak_rss_kb']} KB" if totals["peak_rss_kb"] else ""
+        sizes = f"  bundle={totals['bundle_bytes']} bytes" if "bundle_bytes" in totals else ""
+        tokens = f"  tokens={totals['tokens']}" if "tokens" in totals else ""
+        print(
+            f"{stage:<14} {totals['wall_ms']:>10.1f} ms  runs={totals['runs']}"
+            f"  reads={totals['read_ops']} writes={totals['write_ops']}{rss}{sizes}{tokens}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+"""
+sdd-validate: parallel, incremental template compliance runner
+
+Discovers every document governed by a template under the given roots
+(``specs/`` and ``project_sdd_on_claude/`` by default), skips documents whose
+content and governing template are unchanged since the last run, and shards
+the rest across a process pool sized to the core count.
+
+Previous results live in a content-hash manifest under
+``~/.sdd/cache/validate/``. ``--changed-since <rev>`` restricts the run to
+files reported by ``git diff --name-only <rev>``; a changed template pulls in
+every document it governs.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from sdd.blueprints import stat_signature
+from sdd.cache import cache_dir, sha256_bytes, sha256_file, write_json_atomic
+from sdd.compliance import RULES_VERSION, ComplianceReport, Finding, TemplateRegistry
+
+DEFAULT_ROOTS = ("specs", "project_sdd_on_claude")
+DEFAULT_TEMPLATES = Path("specs") / "templates"
+
+# Below this many documents the process pool costs more than it saves
+MIN_PARALLEL_DOCUMENTS = 32
+
+MANIFEST_VERSION = 1
+
+# Finding for a document whose check raised; never cached in the manifest
+CHECK_ERROR = "document.error"
+
+
+@dataclass
+class ValidationRun:
+    """Outcome of one sdd-validate invocation"""
+
+    reports: List[Dict[str, Any]] = field(default_factory=list)
+    validated: int = 0
+    cached: int = 0
+
+    @property
+    def failed(self) -> List[Dict[str, Any]]:
+        return [report for report in self.reports if not report["passed"]]
+
+
+def discover(roots: Iterable[Path], registry: TemplateRegistry) -> List[Path]:
+    """All governed documents under ``roots``, sorted for stable sharding"""
+    documents: Set[Path] = set()
+    for root in roots:
+        if root.is_file():
+            candidates: Iterable[Path] = [root]
+        else:
+            candidates = root.rglob("*")
+        for path in candidates:
+            if path.is_file() and registry.template_for(path) is not None:
+                documents.add(path)
+    return sorted(documents)
+
+
+def changed_since(rev: str, repo_root: Path) -> List[Path]:
+    """Files changed between ``rev`` and the working tree, per git"""
+    result = subprocess.run(
+        ["git", "diff", "--name-only", rev, "--"],
+        cwd=str(repo_root),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"git diff against {rev} failed: {result.stderr.strip()}")
+    untracked = subprocess.run(
+        ["git", "ls-files", "--others", "--exclude-standard"],
+        cwd=str(repo_root),
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    names = result.stdout.splitlines() + untracked.stdout.splitlines()
+    return [repo_root / name for name in names if name]
+
+
+def _validate_shard(templates_dir: str, paths: List[str]) -> List[Dict[str, Any]]:
+    """Worker entry point: check a shard of documents in one process"""
+    registry = TemplateRegistry(Path(templates_dir))
+    reports = []
+    for path in paths:
+        try:
+            report = registry.check(Path(path))
+        except Exception as error:  # one bad document must not sink the shard
+            template = registry.template_for(Path(path))
+            report = ComplianceReport(
+                path=Path(path),
+                template=template.name if template else "",
+                template_version="",
+                findings=[Finding(CHECK_ERROR, f"Check failed: {type(error).__name__}: {error}")],
+            )
+        if report is not None:
+            reports.append(report.to_dict())
+    return reports
+
+
+def _shards(paths: List[str], count: int) -> List[List[str]]:
+    return [paths[index::count] for index in range(count) if paths[index::count]]
+
+
+class Manifest:
+    """Content-hash manifest of previous validation results"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError:
+                data = {}
+            if data.get("version") == MANIFEST_VERSION and data.get("rules_version") == RULES_VERSION:
+                self.entries = data.get("entries", {})
+
+    @classmethod
+    def for_repository(cls, repo_root: Path) -> "Manifest":
+        key = sha256_bytes(str(repo_root.resolve()).encode("utf-8"))[:16]
+        return cls(cache_dir("validate") / f"{key}.json")
+
+    def content_hash(self, path: Path) -> str:
+        """Hash of ``path``, reusing the stored hash while mtime/size are unchanged"""
+        signature = list(stat_signature(path))
+        entry = self.entries.get(str(path))
+        if entry is not None and entry.get("signature") == signature:
+            return str(entry["hash"])
+        return sha256_file(path)
+
+    def lookup(self, path: Path, content_hash: str, template_hash: str) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(str(path))
+        if entry and entry["hash"] == content_hash and entry["template_hash"] == template_hash:
+            return dict(entry["report"])
+        return None
+
+    def record(self, path: Path, content_hash: str, template_hash: str, report: Dict[str, Any]) -> None:
+        self.entries[str(path)] = {
+            "signature": list(stat_signature(path)),
+            "hash": content_hash,
+            "template_hash": template_hash,
+            "report": report,
+        }
+
+    def save(self) -> None:
+        self.entries = {name: entry for name, entry in self.entries.items() if Path(name).exists()}
+        write_json_atomic(self.path, {
+            "version": MANIFEST_VERSION,
+            "rules_version": RULES_VERSION,
+            "entries": self.entries,
+        })
+
+
+def run(
+    documents: Sequence[Path],
+    templates_dir: Path,
+    manifest: Optional[Manifest] = None,
+    jobs: Optional[int] = None,
+) -> ValidationRun:
+    """Validate ``documents``, reusing manifest results where possible"""
+    registry = TemplateRegistry(templates_dir)
+    outcome = ValidationRun()
+    template_hashes: Dict[Path, str] = {}
+    pending: Dict[str, Any] = {}
+
+    for path in documents:
+        path = path.resolve()
+        template = registry.template_for(path)
+        if template is None:
+            continue
+        if template not in template_hashes:
+            template_hashes[template] = sha256_file(template)
+        if manifest is None:
+            pending[str(path)] = (None, template_hashes[template])
+            continue
+        content_hash = manifest.content_hash(path)
+        cached = manifest.lookup(path, content_hash, template_hashes[template])
+        if cached is not None:
+            outcome.reports.append(cached)
+            outcome.cached += 1
+        else:
+            pending[str(path)] = (content_hash, template_hashes[template])
+
+    paths = sorted(pending)
+    workers = max(1, min(jobs or os.cpu_count() or 1, len(paths)))
+    if workers == 1 or len(paths) < MIN_PARALLEL_DOCUMENTS:
+        fresh = _validate_shard(str(templates_dir), paths)
+    else:
+        fresh = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_validate_shard, str(templates_dir), shard)
+                for shard in _shards(paths, workers)
+            ]
+            for future in futures:
+                fresh.extend(future.result())
+
+    for report in fresh:
+        content_hash, template_hash = pending[report["path"]]
+        errored = any(finding["rule_id"] == CHECK_ERROR for finding in report["findings"])
+        if manifest is not None and not errored:
+            manifest.record(Path(report["path"]), content_hash, template_hash, report)
+    outcome.reports.extend(fresh)
+    outcome.validated = len(fresh)
+    outcome.reports.sort(key=lambda report: report["path"])
+
+    if manifest is not None:
+        manifest.save()
+    return outcome
+
+
+def _select_documents(args: argparse.Namespace, registry: TemplateRegistry) -> List[Path]:
+    repo_root = Path(args.repo_root).resolve()
+    roots = [repo_root / root for root in (args.paths or DEFAULT_ROOTS)]
+    documents = discover(roots, registry)
+    if args.changed_since is None:
+        return documents
+
+    changed = {path.resolve() for path in changed_since(args.changed_since, repo_root)}
+    changed_templates = {
+        path.name for path in changed if path.parent == registry.templates_dir.resolve()
+    }
+    return [
+        path for path in documents
+        if path.resolve() in changed
+        or (registry.template_for(path) or Path()).name in changed_templates
+    ]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="sdd-validate",
+        description="Validate SDD specification documents against their templates.",
+    )
+    parser.add_argument("paths", nargs="*", help="files or directories (default: specs/ project_sdd_on_claude/)")
+    parser.add_argument("--repo-root", default=".", help="repository root (default: current directory)")
+    parser.add_argument("--templates", help="templates directory (default: <repo-root>/specs/templates)")
+    parser.add_argument("--changed-since", metavar="REV", help="only validate files changed since a git revision")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the result manifest")
+    parser.add_argument("--json", action="store_true", help="print structured per-file reports")
+    args = parser.parse_args(argv)
+
+    repo_root = Path(args.repo_root).resolve()
+    templates_dir = Path(args.templates) if args.templates else repo_root / DEFAULT_TEMPLATES
+    if not templates_dir.is_dir():
+        print(f"[ERROR] Templates directory not found: {templates_dir}", file=sys.stderr)
+        return 2
+
+    missing = [path for path in args.paths if not (repo_root / path).exists()]
+    if missing:
+        print(f"[ERROR] Path not found: {', '.join(missing)}", file=sys.stderr)
+        return 2
+
+    registry = TemplateRegistry(templates_dir)
+    try:
+        documents = _select_documents(args, registry)
+    except RuntimeError as error:
+        print(f"[ERROR] {error}", file=sys.stderr)
+        return 2
+
+    manifest = None if args.no_cache else Manifest.for_repository(repo_root)
+    outcome = run(documents, templates_dir, manifest, args.jobs)
+
+    if args.json:
+        print(json.dumps(outcome.reports, indent=2))
+    else:
+        for report in outcome.failed:
+            print(f"[FAIL] {os.path.relpath(report['path'], repo_root)}")
+            for finding in report["findings"]:
+                line = f":{finding['line']}" if finding["line"] else ""
+                print(f"  - {finding['message']}{line}")
+        print(
+            f"[INFO] {len(outcome.reports)} documents checked "
+            f"({outcome.validated} validated, {outcome.cached} from cache), "
+            f"{len(outcome.failed)} failed"
+        )
+    return 1 if outcome.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
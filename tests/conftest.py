@@ -0,0 +1,16 @@
+"""Shared pytest fixtures for the SDD test suite"""
+
+from pathlib import Path
+
+import pytest
+
+from sdd.blueprints import BlueprintCorpus, load_corpus
+
+PROJECT_DIR = Path(__file__).parent.parent
+SAMPLE_TASKS_DIR = PROJECT_DIR / "project_sdd_on_claude" / "sample_tasks"
+
+
+@pytest.fixture(scope="session")
+def sample_blueprint_corpus() -> BlueprintCorpus:
+    """Every SAMPLE-*.md blueprint, read and parsed once per test session"""
+    return load_corpus(SAMPLE_TASKS_DIR, "SAMPLE-*.md")
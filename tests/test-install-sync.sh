@@ -0,0 +1,261 @@
+#!/bin/bash
+# Test Suite for the install.sh sync engine
+#
+# Installs a fixture checkout into an isolated TEST_HOME and verifies the
+# up-front install plan, dry-run/diff output, the lockfile that makes
+# unchanged re-runs a no-op, downgrade protection and source validation.
+
+set -euo pipefail
+
+# Test configuration
+readonly TEST_BASE_DIR="/tmp/sdd-install-sync-tests"
+readonly FIXTURE_REPO="$TEST_BASE_DIR/repo"
+readonly TEST_INSTALL_HOME="$TEST_BASE_DIR/home"
+readonly TESTS_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+readonly SCRIPT_DIR="$(dirname "$TESTS_DIR")"
+
+# A no-op re-install must finish within this budget
+readonly NOOP_BUDGET_MS="${SDD_NOOP_BUDGET_MS:-100}"
+
+# Color codes
+readonly RED='\033[0;31m'
+readonly GREEN='\033[0;32m'
+readonly YELLOW='\033[1;33m'
+readonly BLUE='\033[0;34m'
+readonly NC='\033[0m'
+
+# Test results tracking
+declare -i TESTS_PASSED=0
+declare -i TESTS_FAILED=0
+declare -a FAILED_TESTS=()
+
+# Logging functions
+log_info() { echo -e "${GREEN}[INFO]${NC} $*"; }
+log_warn() { echo -e "${YELLOW}[WARN]${NC} $*"; }
+log_error() { echo -e "${RED}[ERROR]${NC} $*"; }
+log_debug() { echo -e "${BLUE}[DEBUG]${NC} $*"; }
+
+# Test assertion functions
+assert_success() {
+    local test_name="$1"
+    local exit_code="${2:-0}"
+
+    if [[ "$exit_code" -eq 0 ]]; then
+        log_info "✓ $test_name"
+        TESTS_PASSED+=1
+    else
+        log_error "✗ $test_name (exit code: $exit_code)"
+        FAILED_TESTS+=("$test_name")
+        TESTS_FAILED+=1
+    fi
+}
+
+# Run a command and record whether it succeeded
+assert_command() {
+    local test_name="$1"
+    shift
+
+    if "$@"; then
+        assert_success "$test_name"
+    else
+        assert_success "$test_name" 1
+    fi
+}
+
+assert_equal() {
+    local expected="$1"
+    local actual="$2"
+    local test_name="$3"
+
+    if [[ "$expected" == "$actual" ]]; then
+        assert_success "$test_name"
+    else
+        log_error "  expected '$expected', got '$actual'"
+        assert_success "$test_name" 1
+    fi
+}
+
+# Run the fixture's install.sh against the isolated home
+run_install() {
+    TEST_HOME="$TEST_INSTALL_HOME" bash "$FIXTURE_REPO/install.sh" "$@" > "$TEST_BASE_DIR/install.log" 2>&1
+}
+
+# Path, mtime and size of every installed file plus the lockfile
+installed_state() {
+    find "$TEST_INSTALL_HOME" -type f -exec stat -c '%n %Y %s' {} + 2>/dev/null | sort
+}
+
+# Milliseconds since the epoch (bash 5 EPOCHREALTIME, else GNU date)
+now_ms() {
+    if [[ -n "${EPOCHREALTIME:-}" ]]; then
+        local now="${EPOCHREALTIME/[,.]/}"
+        echo $(( ${now:0:${#now}-3} ))
+    else
+        echo $(( $(date +%s%N) / 1000000 ))
+    fi
+}
+
+# Build a checkout with templates, commands, agents and hooks
+create_fixture_repo() {
+    log_info "Creating fixture repository..."
+
+    mkdir -p "$FIXTURE_REPO/specs" "$FIXTURE_REPO/.claude/commands" \
+        "$FIXTURE_REPO/.claude/agents" "$FIXTURE_REPO/.claude/hooks/lib" \
+        "$FIXTURE_REPO/.claude/hooks/sounds"
+    cp "$SCRIPT_DIR/install.sh" "$FIXTURE_REPO/"
+    cp -r "$SCRIPT_DIR/specs/templates" "$FIXTURE_REPO/specs/"
+
+    local name
+    for name in init_greenfield plan_milestone task; do
+        printf -- '---\ndescription: Run /%s\nversion: "1.0.0"\n---\n# /%s\n' "$name" "$name" \
+            > "$FIXTURE_REPO/.claude/commands/$name.md"
+    done
+    for name in architecture-specialist coder-specialist validator-specialist; do
+        printf -- '---\nname: %s\nversion: 1.2.0\n---\n' "$name" > "$FIXTURE_REPO/.claude/agents/$name.md"
+    done
+    printf -- '---\nversion: 1.0.0\n---\n# Hooks\n' > "$FIXTURE_REPO/.claude/hooks/README.md"
+    echo "print('session')" > "$FIXTURE_REPO/.claude/hooks/sdd-session-logger.py"
+    echo "NOTIFY = True" > "$FIXTURE_REPO/.claude/hooks/lib/notification_system.py"
+    echo "RIFF" > "$FIXTURE_REPO/.claude/hooks/sounds/success.wav"
+}
+
+# Fresh install copies everything and writes the lockfile
+test_fresh_install() {
+    log_info "=== Fresh install ==="
+
+    assert_command "Fresh install succeeds" run_install
+    assert_command "Templates installed" test -f "$TEST_INSTALL_HOME/.sdd/templates/5_Task_Blueprint_Template.md"
+    assert_command "Hook libraries installed" test -f "$TEST_INSTALL_HOME/.claude/hooks/lib/notification_system.py"
+    assert_command "Hook scripts are executable" test -x "$TEST_INSTALL_HOME/.claude/hooks/sdd-session-logger.py"
+    assert_command "Lockfile written" test -f "$TEST_INSTALL_HOME/.sdd/install.lock"
+    assert_command "Lockfile records versions" \
+        grep -q "agents/coder-specialist.md.*1.2.0" "$TEST_INSTALL_HOME/.sdd/install.lock"
+}
+
+# Re-running with nothing changed touches nothing and is fast
+test_noop_reinstall() {
+    log_info "=== No-op re-install ==="
+    local before after start elapsed
+    before=$(installed_state)
+
+    start=$(now_ms)
+    assert_command "Re-install succeeds" run_install
+    elapsed=$(( $(now_ms) - start ))
+    after=$(installed_state)
+
+    assert_equal "$before" "$after" "No installed file or lockfile modified"
+    assert_command "Reported as up to date" grep -q "already up to date" "$TEST_BASE_DIR/install.log"
+    log_debug "No-op install took ${elapsed}ms (budget ${NOOP_BUDGET_MS}ms)"
+    assert_command "No-op install within ${NOOP_BUDGET_MS}ms" test "$elapsed" -lt "$NOOP_BUDGET_MS"
+}
+
+# Dry run reports the plan with diffs and writes nothing
+test_dry_run_and_diff() {
+    log_info "=== Dry run and diff ==="
+    local agent="$FIXTURE_REPO/.claude/agents/coder-specialist.md"
+    printf -- '---\nname: coder-specialist\nversion: 1.3.0\n---\nUpdated\n' > "$agent"
+    local before
+    before=$(installed_state)
+
+    assert_command "Diff run succeeds" run_install --diff
+    assert_command "Plan lists the update" \
+        grep -q "update   agents/coder-specialist.md v1.2.0 → v1.3.0" "$TEST_BASE_DIR/install.log"
+    assert_command "Diff output included" grep -q "+Updated" "$TEST_BASE_DIR/install.log"
+    assert_equal "$before" "$(installed_state)" "Dry run writes nothing"
+}
+
+# Only changed sources are copied
+test_incremental_update() {
+    log_info "=== Incremental update ==="
+    local template="$TEST_INSTALL_HOME/.sdd/templates/0_Project_Vision_Template.md"
+    local template_state
+    template_state=$(stat -c '%Y %s' "$template")
+
+    assert_command "Update succeeds" run_install
+    assert_command "Changed agent installed" \
+        grep -q "Installed: agents/coder-specialist.md v1.3.0" "$TEST_BASE_DIR/install.log"
+    assert_equal 1 "$(grep -c "Installed:" "$TEST_BASE_DIR/install.log")" "Only one file copied"
+    assert_equal "$template_state" "$(stat -c '%Y %s' "$template")" "Unchanged template untouched"
+}
+
+# Newer local documents are kept; deleted files are restored
+test_downgrade_and_restore() {
+    log_info "=== Downgrade protection and restore ==="
+    local agent="$TEST_INSTALL_HOME/.claude/agents/validator-specialist.md"
+    printf -- '---\nname: validator-specialist\nversion: 9.0.0\n---\n' > "$agent"
+    rm "$TEST_INSTALL_HOME/.claude/commands/task.md"
+
+    assert_command "Install succeeds" run_install
+    assert_command "Downgrade reported" grep -q "Skipping downgrade: agents/validator-specialist.md" "$TEST_BASE_DIR/install.log"
+    assert_command "Newer local agent kept" grep -q "version: 9.0.0" "$agent"
+    assert_command "Deleted command restored" test -f "$TEST_INSTALL_HOME/.claude/commands/task.md"
+
+    assert_command "Follow-up install succeeds" run_install
+    assert_command "Kept file does not trigger work" grep -q "already up to date" "$TEST_BASE_DIR/install.log"
+}
+
+# Commands without a description are not installed
+test_invalid_command_skipped() {
+    log_info "=== Invalid command skipped ==="
+    printf -- '---\nversion: 1.0.0\n---\n# No description\n' > "$FIXTURE_REPO/.claude/commands/broken.md"
+
+    assert_command "Install succeeds" run_install
+    assert_command "Invalid command reported" grep -q "missing required 'description' field: broken.md" "$TEST_BASE_DIR/install.log"
+    assert_command "Invalid command not installed" test ! -e "$TEST_INSTALL_HOME/.claude/commands/broken.md"
+}
+
+# Setup and cleanup
+setup_test_environment() {
+    log_info "Setting up test environment..."
+    rm -rf "$TEST_BASE_DIR"
+    mkdir -p "$TEST_BASE_DIR"
+}
+
+cleanup_test_environment() {
+    rm -rf "$TEST_BASE_DIR"
+}
+
+show_test_results() {
+    echo
+    echo "📊 Install Sync Test Results"
+    echo "============================"
+    echo "  Tests passed: $TESTS_PASSED"
+    echo "  Tests failed: $TESTS_FAILED"
+    echo
+
+    if [[ $TESTS_FAILED -gt 0 ]]; then
+        echo "❌ Failed tests:"
+        for test in "${FAILED_TESTS[@]}"; do
+            echo "  - $test"
+        done
+        echo
+        return 1
+    fi
+    echo "✅ All tests passed!"
+    echo
+    return 0
+}
+
+# Main test execution
+main() {
+    log_info "Starting install.sh sync engine tests..."
+
+    setup_test_environment
+    trap cleanup_test_environment EXIT
+
+    create_fixture_repo
+
+    test_fresh_install
+    test_noop_reinstall
+    test_dry_run_and_diff
+    test_incremental_update
+    test_downgrade_and_restore
+    test_invalid_command_skipped
+
+    show_test_results
+}
+
+# Script entry point
+if [[ "${BASH_SOURCE[0]}" == "${0}" ]]; then
+    main "$@"
+fi
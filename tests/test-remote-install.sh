@@ -0,0 +1,332 @@
+#!/bin/bash
+# Test Suite for manifest-driven remote installation
+#
+# Runs remote-install.sh offline against a local HTTP stand-in (python3
+# http.server) and a local mirror to verify checksum skipping, parallel
+# fetching, resume after an interrupted install, downgrade protection and
+# air-gapped mirror installs.
+
+set -euo pipefail
+
+# Test configuration
+readonly TEST_BASE_DIR="/tmp/sdd-remote-install-tests"
+readonly FIXTURE_REPO="$TEST_BASE_DIR/repo"
+readonly SERVER_LOG="$TEST_BASE_DIR/server.log"
+readonly TESTS_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+readonly SCRIPT_DIR="$(dirname "$TESTS_DIR")"
+readonly INSTALLER="$SCRIPT_DIR/remote-install.sh"
+
+# Color codes
+readonly RED='\033[0;31m'
+readonly GREEN='\033[0;32m'
+readonly YELLOW='\033[1;33m'
+readonly BLUE='\033[0;34m'
+readonly NC='\033[0m'
+
+# Test results tracking
+declare -i TESTS_PASSED=0
+declare -i TESTS_FAILED=0
+declare -a FAILED_TESTS=()
+SERVER_PID=""
+SERVER_URL=""
+
+# Logging functions
+log_info() { echo -e "${GREEN}[INFO]${NC} $*"; }
+log_warn() { echo -e "${YELLOW}[WARN]${NC} $*"; }
+log_error() { echo -e "${RED}[ERROR]${NC} $*"; }
+log_debug() { echo -e "${BLUE}[DEBUG]${NC} $*"; }
+
+# Test assertion functions
+assert_success() {
+    local test_name="$1"
+    local exit_code="${2:-0}"
+
+    if [[ "$exit_code" -eq 0 ]]; then
+        log_info "✓ $test_name"
+        TESTS_PASSED+=1
+    else
+        log_error "✗ $test_name (exit code: $exit_code)"
+        FAILED_TESTS+=("$test_name")
+        TESTS_FAILED+=1
+    fi
+}
+
+# Run a command and record whether it succeeded
+assert_command() {
+    local test_name="$1"
+    shift
+
+    if "$@"; then
+        assert_success "$test_name"
+    else
+        assert_success "$test_name" 1
+    fi
+}
+
+assert_equal() {
+    local expected="$1"
+    local actual="$2"
+    local test_name="$3"
+
+    if [[ "$expected" == "$actual" ]]; then
+        assert_success "$test_name"
+    else
+        log_error "  expected '$expected', got '$actual'"
+        assert_success "$test_name" 1
+    fi
+}
+
+assert_trees_identical() {
+    local source="$1"
+    local installed="$2"
+    local test_name="$3"
+
+    if diff -r "$source" "$installed" >/dev/null 2>&1; then
+        assert_success "$test_name"
+    else
+        assert_success "$test_name" 1
+    fi
+}
+
+# Number of files the stand-in server has served so far
+requests_served() {
+    grep -c '"GET ' "$SERVER_LOG" 2>/dev/null || true
+}
+
+# Run the installer against the HTTP stand-in with an isolated home
+run_installer() {
+    local home="$1"
+    shift
+    TEST_HOME="$home" SDD_RAW_URL="$SERVER_URL" SDD_ALLOW_INSECURE=true \
+        SDD_INTERACTIVE=false bash "$INSTALLER" "$@" > "$home.log" 2>&1
+}
+
+# Run the installer from a local mirror only (no server, no network)
+run_mirror_installer() {
+    local home="$1"
+    local mirror="$2"
+    TEST_HOME="$home" SDD_INTERACTIVE=false \
+        bash "$INSTALLER" --mirror "$mirror" > "$home.log" 2>&1
+}
+
+# Build a repository fixture with every installable file
+create_fixture_repo() {
+    log_info "Creating fixture repository..."
+
+    mkdir -p "$FIXTURE_REPO/specs/templates" "$FIXTURE_REPO/.claude/commands" \
+        "$FIXTURE_REPO/.claude/agents" "$FIXTURE_REPO/.claude/hooks/lib" \
+        "$FIXTURE_REPO/.claude/hooks/sounds"
+    cp "$SCRIPT_DIR"/specs/templates/[0-5]_*_Template.md "$FIXTURE_REPO/specs/templates/"
+
+    local name
+    for name in init_greenfield plan_milestone task; do
+        printf -- '---\nversion: "1.0.0"\n---\n# /%s\n' "$name" > "$FIXTURE_REPO/.claude/commands/$name.md"
+    done
+    for name in architecture bundler coder milestone-planning requirements roadmap task-blueprint validator; do
+        printf -- '---\nname: %s-specialist\nversion: 1.2.0\n---\n' "$name" \
+            > "$FIXTURE_REPO/.claude/agents/$name-specialist.md"
+    done
+    printf -- '---\nversion: 1.0.0\n---\n# Hooks\n' > "$FIXTURE_REPO/.claude/hooks/README.md"
+    for name in session-logger activity-logger performance-tracker session-summary; do
+        echo "print('sdd-$name')" > "$FIXTURE_REPO/.claude/hooks/sdd-$name.py"
+    done
+    echo "NOTIFY = True" > "$FIXTURE_REPO/.claude/hooks/lib/notification_system.py"
+    for name in success error warning progress; do
+        echo "RIFF-$name" > "$FIXTURE_REPO/.claude/hooks/sounds/$name.wav"
+    done
+
+    bash "$INSTALLER" --write-manifest "$FIXTURE_REPO" >/dev/null
+}
+
+# Start python3 http.server on a free local port
+start_server() {
+    local port
+    port=$(python3 -c 'import socket; s = socket.socket(); s.bind(("127.0.0.1", 0)); print(s.getsockname()[1])')
+    (cd "$FIXTURE_REPO" && exec python3 -m http.server --bind 127.0.0.1 "$port") > "$SERVER_LOG" 2>&1 &
+    SERVER_PID=$!
+    SERVER_URL="http""://127.0.0.1:$port"
+
+    local attempt
+    for attempt in 1 2 3 4 5 6 7 8 9 10; do
+        curl -s -o /dev/null "$SERVER_URL/install-manifest.txt" && return 0
+        sleep 0.2
+    done
+    log_error "HTTP stand-in did not start"
+    return 1
+}
+
+stop_server() {
+    if [[ -n "$SERVER_PID" ]]; then
+        kill "$SERVER_PID" 2>/dev/null || true
+        wait "$SERVER_PID" 2>/dev/null || true
+    fi
+}
+
+# Fresh install fetches every file once and matches the source
+test_fresh_install() {
+    log_info "=== Fresh install from HTTP stand-in ==="
+    local home="$TEST_BASE_DIR/fresh"
+
+    assert_command "Fresh install succeeds" run_installer "$home" --jobs 4
+    assert_trees_identical "$FIXTURE_REPO/.claude" "$home/.claude" "Installed files match source"
+    assert_trees_identical "$FIXTURE_REPO/specs/templates" "$home/.sdd/templates" "Templates match source"
+    assert_command "Hook scripts are executable" test -x "$home/.claude/hooks/sdd-session-logger.py"
+    assert_command "Hook libraries are not executable" test ! -x "$home/.claude/hooks/lib/notification_system.py"
+}
+
+# Re-running with nothing changed downloads only the manifest
+test_noop_reinstall() {
+    log_info "=== No-op reinstall ==="
+    local home="$TEST_BASE_DIR/fresh"
+    local before
+    before=$(requests_served)
+
+    assert_command "Reinstall succeeds" run_installer "$home"
+    assert_equal "$((before + 1))" "$(requests_served)" "Only the manifest is fetched"
+    assert_command "Every file reported up to date" grep -q "0 files to install, 27 already up to date" "$home.log"
+}
+
+# A failed install keeps verified downloads; the re-run fetches only the rest
+test_resume_after_failure() {
+    log_info "=== Resume after interrupted install ==="
+    local home="$TEST_BASE_DIR/resume"
+    local command="$FIXTURE_REPO/.claude/commands/task.md"
+    cp "$command" "$TEST_BASE_DIR/task.md.orig"
+    echo "tampered" >> "$command"
+
+    local status=0
+    run_installer "$home" || status=$?
+    assert_equal 1 "$status" "Checksum mismatch aborts the install"
+    assert_command "Mismatch is reported for the tampered file" \
+        grep -q "Checksum verification failed for .*task.md" "$home.log"
+    assert_command "Tampered file is not installed" test ! -e "$home/.claude/commands/task.md"
+
+    cp "$TEST_BASE_DIR/task.md.orig" "$command"
+    local before
+    before=$(requests_served)
+    assert_command "Resumed install succeeds" run_installer "$home"
+    assert_equal "$((before + 2))" "$(requests_served)" "Resume fetches the manifest and the missing file only"
+    assert_trees_identical "$FIXTURE_REPO/.claude" "$home/.claude" "Resumed install matches source"
+    assert_command "Staging cache cleared after success" test ! -d "$home/.sdd/cache/install"
+}
+
+# Locally newer documents are kept
+test_downgrade_protection() {
+    log_info "=== Downgrade protection ==="
+    local home="$TEST_BASE_DIR/fresh"
+    local agent="$home/.claude/agents/coder-specialist.md"
+    printf -- '---\nversion: 9.0.0\n---\n# local\n' > "$agent"
+
+    assert_command "Install with newer local file succeeds" run_installer "$home"
+    assert_command "Newer local agent is not downgraded" grep -q "version: 9.0.0" "$agent"
+}
+
+# Plain HTTP sources are refused unless explicitly allowed
+test_insecure_source_refused() {
+    log_info "=== Insecure source refused ==="
+    local home="$TEST_BASE_DIR/insecure"
+    local status=0
+    TEST_HOME="$home" SDD_RAW_URL="$SERVER_URL" SDD_INTERACTIVE=false \
+        bash "$INSTALLER" > "$home.log" 2>&1 || status=$?
+    assert_equal 1 "$status" "Non-HTTPS source rejected by default"
+}
+
+# A pinned manifest checksum must match
+test_pinned_manifest() {
+    log_info "=== Pinned manifest checksum ==="
+    local home="$TEST_BASE_DIR/pinned"
+    local status=0
+    SDD_MANIFEST_SHA256="$(printf '0%.0s' {1..64})" run_installer "$home" || status=$?
+    assert_equal 1 "$status" "Wrong manifest checksum aborts the install"
+}
+
+# Air-gapped installs from a tarball or a plain directory
+test_mirror_installs() {
+    log_info "=== Mirror installs ==="
+    local tarball="$TEST_BASE_DIR/sdd-mirror.tar.gz"
+    tar -czf "$tarball" -C "$TEST_BASE_DIR" repo
+
+    local home="$TEST_BASE_DIR/mirror-tarball"
+    assert_command "Install from mirror tarball" run_mirror_installer "$home" "file://$tarball"
+    assert_trees_identical "$FIXTURE_REPO/.claude" "$home/.claude" "Tarball install matches source"
+
+    local mirror="$TEST_BASE_DIR/mirror-dir"
+    cp -r "$FIXTURE_REPO" "$mirror"
+    rm "$mirror/install-manifest.txt"
+    home="$TEST_BASE_DIR/mirror-directory"
+    assert_command "Install from mirror directory without manifest" run_mirror_installer "$home" "$mirror"
+    assert_trees_identical "$FIXTURE_REPO/specs/templates" "$home/.sdd/templates" "Directory install matches source"
+}
+
+# Versions published before the manifest still install, unverified
+test_without_manifest() {
+    log_info "=== Source without install manifest ==="
+    local home="$TEST_BASE_DIR/no-manifest"
+    mv "$FIXTURE_REPO/install-manifest.txt" "$TEST_BASE_DIR/install-manifest.txt"
+
+    assert_command "Install without manifest succeeds" run_installer "$home"
+    assert_command "Missing manifest is reported" grep -q "No install-manifest.txt" "$home.log"
+    assert_trees_identical "$FIXTURE_REPO/.claude" "$home/.claude" "Fallback install matches source"
+
+    mv "$TEST_BASE_DIR/install-manifest.txt" "$FIXTURE_REPO/install-manifest.txt"
+}
+
+# Setup and cleanup
+setup_test_environment() {
+    log_info "Setting up test environment..."
+    rm -rf "$TEST_BASE_DIR"
+    mkdir -p "$TEST_BASE_DIR"
+}
+
+cleanup_test_environment() {
+    stop_server
+    rm -rf "$TEST_BASE_DIR"
+}
+
+show_test_results() {
+    echo
+    echo "📊 Remote Install Test Results"
+    echo "=============================="
+    echo "  Tests passed: $TESTS_PASSED"
+    echo "  Tests failed: $TESTS_FAILED"
+    echo
+
+    if [[ $TESTS_FAILED -gt 0 ]]; then
+        echo "❌ Failed tests:"
+        for test in "${FAILED_TESTS[@]}"; do
+            echo "  - $test"
+        done
+        echo
+        return 1
+    fi
+    echo "✅ All tests passed!"
+    echo
+    return 0
+}
+
+# Main test execution
+main() {
+    log_info "Starting manifest-driven remote installation tests..."
+
+    setup_test_environment
+    trap cleanup_test_environment EXIT
+
+    create_fixture_repo
+    start_server
+
+    test_fresh_install
+    test_noop_reinstall
+    test_resume_after_failure
+    test_downgrade_protection
+    test_insecure_source_refused
+    test_pinned_manifest
+    test_mirror_installs
+    test_without_manifest
+
+    show_test_results
+}
+
+# Script entry point
+if [[ "${BASH_SOURCE[0]}" == "${0}" ]]; then
+    main "$@"
+fi
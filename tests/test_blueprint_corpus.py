@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Tests for the cached blueprint corpus loader (sdd.blueprints)
+
+Covers frontmatter/section parsing, read-once caching with mtime/size
+invalidation, and a benchmark showing validation time scales linearly with
+the number of blueprints.
+"""
+
+import os
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from sdd import blueprints
+from sdd.blueprints import BlueprintCorpus, load_corpus, parse_frontmatter, parse_sections
+
+SAMPLE_BLUEPRINT = """---
+id: SAMPLE-BENCH-{n:03d}
+title: "Synthetic blueprint {n}"
+milestone_id: "M1-Bench"
+requirement_id: "REQ-001"
+slice: "Slice 1: Benchmark"
+status: "pending"
+branch: "feature/SAMPLE-BENCH-{n:03d}-synthetic"
+---
+
+## 1. Task Overview & Goal
+
+**What it is:** A synthetic example that demonstrates the corpus loader.
+
+**Goal:** Create and validate a simple blueprint.
+
+## 2. The Contract: Requirements & Test Cases
+
+* **Behavior 1: Successful workflow**
+  * **Given:** A valid input
+  * **When:** The task runs
+  * **Then:** It succeeds
+
+## 3. Context Bundle (Agent-Populated Sibling Files)
+
+* `bundle_architecture.md`
+* `bundle_security.md`
+* `bundle_code_context.md`
+
+## 4. Verification Context
+
+Error handling for malformed input.
+"""
+
+REQUIRED_SECTIONS = [
+    "## 1. Task Overview & Goal",
+    "## 2. The Contract: Requirements & Test Cases",
+    "## 3. Context Bundle (Agent-Populated Sibling Files)",
+    "## 4. Verification Context",
+]
+# Loading and checking one blueprint takes about 0.1 ms on a laptop
+MAX_SECONDS_PER_BLUEPRINT = 0.002
+
+KEYWORDS = ["demonstrates", "example", "valid", "error", "external API", "create"]
+
+
+def write_blueprints(directory: Path, count: int) -> None:
+    for n in range(count):
+        (directory / f"SAMPLE-BENCH-{n:05d}.md").write_text(SAMPLE_BLUEPRINT.format(n=n))
+
+
+def validate(corpus: BlueprintCorpus) -> int:
+    """The same style of checks the sample blueprint tests perform"""
+    failures = 0
+    for blueprint in corpus:
+        if not all(section in blueprint.sections for section in REQUIRED_SECTIONS):
+            failures += 1
+        if not blueprint.frontmatter.get("id"):
+            failures += 1
+        blueprint.count_matching(KEYWORDS)
+    return failures
+
+
+class TestBlueprintParsing(unittest.TestCase):
+    """Frontmatter and section parsing"""
+
+    def test_frontmatter_strips_quotes_and_skips_comments(self):
+        content = '---\nid: TASK-001\ntitle: "Quoted: value"\n# comment: no\nempty:\n---\nbody'
+        self.assertEqual(
+            parse_frontmatter(content),
+            {"id": "TASK-001", "title": "Quoted: value", "empty": None},
+        )
+
+    def test_missing_frontmatter_is_empty(self):
+        self.assertEqual(parse_frontmatter("# No frontmatter\n"), {})
+
+    def test_sections_split_on_numbered_headings(self):
+        sections = parse_sections("intro\n## 1. First\nalpha\n### 1.1 Sub\n## 2. Second\nbeta\n")
+        self.assertEqual(list(sections), ["## 1. First", "## 2. Second"])
+        self.assertIn("### 1.1 Sub", sections["## 1. First"])
+        self.assertEqual(sections["## 2. Second"], "beta")
+
+
+class TestBlueprintCorpus(unittest.TestCase):
+    """Read-once caching and mtime/size invalidation"""
+
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.directory = Path(self._tmp.name)
+        write_blueprints(self.directory, 3)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_records_are_immutable(self):
+        corpus = BlueprintCorpus(self.directory)
+        blueprint = corpus["SAMPLE-BENCH-00000.md"]
+        with self.assertRaises(AttributeError):
+            blueprint.content = "changed"
+        with self.assertRaises(TypeError):
+            blueprint.frontmatter["id"] = "changed"
+
+    def test_unchanged_files_are_not_reread(self):
+        corpus = BlueprintCorpus(self.directory)
+        self.assertEqual(corpus.reads, 3)
+        corpus.refresh()
+        self.assertEqual(corpus.reads, 3)
+
+    def test_modified_file_is_reloaded(self):
+        corpus = BlueprintCorpus(self.directory)
+        path = self.directory / "SAMPLE-BENCH-00001.md"
+        before = corpus["SAMPLE-BENCH-00001.md"]
+        path.write_text(path.read_text() + "\nAppended external API reference\n")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        corpus.refresh()
+        self.assertEqual(corpus.reads, 4)
+        self.assertFalse(before.contains("external API"))
+        self.assertTrue(corpus["SAMPLE-BENCH-00001.md"].contains("external API"))
+
+    def test_deleted_and_added_files_are_tracked(self):
+        corpus = BlueprintCorpus(self.directory)
+        (self.directory / "SAMPLE-BENCH-00000.md").unlink()
+        (self.directory / "SAMPLE-BENCH-99999.md").write_text(SAMPLE_BLUEPRINT.format(n=999))
+
+        corpus.refresh()
+        self.assertNotIn("SAMPLE-BENCH-00000.md", corpus)
+        self.assertIn("SAMPLE-BENCH-99999.md", corpus)
+        self.assertEqual(len(corpus), 3)
+
+    def test_load_corpus_shares_one_cache_per_directory(self):
+        first = load_corpus(self.directory)
+        second = load_corpus(self.directory)
+        self.assertIs(first, second)
+        self.assertEqual(second.reads, 3)
+
+    def test_load_corpus_evicts_least_recently_used(self):
+        blueprints._CORPORA.clear()
+        first = load_corpus(self.directory)
+        for n in range(blueprints.MAX_CACHED_CORPORA):
+            other = self.directory / f"other-{n}"
+            other.mkdir()
+            load_corpus(other)
+            if n == 0:
+                load_corpus(self.directory)
+
+        cached = [directory for directory, _ in blueprints._CORPORA]
+        self.assertEqual(len(cached), blueprints.MAX_CACHED_CORPORA)
+        self.assertNotIn((self.directory / "other-0").resolve(), cached)
+        self.assertIs(load_corpus(self.directory), first)
+
+
+@pytest.mark.slow
+def test_validation_time_scales_linearly(tmp_path):
+    """Benchmark: cold load + validation from 4 to 5,000 blueprints stays linear"""
+    sizes = [4, 500, 5000]
+    per_blueprint = {}
+    for size in sizes:
+        directory = tmp_path / str(size)
+        directory.mkdir()
+        write_blueprints(directory, size)
+
+        start = time.perf_counter()
+        corpus = BlueprintCorpus(directory)
+        assert validate(corpus) == 0
+        elapsed = time.perf_counter() - start
+        per_blueprint[size] = elapsed / size
+        assert elapsed < MAX_SECONDS_PER_BLUEPRINT * size + 0.5, f"{size} blueprints took {elapsed:.2f}s"
+
+        # A warm refresh must not re-read anything
+        corpus.refresh()
+        assert corpus.reads == size
+
+    # Linear growth keeps per-blueprint cost roughly flat; allow generous
+    # headroom for filesystem noise while still catching quadratic behaviour.
+    assert per_blueprint[5000] <= per_blueprint[500] * 3
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed bundle cache (sdd.bundles)
+
+Covers section extraction, cache keys that only depend on referenced
+content, hardlinked bundle assembly, LRU eviction and hit/miss reporting.
+"""
+
+import asyncio
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from sdd.bundles import BundleCache, assemble, extract_section, fragment_key, read_bundle_stats
+from sdd.scheduler import Scheduler, TaskGraph, TaskNode
+
+ARCHITECTURE = """# Architectural Specification
+
+## 5. Sub-Agent Architecture
+
+Agents live in `.claude/agents/`.
+
+```markdown
+## Not a heading
+```
+
+### 5.1 Bundler
+
+Researches context.
+
+## 6. Key Design Patterns & Conventions
+
+Use file-based state.
+"""
+
+
+class TestBundleCache(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.spec = self.root / "2_Architecture.md"
+        self.spec.write_text(ARCHITECTURE)
+        self.code = self.root / "module.py"
+        self.code.write_text("def run():\n    return 1\n")
+        self.cache = BundleCache(self.root / "cache")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def section_ref(self, heading):
+        return f"{self.spec}#{heading}"
+
+    def test_extract_section_by_title_with_or_without_number(self):
+        section = extract_section(ARCHITECTURE, "Sub-Agent Architecture")
+        self.assertTrue(section.startswith("## 5. Sub-Agent Architecture"))
+        self.assertIn("### 5.1 Bundler", section)
+        self.assertIn("## Not a heading", section)
+        self.assertNotIn("Key Design Patterns", section)
+        self.assertEqual(extract_section(ARCHITECTURE, "## 6. Key Design Patterns & Conventions").strip(),
+                         "## 6. Key Design Patterns & Conventions\n\nUse file-based state.")
+        self.assertIsNone(extract_section(ARCHITECTURE, "Missing"))
+
+    def test_key_depends_only_on_referenced_content(self):
+        ref = [self.section_ref("Key Design Patterns & Conventions")]
+        key = fragment_key("architecture", ref, [self.code])
+
+        self.spec.write_text(ARCHITECTURE.replace("Researches context.", "Researches more context."))
+        self.assertEqual(fragment_key("architecture", ref, [self.code]), key)
+
+        self.spec.write_text(ARCHITECTURE.replace("file-based state", "a database"))
+        self.assertNotEqual(fragment_key("architecture", ref, [self.code]), key)
+        self.assertNotEqual(fragment_key("architecture", ref, [self.code], rules_version="2"),
+                            fragment_key("architecture", ref, [self.code]))
+        with self.assertRaises(ValueError):
+            fragment_key("architecture", [self.section_ref("Missing")])
+
+    def test_bundles_share_one_hardlinked_fragment(self):
+        key = fragment_key("architecture", [self.section_ref("Sub-Agent Architecture")])
+        first = self.root / ".task_bundles" / "TASK-001" / "bundle_architecture.md"
+        second = self.root / ".task_bundles" / "TASK-002" / "bundle_architecture.md"
+        builds = []
+
+        def build():
+            builds.append(1)
+            return b"# Architectural Context\n"
+
+        self.assertFalse(self.cache.get_or_build(key, first, build))
+        self.assertTrue(self.cache.get_or_build(key, second, build))
+        self.assertEqual(len(builds), 1)
+        self.assertEqual(os.stat(first).st_ino, os.stat(second).st_ino)
+        self.assertEqual(second.read_bytes(), b"# Architectural Context\n")
+
+        self.assertEqual(read_bundle_stats(first.parent).misses, 1)
+        stats = read_bundle_stats(second.parent)
+        self.assertEqual((stats.hits, stats.misses, stats.bytes_reused), (1, 0, 24))
+
+    def test_assemble_concatenates_fragments(self):
+        self.cache.put("a" * 64, b"part one\n")
+        self.cache.put("b" * 64, b"part two\n")
+        destination = self.root / "bundle" / "bundle_code_context.md"
+        self.assertEqual(assemble(destination, ["a" * 64, "c" * 64], self.cache), ["c" * 64])
+        self.assertFalse(destination.exists())
+        self.assertEqual(assemble(destination, ["a" * 64, "b" * 64], self.cache), [])
+        self.assertEqual(destination.read_text(), "part one\npart two\n")
+
+    def test_lru_eviction_keeps_recently_used_fragments(self):
+        cache = BundleCache(self.root / "small", max_bytes=250)
+        for index, name in enumerate("ab"):
+            path = cache.put(name * 64, b"x" * 100)
+            os.utime(str(path), ns=(index * 10**9, index * 10**9))
+        # "a" is older but used again before the put that overflows the cache
+        self.assertIsNotNone(cache.get("a" * 64))
+        cache.put("c" * 64, b"x" * 100)
+        self.assertIsNotNone(cache.get("a" * 64))
+        self.assertIsNone(cache.get("b" * 64))
+        self.assertIsNotNone(cache.get("c" * 64))
+        self.assertLessEqual(cache.size(), 250)
+
+    def test_scheduler_reports_cache_counters(self):
+        key = "d" * 64
+        cache = self.cache
+        nodes = [
+            TaskNode(task_id, self.spec, "M1", "Slice 1", ())
+            for task_id in ("TASK-001", "TASK-002", "TASK-003")
+        ]
+
+        async def runner(node, bundle, workdir):
+            cache.get_or_build(key, bundle / "bundle_architecture.md", lambda: b"shared\n")
+            return True
+
+        result = asyncio.run(Scheduler(TaskGraph(nodes), self.root).run(runner))
+        self.assertEqual((result.bundle_cache.hits, result.bundle_cache.misses), (2, 1))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
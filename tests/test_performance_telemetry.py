@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tests for stage telemetry (sdd.telemetry) and the benchmark suite (sdd.bench)
+
+Covers measured stages, the append-only per-task event log, Claude Code hook
+recording, synthetic corpora, and baseline regression detection.
+"""
+
+import io
+import json
+import unittest
+from unittest import mock
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from sdd import bench, telemetry
+from sdd.telemetry import TelemetryLog, measure, record_hook_event, summarize
+
+
+def _hook(event, tool, **fields):
+    return dict(fields, hook_event_name=event, tool_name=tool)
+
+
+class TestTelemetry(unittest.TestCase):
+    """Event log, measurement and hook recording"""
+
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.workspace = Path(self._tmp.name)
+        self.log = TelemetryLog(self.workspace, "TASK-001")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_measure_appends_stage_metrics(self):
+        with measure("validation", self.log) as metrics:
+            (self.workspace / "out.txt").write_text("x" * 1000)
+            metrics.bundle_bytes = 1000
+            metrics.tokens = telemetry.estimate_tokens(1000)
+
+        event, = self.log.events()
+        self.assertEqual(event["event"], "end")
+        self.assertEqual(event["stage"], "validation")
+        self.assertGreater(event["wall_ms"], 0)
+        self.assertGreater(event["peak_rss_kb"], 0)
+        self.assertGreaterEqual(event["write_ops"], 1)
+        self.assertEqual(event["tokens"], 250)
+        self.assertEqual(self.log.path, self.workspace / ".task_bundles" / "TASK-001" / "telemetry.jsonl")
+
+    def test_measure_records_failed_stages(self):
+        with self.assertRaises(RuntimeError):
+            with measure("bundling", self.log):
+                raise RuntimeError("boom")
+        self.assertEqual([event["stage"] for event in self.log.events()], ["bundling"])
+
+    def test_partial_lines_are_ignored(self):
+        self.log.start("coding")
+        with open(self.log.path, "a") as handle:
+            handle.write('{"event": "end", "sta')
+        self.assertEqual(len(self.log.events()), 1)
+
+    def test_hook_events_build_agent_stages(self):
+        task = {"subagent_type": "coder-specialist", "prompt": "Implement TASK-001 per its blueprint"}
+        self.assertEqual(record_hook_event(_hook("PreToolUse", "Task", tool_input=task), self.workspace)["event"], "start")
+
+        bundle = self.workspace / ".task_bundles" / "TASK-001"
+        (bundle / "bundle_architecture.md").write_text("a" * 400)
+        read = {"file_path": str(bundle / "bundle_architecture.md")}
+        write = {"file_path": str(bundle / "notes.md")}
+        record_hook_event(_hook("PostToolUse", "Read", tool_input=read), self.workspace)
+        record_hook_event(_hook("PostToolUse", "Edit", tool_input=write), self.workspace)
+
+        end = record_hook_event(
+            _hook("PostToolUse", "Task", tool_input=task, tool_response={"totalTokens": 5120}),
+            self.workspace,
+        )
+        self.assertIn("wall_ms", end)
+        self.assertEqual(end["bundle_bytes"], 400)
+
+        coding = summarize(self.log.events())["coding"]
+        self.assertEqual(coding["runs"], 1)
+        self.assertEqual((coding["read_ops"], coding["write_ops"]), (1, 1))
+        self.assertEqual(coding["tokens"], 5120)
+        self.assertEqual(coding["bundle_tokens"], 100)
+        self.assertIsNone(self.log.open_stage())
+
+    def test_unattributable_hook_events_are_skipped(self):
+        event = _hook("PostToolUse", "Read", tool_input={"file_path": "/etc/hosts"})
+        self.assertIsNone(record_hook_event(event, self.workspace))
+        with mock.patch.dict("os.environ", {"SDD_TASK_ID": "TASK-042"}):
+            self.assertEqual(record_hook_event(event, self.workspace)["op"], "read_ops")
+        self.assertTrue((self.workspace / ".task_bundles" / "TASK-042" / "telemetry.jsonl").exists())
+
+    def test_cli(self):
+        workspace = ["--workspace", str(self.workspace)]
+        with mock.patch("sys.stdin", io.StringIO("not json")), mock.patch("sys.stderr", io.StringIO()):
+            self.assertEqual(telemetry.main(workspace + ["hook"]), 0)
+        self.assertEqual(telemetry.main(workspace + ["run", "TASK-001", "coding", "--", "false"]), 1)
+        self.assertEqual(self.log.events()[-1]["exit_code"], 1)
+        with mock.patch("sys.stderr", io.StringIO()) as errors:
+            missing = ["run", "TASK-001", "validation", "--", "sdd-no-such-command"]
+            self.assertEqual(telemetry.main(workspace + missing), 127)
+        self.assertIn("[ERROR] Cannot run sdd-no-such-command", errors.getvalue())
+        self.assertEqual(self.log.events()[-1]["exit_code"], 127)
+        with mock.patch("sys.stdout", io.StringIO()) as output:
+            self.assertEqual(telemetry.main(workspace + ["show", "TASK-001", "--json"]), 0)
+        self.assertEqual(json.loads(output.getvalue())["coding"]["runs"], 1)
+        with mock.patch("sys.stderr", io.StringIO()):
+            self.assertEqual(telemetry.main(workspace + ["show", "TASK-404"]), 1)
+
+
+class TestBench(unittest.TestCase):
+    """Synthetic corpora, regression detection and baselines"""
+
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_synthetic_corpus(self):
+        corpus = bench.synthesize_corpus(bench.SAMPLE_TASKS_DIR, self.root / "corpus", 6)
+        names = sorted(path.name for path in corpus.iterdir())
+        self.assertEqual(len(names), 6)
+        self.assertTrue(all(name.startswith("TASK-000") for name in names))
+        first = (corpus / names[0]).read_text()
+        self.assertIn("id: TASK-0001", first)
+        self.assertNotIn("SAMPLE-", first.split("---")[1])
+
+    def test_compare_applies_threshold_and_noise_floor(self):
+        baseline = {"corpus/parsing": {"wall_ms": 100.0, "peak_rss_kb": 20000}}
+        within = {"corpus/parsing": {"wall_ms": 120.0, "peak_rss_kb": 21000}}
+        slower = {"corpus/parsing": {"wall_ms": 140.0, "peak_rss_kb": 21000}}
+        self.assertEqual(bench.compare(within, baseline, 0.25), [])
+        regression, = bench.compare(slower, baseline, 0.25)
+        self.assertEqual((regression.metric, regression.baseline, regression.current), ("wall_ms", 100.0, 140.0))
+        self.assertEqual(bench.compare(slower, baseline, 0.5), [])
+
+        tiny = {"corpus/parsing": {"wall_ms": 1.0}}
+        self.assertEqual(bench.compare({"corpus/parsing": {"wall_ms": 4.0}}, tiny), [])
+
+    def test_cli_records_baseline_and_fails_on_regression(self):
+        baseline = self.root / "baseline.json"
+        args = [
+            "--stage", "parsing", "--corpus", str(bench.SAMPLE_TASKS_DIR),
+            "--synthetic", "4", "--repeat", "1", "--baseline", str(baseline),
+        ]
+        with mock.patch("sys.stdout", io.StringIO()):
+            self.assertEqual(bench.main(args), 0)
+        data = json.loads(baseline.read_text())
+        self.assertEqual(sorted(data["results"]), ["sample_tasks/parsing", "synthetic-4/parsing"])
+
+        data["results"]["synthetic-4/parsing"]["peak_rss_kb"] = 1
+        baseline.write_text(json.dumps(data))
+        with mock.patch("sys.stdout", io.StringIO()), mock.patch("sys.stderr", io.StringIO()) as errors:
+            self.assertEqual(bench.main(args), 1)
+        self.assertIn("synthetic-4/parsing: peak_rss_kb regressed", errors.getvalue())
+
+        with mock.patch("sys.stdout", io.StringIO()):
+            self.assertEqual(bench.main(args + ["--update-baseline"]), 0)
+            self.assertEqual(bench.main(args), 0)
+
+    def test_malformed_baseline_is_reported(self):
+        baseline = self.root / "baseline.json"
+        baseline.write_text("[]")
+        with self.assertRaisesRegex(ValueError, "expected a JSON object"):
+            bench.load_baseline(baseline)
+
+        args = ["--stage", "parsing", "--synthetic", "0", "--repeat", "1", "--baseline", str(baseline)]
+        with mock.patch("sys.stderr", io.StringIO()) as errors:
+            self.assertEqual(bench.main(args), 2)
+        self.assertIn("rerun with --update-baseline", errors.getvalue())
+        with mock.patch("sys.stdout", io.StringIO()):
+            self.assertEqual(bench.main(args + ["--update-baseline"]), 0)
+        self.assertIsNotNone(bench.load_baseline(baseline))
+
+    def test_missing_corpus_is_a_usage_error(self):
+        with mock.patch("sys.stderr", io.StringIO()):
+            self.assertEqual(bench.main([
+                "--corpus", str(self.root / "missing"), "--synthetic", "0",
+                "--baseline", str(self.root / "baseline.json"),
+            ]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for the repository index (sdd.index)
+
+Covers Python symbol and markdown section extraction, requirement
+references, incremental rebuilds and the read-only query path.
+"""
+
+import os
+import sqlite3
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from sdd.index import RepositoryIndex, main, markdown_sections, python_symbols
+
+MODULE = '''"""Module"""
+
+LIMIT = 10
+
+
+class Worker:
+    def run(self):
+        def helper():
+            pass
+        return helper
+
+
+async def launch():
+    pass
+'''
+
+BLUEPRINT = """---
+id: TASK-099
+milestone_id: M9
+---
+# Task Blueprint
+
+## 1. Overview
+Implements REQ-009 and NFR-PERF-004.
+
+```
+## not a heading
+```
+
+### 1.1 Details
+See REQ-009 again.
+
+## 2. Scope
+Nothing else.
+"""
+
+
+class TestExtraction(unittest.TestCase):
+    """Parsers used by the index"""
+
+    def test_python_symbols(self):
+        symbols = {(qualname, kind) for _, qualname, kind, _, _ in python_symbols(MODULE)}
+        self.assertIn(("LIMIT", "variable"), symbols)
+        self.assertIn(("Worker", "class"), symbols)
+        self.assertIn(("Worker.run", "method"), symbols)
+        self.assertIn(("Worker.run.<locals>.helper", "function"), symbols)
+        self.assertIn(("launch", "function"), symbols)
+
+    def test_syntax_error_yields_no_symbols(self):
+        self.assertEqual(python_symbols("def broken(:\n"), [])
+
+    def test_markdown_sections_have_line_ranges(self):
+        sections = {title: (level, line, end) for title, _, level, line, end in markdown_sections(BLUEPRINT)}
+        self.assertNotIn("not a heading", sections)
+        self.assertEqual(sections["overview"], (2, 7, 16))
+        self.assertEqual(sections["details"], (3, 14, 16))
+        self.assertEqual(sections["scope"], (2, 17, 18))
+
+
+class TestRepositoryIndex(unittest.TestCase):
+    """Building and querying the SQLite index"""
+
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.root = Path(self._tmp.name) / "repo"
+        (self.root / "pkg").mkdir(parents=True)
+        (self.root / ".git").mkdir()
+        (self.root / "pkg" / "worker.py").write_text(MODULE, encoding="utf-8")
+        (self.root / "TASK-099.md").write_text(BLUEPRINT, encoding="utf-8")
+        (self.root / ".git" / "ignored.py").write_text("IGNORED = 1\n", encoding="utf-8")
+        self.index = RepositoryIndex(Path(self._tmp.name) / "index.sqlite")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_queries(self):
+        stats = self.index.build([self.root])
+        self.assertEqual((stats.scanned, stats.parsed), (2, 2))
+
+        [method] = self.index.find_symbol("Worker.run")
+        self.assertEqual(method["kind"], "method")
+        self.assertTrue(method["path"].endswith("worker.py"))
+        self.assertEqual(len(self.index.find_symbol("run")), 1)
+        self.assertEqual(self.index.find_symbol("IGNORED"), [])
+
+        [section] = self.index.find_section("## 2. Scope", path_suffix="TASK-099.md")
+        self.assertEqual((section["line"], section["end_line"]), (17, 18))
+
+        self.assertEqual([ref["line"] for ref in self.index.find_references("REQ-009")], [8, 15])
+        self.assertEqual(self.index.requirements_for("TASK-099"), ["NFR-PERF-004", "REQ-009"])
+
+    def test_incremental_rebuild(self):
+        self.index.build([self.root])
+        self.assertEqual(self.index.build([self.root]).parsed, 0)
+
+        module = self.root / "pkg" / "worker.py"
+        stat = module.stat()
+        os.utime(str(module), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(self.index.build([self.root]).parsed, 0)  # same content hash
+
+        module.write_text(MODULE.replace("class Worker", "class Runner"), encoding="utf-8")
+        self.assertEqual(self.index.build([self.root]).parsed, 1)
+        self.assertEqual(self.index.find_symbol("Worker"), [])
+        self.assertEqual(len(self.index.find_symbol("Runner.run")), 1)
+
+        (self.root / "TASK-099.md").unlink()
+        stats = self.index.build([self.root])
+        self.assertEqual(stats.removed, 1)
+        self.assertEqual(self.index.find_references("REQ-009"), [])
+
+    def test_queries_are_read_only(self):
+        self.index.build([self.root])
+        connection = self.index._connect(readonly=True)
+        try:
+            with self.assertRaises(sqlite3.OperationalError):
+                connection.execute("DELETE FROM symbols")
+        finally:
+            connection.close()
+
+    def test_cli(self):
+        index_path = str(Path(self._tmp.name) / "cli.sqlite")
+        base = ["--repo-root", str(self.root), "--index", index_path]
+        self.assertEqual(main(base + ["symbol", "Worker"]), 2)
+        self.assertEqual(main(base + ["build", "-j", "1"]), 0)
+        self.assertEqual(main(base + ["symbol", "Worker", "--kind", "class"]), 0)
+        self.assertEqual(main(base + ["section", "Missing"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Tests for the milestone task scheduler (sdd.scheduler)
+
+Covers DAG construction from blueprint frontmatter, cycle detection, critical
+path estimation, bounded concurrent dispatch, failure propagation, resume via
+the status index, external dependencies and per-task git worktrees.
+"""
+
+import asyncio
+import io
+import subprocess
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+from tempfile import TemporaryDirectory
+
+from sdd.blueprints import BlueprintCorpus
+from sdd.scheduler import CommandRunner, CycleError, Scheduler, SKIPPED, TaskGraph, main, parse_depends_on
+from sdd.status import COMPLETED, FAILED, StatusIndex
+
+
+def blueprint(task_id, slice_name, depends_on=None, hours=None, milestone_id="M1"):
+    lines = ["---", f"id: {task_id}", f'milestone_id: "{milestone_id}"', f'slice: "{slice_name}"']
+    if depends_on is not None:
+        lines.append(f"depends_on: [{', '.join(depends_on)}]")
+    lines += ["---", "", "## 1. Task Overview & Goal", ""]
+    if hours is not None:
+        lines.append(f"- **Time Estimate**: {hours} hours (work)")
+    return "\n".join(lines) + "\n"
+
+
+class SchedulerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.workspace = Path(self._tmp.name)
+        self.tasks_dir = self.workspace / "tasks"
+        self.tasks_dir.mkdir()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, task_id, *args, **kwargs):
+        (self.tasks_dir / f"{task_id}_Example.md").write_text(blueprint(task_id, *args, **kwargs))
+
+    def graph(self, milestone_id=None):
+        return TaskGraph.from_blueprints(BlueprintCorpus(self.tasks_dir, "TASK-*.md"), milestone_id)
+
+
+class TestTaskGraph(SchedulerTestCase):
+    """DAG construction and analysis"""
+
+    def test_parse_depends_on(self):
+        self.assertEqual(parse_depends_on("[TASK-001, TASK-002]"), ("TASK-001", "TASK-002"))
+        self.assertEqual(parse_depends_on("SAMPLE-CLI-001"), ("SAMPLE-CLI-001",))
+        self.assertEqual(parse_depends_on("[]"), ())
+        self.assertEqual(parse_depends_on(None), ())
+        with self.assertRaises(ValueError):
+            parse_depends_on("[task-002]")
+        with self.assertRaises(ValueError):
+            parse_depends_on("TASK-001, see notes")
+
+    def test_slices_chain_implicitly_and_depends_on_overrides(self):
+        self.write("TASK-001", "Slice 1")
+        self.write("TASK-002", "Slice 1")
+        self.write("TASK-010", "Slice 2")
+        self.write("TASK-011", "Slice 2", depends_on=[])
+        self.write("TASK-020", "Slice 3", depends_on=["TASK-002", "TASK-010"])
+        graph = self.graph("M1")
+        deps = {task_id: node.depends_on for task_id, node in graph.nodes.items()}
+        self.assertEqual(deps["TASK-002"], ("TASK-001",))
+        self.assertEqual(deps["TASK-011"], ())
+        self.assertEqual(deps["TASK-020"], ("TASK-002", "TASK-010"))
+        self.assertLess(graph.order.index("TASK-002"), graph.order.index("TASK-020"))
+
+    def test_depends_on_block_list(self):
+        self.write("TASK-001", "Slice 1")
+        (self.tasks_dir / "TASK-002_Example.md").write_text(
+            "---\nid: TASK-002\ndepends_on:\n  - TASK-001\n  - \"TASK-003\"\nslice: x\n---\n"
+        )
+        self.write("TASK-003", "Slice 2")
+        self.assertEqual(self.graph().nodes["TASK-002"].depends_on, ("TASK-001", "TASK-003"))
+
+        for depends_on in ("depends_on:", "depends_on:\n  - task-001", "depends_on: [task-001]"):
+            (self.tasks_dir / "TASK-002_Example.md").write_text(f"---\nid: TASK-002\n{depends_on}\n---\n")
+            with self.assertRaises(ValueError) as raised:
+                self.graph()
+            self.assertIn("TASK-002 has an unreadable depends_on", str(raised.exception))
+
+    def test_cycle_is_reported(self):
+        self.write("TASK-001", "Slice 1", depends_on=["TASK-003"])
+        self.write("TASK-002", "Slice 1", depends_on=["TASK-001"])
+        self.write("TASK-003", "Slice 1", depends_on=["TASK-002"])
+        with self.assertRaises(CycleError) as raised:
+            self.graph()
+        self.assertEqual(raised.exception.cycle, ["TASK-001", "TASK-003", "TASK-002", "TASK-001"])
+
+    def test_unknown_dependency_is_rejected(self):
+        self.write("TASK-001", "Slice 1", depends_on=["TASK-999"])
+        with self.assertRaises(ValueError):
+            self.graph()
+
+    def test_other_milestones_are_external_dependencies(self):
+        self.write("TASK-001", "Slice 1")
+        self.write("TASK-010", "Slice 1", depends_on=["TASK-001"], milestone_id="M2")
+        self.write("TASK-011", "Slice 1", milestone_id="M2")
+        graph = self.graph("M2")
+        self.assertEqual(sorted(graph.nodes), ["TASK-010", "TASK-011"])
+        self.assertEqual(graph.external, {"TASK-001": None})
+        self.assertEqual(graph.order, ["TASK-010", "TASK-011"])
+
+    def test_critical_path_uses_time_estimates(self):
+        self.write("TASK-001", "Slice 1", hours=4)
+        self.write("TASK-002", "Slice 1", hours=6)
+        self.write("TASK-010", "Slice 2", hours=3)
+        self.write("TASK-011", "Slice 2", hours=2)
+        graph = self.graph()
+        self.assertEqual(graph.critical_path(), (["TASK-001", "TASK-002"], 10.0))
+        self.assertEqual(graph.total_estimate(), 15.0)
+
+
+class TestScheduler(SchedulerTestCase):
+    """Bounded concurrent execution"""
+
+    def make_milestone(self, slices=3, tasks=20):
+        for n in range(tasks):
+            self.write(f"TASK-{n + 1:03d}", f"Slice {n % slices + 1}")
+
+    def test_independent_slices_run_concurrently(self):
+        self.make_milestone()
+        graph = self.graph()
+        in_flight = []
+        peak = []
+
+        async def runner(node, bundle, workdir):
+            self.assertTrue((bundle / "Task_Blueprint.md").exists())
+            in_flight.append(node.task_id)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.02)
+            in_flight.remove(node.task_id)
+            return True
+
+        start = time.perf_counter()
+        serial = asyncio.run(Scheduler(graph, self.workspace, jobs=1).run(runner))
+        serial_time = time.perf_counter() - start
+        self.assertEqual(max(peak), 1)
+
+        peak.clear()
+        start = time.perf_counter()
+        parallel = asyncio.run(Scheduler(graph, self.workspace, jobs=3).run(runner))
+        parallel_time = time.perf_counter() - start
+
+        self.assertTrue(serial.succeeded and parallel.succeeded)
+        self.assertEqual(max(peak), 3)
+        # 20 tasks over 3 independent slices: the longest slice has 7 tasks
+        self.assertLess(parallel_time, serial_time * 0.6)
+
+    def test_failure_skips_dependents_only(self):
+        self.make_milestone(slices=2, tasks=6)
+
+        async def runner(node, bundle, workdir):
+            return node.task_id != "TASK-003"
+
+        result = asyncio.run(Scheduler(self.graph(), self.workspace, jobs=2).run(runner))
+        self.assertEqual(result.statuses["TASK-003"], FAILED)
+        self.assertEqual(result.statuses["TASK-005"], SKIPPED)
+        self.assertEqual(result.statuses["TASK-006"], COMPLETED)
+        self.assertNotIn("TASK-005", result.started)
+        self.assertFalse(result.succeeded)
+
+    def test_resume_skips_completed_tasks(self):
+        self.make_milestone(slices=1, tasks=3)
+        index = StatusIndex(self.workspace)
+        index.record("TASK-001", COMPLETED, "M1")
+
+        async def runner(node, bundle, workdir):
+            return True
+
+        result = asyncio.run(Scheduler(self.graph(), self.workspace, status_index=index).run(runner))
+        self.assertEqual(result.started, ["TASK-002", "TASK-003"])
+        self.assertEqual(index.statuses(["TASK-003"]), {"TASK-003": COMPLETED})
+
+    def test_runner_errors_are_reported(self):
+        self.write("TASK-001", "Slice 1")
+
+        async def runner(node, bundle, workdir):
+            raise KeyError("print")
+
+        with mock.patch("sys.stderr", io.StringIO()) as errors:
+            result = asyncio.run(Scheduler(self.graph(), self.workspace).run(runner))
+        self.assertEqual(result.statuses, {"TASK-001": FAILED})
+        self.assertIn("TASK-001: runner failed: KeyError", errors.getvalue())
+        run_log = (self.workspace / ".task_bundles" / "TASK-001" / "run.log").read_text()
+        self.assertIn("runner failed: KeyError", run_log)
+
+    def test_command_template_is_checked_before_scheduling(self):
+        self.write("TASK-001", "Slice 1")
+        with self.assertRaisesRegex(ValueError, "literal braces are written"):
+            CommandRunner("awk '{print}' /dev/null")
+        CommandRunner("awk '{{print}}' {blueprint}")
+        with mock.patch("sys.stdout", io.StringIO()), mock.patch("sys.stderr", io.StringIO()) as errors:
+            code = main([str(self.tasks_dir), "--workspace", str(self.workspace), "--command", "echo {task}"])
+        self.assertEqual(code, 2)
+        self.assertIn("Invalid command template", errors.getvalue())
+        self.assertFalse((self.workspace / ".task_bundles").exists())
+
+    def test_command_values_are_shell_quoted(self):
+        workspace = self.workspace / "my project"
+        workspace.mkdir()
+        self.write("TASK-001", "Slice 1")
+        runner = CommandRunner("test -f {blueprint} && test {workdir} -ef . && echo ok > {bundle}/quoted")
+        result = asyncio.run(Scheduler(self.graph(), workspace).run(runner))
+        self.assertTrue(result.succeeded)
+        self.assertTrue((workspace / ".task_bundles" / "TASK-001" / "quoted").exists())
+
+    def test_external_dependencies_wait_for_the_status_index(self):
+        self.write("TASK-001", "Slice 1")
+        self.write("TASK-010", "Slice 1", depends_on=["TASK-001"], milestone_id="M2")
+        self.write("TASK-020", "Slice 2", depends_on=[], milestone_id="M2")
+        index = StatusIndex(self.workspace)
+
+        async def runner(node, bundle, workdir):
+            return True
+
+        result = asyncio.run(Scheduler(self.graph("M2"), self.workspace, status_index=index).run(runner))
+        self.assertEqual(result.statuses, {"TASK-010": SKIPPED, "TASK-020": COMPLETED})
+        self.assertEqual(result.blocked, {"TASK-010": ("TASK-001",)})
+
+        index.record("TASK-001", COMPLETED, "M1")
+        result = asyncio.run(Scheduler(self.graph("M2"), self.workspace, status_index=index).run(runner))
+        self.assertEqual(result.started, ["TASK-010"])
+        self.assertTrue(result.succeeded)
+
+
+class TestWorktrees(SchedulerTestCase):
+    """Per-task git worktrees and branches"""
+
+    def setUp(self):
+        super().setUp()
+        (self.workspace / ".gitignore").write_text(".task_bundles/\ntasks/\n")
+        self.git("init", "-q")
+        self.git("config", "user.name", "t")
+        self.git("config", "user.email", "t@t")
+        self.git("add", "-A")
+        self.git("commit", "-qm", "base")
+
+    def git(self, *args):
+        return subprocess.run(["git", *args], cwd=str(self.workspace), check=True, universal_newlines=True,
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout
+
+    def test_dependents_build_on_upstream_branches(self):
+        self.write("TASK-001", "Slice 1")
+        self.write("TASK-002", "Slice 1")
+        self.write("TASK-010", "Slice 2")
+        self.write("TASK-020", "Slice 3", depends_on=["TASK-002", "TASK-010"])
+
+        # Each task records the work it can see, then commits its own
+        runner = CommandRunner("ls *.done > seen.txt; touch {task_id}.done && git add -A && git commit -qm {task_id}")
+        scheduler = Scheduler(self.graph(), self.workspace, jobs=2, use_worktrees=True)
+        result = asyncio.run(scheduler.run(runner))
+
+        self.assertTrue(result.succeeded, result.statuses)
+        self.assertEqual(self.git("show", "sdd/TASK-002:seen.txt").split(), ["TASK-001.done"])
+        self.assertEqual(
+            self.git("show", "sdd/TASK-020:seen.txt").split(),
+            ["TASK-001.done", "TASK-002.done", "TASK-010.done"],
+        )
+        self.assertFalse((self.workspace / ".task_bundles" / "TASK-020" / "worktree").exists())
+
+    def test_merge_conflict_removes_the_half_merged_worktree(self):
+        self.write("TASK-001", "Slice 1")
+        self.write("TASK-010", "Slice 2")
+        self.write("TASK-020", "Slice 3", depends_on=["TASK-001", "TASK-010"])
+        runner = CommandRunner("echo {task_id} > shared.txt && git add -A && git commit -qm {task_id}")
+        scheduler = Scheduler(self.graph(), self.workspace, use_worktrees=True)
+        with mock.patch("sys.stderr", io.StringIO()) as errors:
+            result = asyncio.run(scheduler.run(runner))
+
+        self.assertEqual(result.statuses["TASK-020"], FAILED)
+        self.assertIn("TASK-020: could not prepare workspace", errors.getvalue())
+        self.assertFalse((self.workspace / ".task_bundles" / "TASK-020" / "worktree").exists())
+        self.assertNotIn("TASK-020", self.git("worktree", "list"))
+        self.assertEqual(self.git("status", "--porcelain", "--untracked-files=no"), "")
+
+    def test_uncommitted_work_keeps_the_worktree(self):
+        self.write("TASK-001", "Slice 1")
+        scheduler = Scheduler(self.graph(), self.workspace, use_worktrees=True)
+        with mock.patch("sys.stderr", io.StringIO()) as errors:
+            result = asyncio.run(scheduler.run(CommandRunner("touch notes.md")))
+
+        self.assertTrue(result.succeeded)
+        self.assertIn("TASK-001 left uncommitted changes", errors.getvalue())
+        self.assertTrue((self.workspace / ".task_bundles" / "TASK-001" / "worktree" / "notes.md").exists())
+
+    def test_command_runner_in_git_worktrees(self):
+        self.write("TASK-001", "Slice 1", depends_on=[])
+        self.write("TASK-002", "Slice 2", depends_on=[])
+
+        scheduler = Scheduler(self.graph(), self.workspace, jobs=2, use_worktrees=True)
+        runner = CommandRunner("test -f .gitignore && echo {task_id} && test {task_id} = TASK-001")
+        result = asyncio.run(scheduler.run(runner))
+
+        bundles = self.workspace / ".task_bundles"
+        self.assertEqual(result.statuses, {"TASK-001": COMPLETED, "TASK-002": FAILED})
+        self.assertIn("TASK-002", (bundles / "TASK-002" / "run.log").read_text())
+        self.assertFalse((bundles / "TASK-001" / "worktree").exists())
+        self.assertTrue((bundles / "TASK-002" / "worktree" / ".gitignore").exists())
+        self.assertEqual(self.git("for-each-ref", "--format=%(refname:short)", "refs/heads/sdd").split(), ["sdd/TASK-001", "sdd/TASK-002"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
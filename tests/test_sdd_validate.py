@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for the sdd-validate runner (sdd.validate)
+
+Covers incremental re-validation through the content-hash manifest, process
+pool sharding and the git-diff-driven --changed-since mode.
+"""
+
+import os
+import shutil
+import subprocess
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from sdd import validate
+from sdd.compliance import TemplateRegistry
+from sdd.validate import Manifest, discover, main, run
+
+PROJECT_DIR = Path(__file__).parent.parent
+TEMPLATES_DIR = PROJECT_DIR / "specs" / "templates"
+
+BLUEPRINT = """---
+id: TASK-{n:03d}
+title: "Task {n}"
+milestone_id: "M1"
+---
+
+# Task Blueprint: [TASK-{n:03d}] Task {n}
+
+## 1. Task Description
+
+## 2. Implementation Guidance
+
+## 3. Success Criteria
+"""
+
+
+class TestSddValidate(unittest.TestCase):
+    """Incremental and parallel validation of a scratch repository"""
+
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        patcher = mock.patch.dict(os.environ, {"SDD_CACHE_DIR": str(self.root / ".cache")})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.templates = self.root / "specs" / "templates"
+        shutil.copytree(str(TEMPLATES_DIR), str(self.templates))
+        self.tasks = self.root / "project" / "tasks"
+        self.tasks.mkdir(parents=True)
+        for n in range(1, 4):
+            self.blueprint(n).write_text(BLUEPRINT.format(n=n))
+        self.registry = TemplateRegistry(self.templates)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def blueprint(self, n):
+        return self.tasks / f"TASK-{n:03d}_Example.md"
+
+    def documents(self):
+        return discover([self.root / "project"], self.registry)
+
+    def test_discover_skips_templates_and_ungoverned_files(self):
+        (self.tasks / "notes.md").write_text("# Notes\n")
+        found = discover([self.root], self.registry)
+        self.assertEqual([path.name for path in found], [self.blueprint(n).name for n in range(1, 4)])
+
+    def test_unchanged_documents_come_from_manifest(self):
+        first = run(self.documents(), self.templates, Manifest.for_repository(self.root))
+        self.assertEqual((first.validated, first.cached), (3, 0))
+        self.assertEqual(first.failed, [])
+
+        self.blueprint(2).write_text(BLUEPRINT.format(n=2).replace("## 3. Success Criteria", ""))
+        second = run(self.documents(), self.templates, Manifest.for_repository(self.root))
+        self.assertEqual((second.validated, second.cached), (1, 2))
+        self.assertEqual([Path(report["path"]).name for report in second.failed], [self.blueprint(2).name])
+
+    def test_template_change_revalidates_governed_documents(self):
+        run(self.documents(), self.templates, Manifest.for_repository(self.root))
+        template = self.templates / "5_Task_Blueprint_Template.md"
+        template.write_text(template.read_text() + "\n## 4. Rollback Plan\n")
+
+        outcome = run(self.documents(), self.templates, Manifest.for_repository(self.root))
+        self.assertEqual(outcome.validated, 3)
+        self.assertEqual(len(outcome.failed), 3)
+
+    def test_process_pool_matches_serial_results(self):
+        for n in range(4, 40):
+            self.blueprint(n).write_text(BLUEPRINT.format(n=n) if n % 5 else "# Broken\n")
+        serial = run(self.documents(), self.templates, jobs=1)
+        with mock.patch.object(validate, "MIN_PARALLEL_DOCUMENTS", 1):
+            parallel = run(self.documents(), self.templates, jobs=2)
+        self.assertEqual(serial.reports, parallel.reports)
+        self.assertEqual(len(parallel.failed), 7)
+
+    def test_check_errors_fail_only_that_document(self):
+        check = TemplateRegistry.check
+
+        def flaky(registry, path):
+            if path.name == self.blueprint(2).name:
+                raise RuntimeError("boom")
+            return check(registry, path)
+
+        with mock.patch.object(TemplateRegistry, "check", autospec=True, side_effect=flaky):
+            outcome = run(self.documents(), self.templates, Manifest.for_repository(self.root))
+        failed, = outcome.failed
+        self.assertEqual(Path(failed["path"]).name, self.blueprint(2).name)
+        self.assertEqual(failed["findings"][0]["rule_id"], validate.CHECK_ERROR)
+        self.assertIn("RuntimeError: boom", failed["findings"][0]["message"])
+
+        # Errors are not cached: the document is checked again next run
+        outcome = run(self.documents(), self.templates, Manifest.for_repository(self.root))
+        self.assertEqual((outcome.validated, outcome.cached), (1, 2))
+        self.assertEqual(outcome.failed, [])
+
+    def test_changed_since_only_checks_git_changes(self):
+        def git(*args):
+            subprocess.run(["git", *args], cwd=str(self.root), check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        git("init", "-q")
+        git("add", "-A")
+        git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "base")
+        self.blueprint(1).write_text("# Broken\n")
+        self.blueprint(4).write_text(BLUEPRINT.format(n=4))
+
+        with mock.patch("builtins.print") as printed:
+            code = main(["--repo-root", str(self.root), "--changed-since", "HEAD", "project"])
+        self.assertEqual(code, 1)
+        summary = printed.call_args_list[-1][0][0]
+        self.assertIn("2 documents checked", summary)
+        self.assertIn("1 failed", summary)
+
+    def test_missing_path_is_a_usage_error(self):
+        with mock.patch("builtins.print") as printed:
+            code = main(["--repo-root", str(self.root), "project", "projetc/tasks"])
+        self.assertEqual(code, 2)
+        self.assertIn("projetc/tasks", printed.call_args[0][0])
+        self.assertEqual(len(printed.call_args_list), 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
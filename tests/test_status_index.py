@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the task status index (sdd.status)
+
+Covers recording and querying, incremental log tailing across instances,
+compaction, concurrent writers, and rebuilding from bundle directories.
+"""
+
+import os
+import unittest
+from unittest import mock
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from sdd.status import COMPLETED, FAILED, IN_PROGRESS, PENDING, StatusIndex, main
+
+
+def _record_many(workspace, prefix, count):
+    index = StatusIndex(Path(workspace))
+    for n in range(count):
+        index.record(f"{prefix}-{n:03d}", COMPLETED, "M1")
+
+
+class TestStatusIndex(unittest.TestCase):
+    """Append-only index behaviour"""
+
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.workspace = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_record_and_query(self):
+        index = StatusIndex(self.workspace)
+        index.record("TASK-031", IN_PROGRESS, "M5", "Slice 1")
+        index.record("TASK-031", COMPLETED)
+        index.record("TASK-032", FAILED, "M5", "Slice 1")
+        index.record("TASK-044", COMPLETED, "M6", "Slice 4")
+
+        self.assertEqual(index.get("TASK-031").status, COMPLETED)
+        self.assertEqual(index.get("TASK-031").milestone_id, "M5")
+        self.assertEqual([entry.task_id for entry in index.query(milestone_id="M5")], ["TASK-031", "TASK-032"])
+        self.assertEqual([entry.task_id for entry in index.query(status=COMPLETED)], ["TASK-031", "TASK-044"])
+        self.assertEqual(
+            index.statuses(["TASK-031", "TASK-032", "TASK-033"]),
+            {"TASK-031": COMPLETED, "TASK-032": FAILED, "TASK-033": PENDING},
+        )
+        with self.assertRaises(ValueError):
+            index.record("TASK-033", "done")
+
+    def test_other_instances_see_appended_events(self):
+        reader = StatusIndex(self.workspace)
+        writer = StatusIndex(self.workspace)
+        writer.record("TASK-001", COMPLETED, "M1")
+        self.assertEqual(reader.get("TASK-001").status, COMPLETED)
+        writer.record("TASK-002", FAILED, "M1")
+        self.assertEqual(len(reader.query(milestone_id="M1")), 2)
+
+    def test_compaction_preserves_state(self):
+        index = StatusIndex(self.workspace, compact_threshold=5)
+        reader = StatusIndex(self.workspace)
+        for n in range(12):
+            index.record(f"TASK-{n:03d}", COMPLETED if n % 2 else FAILED, "M1")
+            reader.get("TASK-000")
+
+        self.assertTrue(index.snapshot_path.exists())
+        self.assertLess(len(index.log_path.read_text().splitlines()), 5)
+        self.assertEqual(len(StatusIndex(self.workspace).query(milestone_id="M1")), 12)
+        self.assertEqual(len(reader.query(status=COMPLETED)), 6)
+
+    def test_concurrent_writers_do_not_lose_events(self):
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            futures = [
+                pool.submit(_record_many, str(self.workspace), f"W{worker}", 25)
+                for worker in range(4)
+            ]
+            for future in futures:
+                future.result()
+        self.assertEqual(len(StatusIndex(self.workspace).query(status=COMPLETED)), 100)
+
+    def test_rebuild_from_bundles(self):
+        bundles = self.workspace / ".task_bundles"
+        done = bundles / "TASK-031"
+        done.mkdir(parents=True)
+        (done / "Task_Blueprint.md").write_text('---\nid: TASK-031\nmilestone_id: "M5"\nslice: "Slice 1"\n---\n')
+        (done / "bundle_status.yaml").write_text('{"status": "completed", "git_commit_sha": "abc123"}')
+        failed = bundles / "TASK-032"
+        failed.mkdir()
+        (failed / "validation_status.txt").write_text("validation_failed\n")
+        partial = bundles / "TASK-033"
+        partial.mkdir()
+        (partial / "bundle_architecture.md").write_text("# partial\n")
+        (bundles / "TASK-034").mkdir()
+
+        index = StatusIndex(self.workspace)
+        self.assertEqual(index.rebuild(), 3)
+        self.assertEqual(index.get("TASK-031").milestone_id, "M5")
+        self.assertEqual(index.get("TASK-031").details["git_commit_sha"], "abc123")
+        self.assertEqual(
+            index.statuses(["TASK-031", "TASK-032", "TASK-033", "TASK-034"]),
+            {"TASK-031": COMPLETED, "TASK-032": FAILED, "TASK-033": IN_PROGRESS, "TASK-034": PENDING},
+        )
+
+    def test_rebuild_uses_the_latest_indicator_after_a_retry(self):
+        bundles = self.workspace / ".task_bundles"
+        retried, regressed = bundles / "TASK-041", bundles / "TASK-042"
+        for bundle in (retried, regressed):
+            bundle.mkdir(parents=True)
+            (bundle / "validation_status.txt").write_text("validation_failed\n")
+            (bundle / "verified_commit_sha.txt").write_text("def456\n")
+        os.utime(retried / "validation_status.txt", (1000, 1000))
+        os.utime(regressed / "verified_commit_sha.txt", (1000, 1000))
+
+        index = StatusIndex(self.workspace)
+        index.rebuild()
+        self.assertEqual(index.statuses(["TASK-041", "TASK-042"]), {"TASK-041": COMPLETED, "TASK-042": FAILED})
+        self.assertEqual(index.get("TASK-041").details["git_commit_sha"], "def456")
+
+    def test_resume_lists_tasks_still_to_run(self):
+        StatusIndex(self.workspace).record("TASK-031", COMPLETED, "M5")
+        with mock.patch("builtins.print") as printed:
+            main(["--workspace", str(self.workspace), "resume", "TASK-031", "TASK-032", "TASK-033"])
+        self.assertEqual([call[0][0] for call in printed.call_args_list], ["TASK-032", "TASK-033"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
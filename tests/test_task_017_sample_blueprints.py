@@ -6,16 +6,23 @@ This test verifies that all 4 sample task blueprints are created correctly
 and follow the exact SDD task blueprint template structure.
 """
 
-import unittest
-import os
 import re
-import json
+import unittest
 from pathlib import Path
 
+import pytest
+
 
 class TestSampleTaskBlueprints(unittest.TestCase):
     """Test that all sample task blueprints are created and properly formatted"""
     
+    BEHAVIOR_PATTERN = re.compile(r'\* \*\*Behavior \d+:.*?\*\*')
+    
+    @pytest.fixture(autouse=True)
+    def _use_corpus(self, sample_blueprint_corpus):
+        """Inject the session-scoped blueprint corpus (each file is read once)"""
+        self.corpus = sample_blueprint_corpus
+
     def setUp(self):
         """Set up test environment"""
         self.project_dir = Path(__file__).parent.parent
@@ -40,11 +47,11 @@ class TestSampleTaskBlueprints(unittest.TestCase):
         # Then: They must cover different development patterns
         
         for filename, category in self.expected_samples.items():
-            file_path = self.sample_tasks_dir / filename
-            self.assertTrue(file_path.exists(), 
+            self.assertIn(filename, self.corpus,
                           f"Sample blueprint {filename} does not exist for {category}")
             
-            content = file_path.read_text()
+            blueprint = self.corpus[filename]
+            content = blueprint.content
             
             # And: Blueprints must follow exact SDD task blueprint template structure
             self.assertIn("## 1. Task Overview & Goal", content)
@@ -59,9 +66,9 @@ class TestSampleTaskBlueprints(unittest.TestCase):
             self.assertIn("Then:", content)
             
             # And: Task scenarios must be appropriate for testing without external dependencies
-            self.assertNotIn("external API", content.lower())
-            self.assertNotIn("database connection", content.lower())
-            self.assertNotIn("network request", content.lower())
+            self.assertFalse(blueprint.contains("external API"))
+            self.assertFalse(blueprint.contains("database connection"))
+            self.assertFalse(blueprint.contains("network request"))
     
     def test_behavior_2_blueprint_quality_and_completeness(self):
         """Test Behavior 2: Each sample blueprint has complete YAML frontmatter and clear descriptions"""
@@ -69,20 +76,12 @@ class TestSampleTaskBlueprints(unittest.TestCase):
         # When: Blueprints are validated for completeness
         
         for filename in self.expected_samples.keys():
-            file_path = self.sample_tasks_dir / filename
-            content = file_path.read_text()
-            
-            # Extract YAML frontmatter
-            yaml_match = re.search(r'^---\n(.*?)\n---', content, re.MULTILINE | re.DOTALL)
-            self.assertIsNotNone(yaml_match, f"No YAML frontmatter found in {filename}")
+            blueprint = self.corpus[filename]
+            content = blueprint.content
             
-            yaml_text = yaml_match.group(1)
-            # Simple YAML parsing for basic key-value pairs (sufficient for our frontmatter)
-            yaml_content = {}
-            for line in yaml_text.strip().split('\n'):
-                if ':' in line and not line.strip().startswith('#'):
-                    key, value = line.split(':', 1)
-                    yaml_content[key.strip()] = value.strip().strip('"\'') if value.strip() else None
+            # Extract YAML frontmatter (parsed once by the corpus loader)
+            yaml_content = blueprint.frontmatter
+            self.assertTrue(yaml_content, f"No YAML frontmatter found in {filename}")
             
             # Then: Each must include all required YAML frontmatter fields with appropriate values
             required_fields = ["id", "title", "milestone_id", "requirement_id", "slice", "status", "branch"]
@@ -95,7 +94,7 @@ class TestSampleTaskBlueprints(unittest.TestCase):
             self.assertIn("**Goal:**", content)
             
             # And: Acceptance criteria must be testable and specific
-            behaviors = re.findall(r'\* \*\*Behavior \d+:.*?\*\*', content)
+            behaviors = self.BEHAVIOR_PATTERN.findall(content)
             self.assertGreaterEqual(len(behaviors), 3, f"At least 3 behaviors required in {filename}")
             
             # And: Context bundle requirements must be realistic and achievable
@@ -108,36 +107,32 @@ class TestSampleTaskBlueprints(unittest.TestCase):
         # Given: The need to validate different workflow paths and failure scenarios
         # When: Sample blueprints are designed
         
-        all_content = ""
-        for filename in self.expected_samples.keys():
-            file_path = self.sample_tasks_dir / filename
-            content = file_path.read_text()
-            all_content += content
+        blueprints = [self.corpus[filename] for filename in self.expected_samples.keys()]
+        
+        def found_anywhere(keyword):
+            return any(blueprint.contains(keyword) for blueprint in blueprints)
         
         # Then: They must include scenarios that test successful workflow execution
-        self.assertIn("successful", all_content.lower())
-        self.assertIn("valid", all_content.lower())
+        self.assertTrue(found_anywhere("successful"))
+        self.assertTrue(found_anywhere("valid"))
         
         # And: Some blueprints must test error handling and recovery workflows
         error_keywords = ["error", "invalid", "failure", "exception", "malformed"]
-        found_error_scenarios = any(keyword in all_content.lower() for keyword in error_keywords)
+        found_error_scenarios = any(found_anywhere(keyword) for keyword in error_keywords)
         self.assertTrue(found_error_scenarios, "No error handling scenarios found in sample blueprints")
         
         # And: Blueprints must cover different complexity levels
         complexity_indicators = ["simple", "complex", "basic", "advanced", "enhanced"]
-        found_complexity_levels = sum(1 for keyword in complexity_indicators if keyword in all_content.lower())
+        found_complexity_levels = sum(1 for keyword in complexity_indicators if found_anywhere(keyword))
         self.assertGreaterEqual(found_complexity_levels, 2, "Sample blueprints should cover different complexity levels")
         
         # And: Each blueprint must be self-contained without external dependencies
-        for filename in self.expected_samples.keys():
-            file_path = self.sample_tasks_dir / filename
-            content = file_path.read_text()
-            
+        for blueprint in blueprints:
             # Check for external dependency indicators
             external_indicators = ["external service", "third-party API", "database server", "network connection"]
             for indicator in external_indicators:
-                self.assertNotIn(indicator, content.lower(), 
-                               f"External dependency '{indicator}' found in {filename}")
+                self.assertFalse(blueprint.contains(indicator),
+                               f"External dependency '{indicator}' found in {blueprint.name}")
     
     def test_behavior_4_documentation_and_example_value(self):
         """Test Behavior 4: Blueprints serve as effective learning examples with clear organization"""
@@ -146,16 +141,15 @@ class TestSampleTaskBlueprints(unittest.TestCase):
         
         # Then: Each must include clear documentation explaining what it demonstrates
         for filename, category in self.expected_samples.items():
-            file_path = self.sample_tasks_dir / filename
-            content = file_path.read_text()
+            blueprint = self.corpus[filename]
             
             # Should clearly explain what the sample demonstrates
-            self.assertIn("demonstrates", content.lower())
-            self.assertIn("example", content.lower())
+            self.assertTrue(blueprint.contains("demonstrates"))
+            self.assertTrue(blueprint.contains("example"))
             
             # Should have educational value
             educational_indicators = ["learn", "understand", "pattern", "approach", "methodology"]
-            found_educational = any(indicator in content.lower() for indicator in educational_indicators)
+            found_educational = blueprint.contains_any(educational_indicators)
             self.assertTrue(found_educational, f"No educational indicators found in {filename}")
         
         # And: Blueprints must be organized logically for easy discovery
@@ -170,16 +164,15 @@ class TestSampleTaskBlueprints(unittest.TestCase):
         
         # And: Examples must represent realistic development tasks
         for filename in self.expected_samples.keys():
-            file_path = self.sample_tasks_dir / filename
-            content = file_path.read_text()
+            blueprint = self.corpus[filename]
             
             # Should reference actual development activities
             dev_activities = ["create", "implement", "build", "develop", "generate", "add", "enhance"]
-            found_activities = sum(1 for activity in dev_activities if activity in content.lower())
+            found_activities = blueprint.count_matching(dev_activities)
             self.assertGreaterEqual(found_activities, 2, f"Insufficient development activities in {filename}")
         
         # And: Blueprint collection must serve as training material
-        total_samples = len(list(self.sample_tasks_dir.glob("SAMPLE-*.md")))
+        total_samples = len(self.corpus)
         self.assertGreaterEqual(total_samples, 4, "Must have at least 4 sample blueprints for comprehensive training")
 
     def test_blueprint_template_compliance(self):
@@ -192,31 +185,21 @@ class TestSampleTaskBlueprints(unittest.TestCase):
         ]
         
         for filename in self.expected_samples.keys():
-            file_path = self.sample_tasks_dir / filename
-            if file_path.exists():
-                content = file_path.read_text()
-                
+            blueprint = self.corpus.get(filename)
+            if blueprint is not None:
                 for section in template_sections:
-                    self.assertIn(section, content, 
+                    self.assertIn(section, blueprint.sections, 
                                 f"Missing required section '{section}' in {filename}")
     
     def test_frontmatter_format_compliance(self):
         """Verify YAML frontmatter follows exact template requirements"""
         for filename in self.expected_samples.keys():
-            file_path = self.sample_tasks_dir / filename
-            if file_path.exists():
-                content = file_path.read_text()
-                
+            blueprint = self.corpus.get(filename)
+            if blueprint is not None:
                 # Check YAML frontmatter structure
-                self.assertTrue(content.startswith("---\n"), f"{filename} must start with YAML frontmatter")
+                self.assertTrue(blueprint.content.startswith("---\n"), f"{filename} must start with YAML frontmatter")
                 
-                yaml_match = re.search(r'^---\n(.*?)\n---', content, re.MULTILINE | re.DOTALL)
-                yaml_text = yaml_match.group(1)
-                yaml_content = {}
-                for line in yaml_text.strip().split('\n'):
-                    if ':' in line and not line.strip().startswith('#'):
-                        key, value = line.split(':', 1)
-                        yaml_content[key.strip()] = value.strip().strip('"\'') if value.strip() else None
+                yaml_content = blueprint.frontmatter
                 
                 # Verify ID format
                 self.assertRegex(yaml_content["id"], r"SAMPLE-[A-Z]+-\d+", 
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Tests for the template compliance engine (sdd.compliance)
+
+Rules are derived from the real templates in specs/templates, so these tests
+also guard against template edits that silently drop required structure.
+"""
+
+import json
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from sdd import compliance
+from sdd.compliance import TemplateRegistry, derive_rules, load_rules, placeholder_pattern
+
+PROJECT_DIR = Path(__file__).parent.parent
+TEMPLATES_DIR = PROJECT_DIR / "specs" / "templates"
+
+VALID_MANIFEST = {
+    "task_id": "TASK-042",
+    "implementation_timestamp": "2025-08-20T10:00:00.000Z",
+    "implementation_type": "new_feature",
+    "files_modified": [
+        {"path": "a.md", "type": "created", "lines_added": 10, "lines_removed": 0, "purpose": "x"}
+    ],
+    "tests_created": [{"path": "tests/test-a.sh", "type": "unit", "purpose": "y"}],
+    "validation_requirements": {
+        "test_execution": True, "git_commit": True, "linting": False,
+        "type_checking": False, "security_scan": True,
+    },
+    "special_instructions": {
+        "commit_message_prefix": "TASK-042: Add a", "validation_approach": "run tests",
+        "breaking_changes": False, "requires_restart": False,
+    },
+    "coder_verification": {
+        "implementation_complete": True, "tests_passing": True,
+        "ready_for_validation": True, "known_issues": [],
+    },
+}
+
+
+class TestRuleDerivation(unittest.TestCase):
+    """Rules come straight from the template files"""
+
+    def test_placeholder_patterns(self):
+        self.assertEqual(placeholder_pattern("[Milestone ID]"), "^.+$")
+        self.assertRegex("SAMPLE-CLI-001", placeholder_pattern("TASK-XXX"))
+        self.assertRegex("TASK-031", placeholder_pattern("TASK-XXX"))
+        self.assertNotRegex("TASK-abc", placeholder_pattern("TASK-XXX"))
+        branch = placeholder_pattern("feature/TASK-XXX-[short-description]")
+        self.assertRegex("feature/SAMPLE-CLI-001-help-command", branch)
+        self.assertNotRegex("main", branch)
+        self.assertIsNone(placeholder_pattern("relative/path/to/file.ext"))
+
+    def test_milestone_plan_rules(self):
+        rule_set = derive_rules(TEMPLATES_DIR / "4_Milestone_Plan_Template.md")
+        targets = {(rule.kind, rule.target) for rule in rule_set.rules}
+        self.assertEqual(rule_set.version, "1.0.0")
+        self.assertIn(("title", "Milestone Plan:"), targets)
+        self.assertIn(("link", "Link to Roadmap"), targets)
+        self.assertIn(("heading", "Implementation Plan: Vertical Slices"), targets)
+        # Unnumbered guidance and example slice headings are not requirements
+        self.assertNotIn(("heading", "Planning Guidelines for Milestone Planning Specialists"), targets)
+
+    def test_optional_sections_are_not_required(self):
+        rule_set = derive_rules(TEMPLATES_DIR / "0_Project_Vision_Template.md")
+        targets = [rule.target for rule in rule_set.rules]
+        self.assertIn("Mission Statement", targets)
+        self.assertNotIn("Core Principles", targets)
+
+    def test_task_blueprint_frontmatter_rules(self):
+        rule_set = derive_rules(TEMPLATES_DIR / "5_Task_Blueprint_Template.md")
+        keys = [rule.target for rule in rule_set.rules if rule.kind == "frontmatter"]
+        self.assertEqual(keys, ["id", "title", "milestone_id"])
+
+    def test_json_manifest_rules(self):
+        rule_set = derive_rules(TEMPLATES_DIR / "implementation_manifest_template.json")
+        rules = {rule.target: rule for rule in rule_set.rules}
+        self.assertEqual(rules["files_modified[].lines_added"].expected_type, "number")
+        self.assertIsNotNone(rules["files_modified[].type"].pattern)
+        self.assertIsNone(rules["special_instructions.commit_message_prefix"].pattern)
+
+
+class TestDocumentChecks(unittest.TestCase):
+    """Single-pass checks produce structured per-file reports"""
+
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.directory = Path(self._tmp.name)
+        patcher = mock.patch.dict(os.environ, {"SDD_CACHE_DIR": str(self.directory / "cache")})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.registry = TemplateRegistry(TEMPLATES_DIR)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, name, content):
+        path = self.directory / name
+        path.write_text(content)
+        return path
+
+    def test_compliant_milestone_plan(self):
+        path = self.write("4_M9_Milestone_Plan.md", "\n".join([
+            "# Milestone Plan: M9 - Example",
+            "**Link to Roadmap:** [`3_Roadmap.md`](3_Roadmap.md)",
+            "## 1. Milestone Goals & Success Criteria",
+            "## 2. Scope: Features & Requirements",
+            "## 3. Implementation Plan: Vertical Slices",
+            "## 4. Testing & Verification Plan",
+            "## 5. Common Pitfalls to Avoid",
+        ]))
+        report = self.registry.check(path)
+        self.assertTrue(report.passed, report.findings)
+        self.assertEqual(report.template, "4_Milestone_Plan_Template.md")
+
+    def test_missing_section_and_bad_frontmatter_value(self):
+        path = self.write("TASK-100_Example.md", "\n".join([
+            "---",
+            "id: not-an-id",
+            'title: "Example"',
+            "milestone_id:",
+            "---",
+            "# Task Blueprint: [TASK-100] Example",
+            "## 1. Task Description",
+            "```markdown",
+            "## 2. Implementation Guidance",
+            "```",
+            "## 3. Success Criteria",
+        ]))
+        report = self.registry.check(path)
+        findings = {finding.rule_id: finding for finding in report.findings}
+        self.assertEqual(findings["frontmatter.id"].line, 2)
+        self.assertIn("frontmatter.milestone_id", findings)
+        # Headings inside fenced code blocks do not count
+        self.assertIn("heading.implementation_guidance", findings)
+        self.assertEqual(len(findings), 3)
+        json.dumps(report.to_dict())
+
+    def test_multiline_frontmatter_values(self):
+        path = self.write("TASK-101_Example.md", "\n".join([
+            "---",
+            "id:",
+            "  - TASK-101",
+            "  - not-an-id",
+            "title: >",
+            "  A folded title",
+            "  over two lines",
+            "milestone_id: |",
+            "---",
+            "# Task Blueprint: [TASK-101] Example",
+        ]))
+        findings = {
+            finding.rule_id: finding for finding in self.registry.check(path).findings
+            if finding.rule_id.startswith("frontmatter.")
+        }
+        self.assertEqual(sorted(findings), ["frontmatter.id", "frontmatter.milestone_id"])
+        self.assertEqual(findings["frontmatter.id"].line, 4)
+        self.assertTrue(findings["frontmatter.milestone_id"].message.startswith("Empty"))
+        self.assertEqual(findings["frontmatter.milestone_id"].line, 8)
+
+    def test_json_manifest(self):
+        path = self.write("implementation_manifest.json", json.dumps(VALID_MANIFEST))
+        self.assertTrue(self.registry.check(path).passed)
+
+        broken = json.loads(json.dumps(VALID_MANIFEST))
+        broken["files_modified"][0]["type"] = "renamed"
+        del broken["coder_verification"]["tests_passing"]
+        path.write_text(json.dumps(broken))
+        messages = [finding.message for finding in self.registry.check(path).findings]
+        self.assertEqual(len(messages), 2)
+        self.assertIn("Missing key 'coder_verification.tests_passing'", messages)
+
+    def test_non_object_manifest_is_reported(self):
+        path = self.write("implementation_manifest.json", "[]")
+        finding, = self.registry.check(path).findings
+        self.assertEqual(finding.rule_id, "json.root")
+        self.assertEqual(finding.message, "Top level should be object, got array")
+
+    def test_undecodable_documents_are_reported(self):
+        for name in ("TASK-102_Example.md", "implementation_manifest.json"):
+            path = self.directory / name
+            path.write_bytes(b"---\nid: TASK-102\xff\n---\n")
+            finding, = self.registry.check(path).findings
+            self.assertEqual(finding.rule_id, "document.decode")
+
+    def test_ungoverned_document_is_skipped(self):
+        self.assertIsNone(self.registry.check(self.write("notes.md", "# Notes")))
+
+    def test_only_template_documents_are_governed(self):
+        self.assertIsNone(self.registry.template_for(Path("Milestone_Planning_Checklist.md")))
+        self.assertIsNone(self.registry.template_for(Path("Architecture_Decisions_Log.md")))
+        self.assertIsNone(self.registry.template_for(TEMPLATES_DIR / "4_Milestone_Plan_Template.md"))
+        self.assertEqual(
+            self.registry.template_for(Path("M1_Milestone_Plan.md")),
+            TEMPLATES_DIR / "4_Milestone_Plan_Template.md",
+        )
+
+    def test_rule_sets_are_cached_on_disk(self):
+        template = TEMPLATES_DIR / "3_Roadmap_Template.md"
+        compliance._COMPILED.clear()
+        load_rules(template)
+        cached = list((self.directory / "cache" / "rules").glob("3_Roadmap_Template-1.0.0-*.json"))
+        self.assertEqual(len(cached), 1)
+
+        compliance._COMPILED.clear()
+        with mock.patch.object(compliance, "derive_rules") as derive:
+            load_rules(template)
+        derive.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)